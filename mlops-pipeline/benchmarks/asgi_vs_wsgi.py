@@ -0,0 +1,77 @@
+"""
+Concurrency scaling load test: Flask (WSGI) versus the ASGI app.
+
+Starts both servers against the same throwaway SQLite database, seeds it
+with the sample data, and drives each endpoint at increasing concurrency.
+Usage::
+
+    python -m benchmarks.asgi_vs_wsgi --concurrency 1 10 100 500 --requests 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import urllib.request
+
+from benchmarks.loadgen import run_load_sync
+from benchmarks.servers import Server
+
+ENDPOINTS = [
+    ('GET', '/api/models', None),
+    ('GET', '/api/dashboard/overview', None),
+    ('POST', '/api/predict', {'model_version_id': 1, 'deployment_id': 1,
+                              'features': {'amount': 120.5, 'merchant': 'grocery'}}),
+]
+
+def seed(server):
+    """Populate the database through the API's sample-data endpoint."""
+    request = urllib.request.Request(
+        f'http://{server.host}:{server.port}/api/init-sample-data', data=b'', method='POST'
+    )
+    urllib.request.urlopen(request).read()
+
+def run(concurrency_levels, requests, kinds):
+    """Run every endpoint at every concurrency level for each server kind."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'loadtest.db')}"
+        for index, kind in enumerate(kinds):
+            with Server(kind, database_url, env={'RESPONSE_CACHE': '0'}) as server:
+                if index == 0:
+                    seed(server)
+                for method, path, body in ENDPOINTS:
+                    for concurrency in concurrency_levels:
+                        result = run_load_sync(server.host, server.port, method, path, body,
+                                               concurrency=concurrency, requests=requests)
+                        row = dict(result.to_dict(), server=kind)
+                        results.append(row)
+                        print(format_row(row), flush=True)
+    return results
+
+def format_row(row):
+    """One human-readable line per (server, endpoint, concurrency)."""
+    def ms(value):
+        return f"{value:8.1f}" if value is not None else "       -"
+    return (f"{row['server']:<6} {row['method']:<5}{row['path']:<28} c={row['concurrency']:<5}"
+            f" rps={row['rps']:9.1f} p50={ms(row['p50_ms'])} p95={ms(row['p95_ms'])}"
+            f" p99={ms(row['p99_ms'])} errors={row['errors']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50, 200, 1000])
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='requests per endpoint and concurrency level')
+    parser.add_argument('--servers', nargs='+', default=['flask', 'asgi'], choices=['flask', 'asgi'])
+    parser.add_argument('--output', help='write results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.concurrency, args.requests, args.servers)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
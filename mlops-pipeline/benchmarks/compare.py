@@ -0,0 +1,68 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+A result regresses when its throughput drops, or its p95 latency grows, by
+more than ``threshold`` (a fraction) relative to the baseline. Usage::
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+
+def _key(result):
+    # size and endpoint are absent from runs that do not vary them (e.g. asgi_vs_wsgi)
+    return (result['server'], result.get('size'), result.get('endpoint'), result['method'],
+            result['path'], result['concurrency'])
+
+def _label(key):
+    server, size, endpoint, method, path, concurrency = key
+    parts = [server] + ([f"size={size}"] if size is not None else []) + \
+        ([endpoint] if endpoint else []) + [method, path, f"c={concurrency}"]
+    return ' '.join(parts)
+
+def compare(baseline, current, threshold=0.1):
+    """Return a list of regression descriptions (empty when within threshold)."""
+    baseline_results = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        reference = baseline_results.get(_key(result))
+        if reference is None:
+            continue
+        label = _label(_key(result))
+        if reference['rps'] and result['rps'] < reference['rps'] * (1 - threshold):
+            regressions.append(
+                f"{label}: rps {reference['rps']:.1f} -> {result['rps']:.1f}"
+            )
+        if reference['p95_ms'] and result['p95_ms'] is not None \
+                and result['p95_ms'] > reference['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f"{label}: p95 {reference['p95_ms']:.1f}ms -> {result['p95_ms']:.1f}ms"
+            )
+        if result['errors'] > reference['errors']:
+            regressions.append(f"{label}: errors {reference['errors']} -> {result['errors']}")
+    return regressions
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative regression (default: 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+    print("No regressions beyond threshold")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Minimal asyncio HTTP/1.1 load generator.
+
+Each simulated client holds one keep-alive connection and issues requests
+back to back, so ``concurrency`` is the number of requests in flight. Only
+the standard library is used so the generator itself is never the
+bottleneck being measured.
+"""
+
+import asyncio
+import json
+import time
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class LoadResult:
+    """Latencies and counters collected during one load run."""
+
+    def __init__(self, method, path, concurrency):
+        self.method = method
+        self.path = path
+        self.concurrency = concurrency
+        self.latencies = []
+        self.db_times = []
+        self.errors = 0
+        self.duration = 0.0
+
+    def to_dict(self):
+        """Summarize the run as RPS and latency percentiles in milliseconds."""
+        latencies = sorted(self.latencies)
+        db_times = sorted(self.db_times)
+        completed = len(latencies)
+        return {
+            'method': self.method,
+            'path': self.path,
+            'concurrency': self.concurrency,
+            'requests': completed,
+            'errors': self.errors,
+            'duration': self.duration,
+            'rps': completed / self.duration if self.duration else 0.0,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'db_p50_ms': percentile(db_times, 50),
+            'db_p95_ms': percentile(db_times, 95),
+            'db_mean_ms': sum(db_times) / len(db_times) if db_times else None
+        }
+
+def _server_timing(value, name='db'):
+    """Extract the duration of one metric from a ``Server-Timing`` header."""
+    for metric in value.split(','):
+        parts = [part.strip() for part in metric.split(';')]
+        if parts[0] != name:
+            continue
+        for param in parts[1:]:
+            if param.startswith('dur='):
+                return float(param[4:])
+    return None
+
+async def _read_response(reader):
+    """Read one HTTP response; returns (status, headers, body)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed by server')
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b''.join(chunks)
+    else:
+        body = await reader.read()
+        headers['connection'] = 'close'
+    return status, headers, body
+
+async def _client(host, port, method, path, body, headers, deadline, remaining, result):
+    """One keep-alive client issuing requests until the budget is spent."""
+    payload = json.dumps(body).encode() if body is not None else b''
+    head = [f'{method} {path} HTTP/1.1', f'Host: {host}:{port}', f'Content-Length: {len(payload)}']
+    if body is not None:
+        head.append('Content-Type: application/json')
+    head.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    raw_request = ('\r\n'.join(head) + '\r\n\r\n').encode() + payload
+
+    reader = writer = None
+    while remaining[0] > 0 and time.perf_counter() < deadline:
+        remaining[0] -= 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(raw_request)
+            await writer.drain()
+            status, response_headers, _ = await _read_response(reader)
+            elapsed = (time.perf_counter() - started) * 1000.0
+            if status >= 400:
+                result.errors += 1
+            else:
+                result.latencies.append(elapsed)
+                db_time = _server_timing(response_headers.get('server-timing', ''))
+                if db_time is not None:
+                    result.db_times.append(db_time)
+            if response_headers.get('connection', '').lower() == 'close':
+                writer.close()
+                reader = writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            result.errors += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+async def run_load(host, port, method, path, body=None, concurrency=10,
+                   requests=1000, duration=None, headers=None):
+    """Drive one endpoint at a fixed concurrency and return a LoadResult.
+
+    The run stops after ``requests`` requests or ``duration`` seconds,
+    whichever comes first.
+    """
+    result = LoadResult(method, path, concurrency)
+    deadline = time.perf_counter() + duration if duration else float('inf')
+    remaining = [requests]
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, method, path, body, headers, deadline, remaining, result)
+        for _ in range(concurrency)
+    ])
+    result.duration = time.perf_counter() - started
+    return result
+
+def run_load_sync(*args, **kwargs):
+    """Blocking wrapper around ``run_load``."""
+    return asyncio.run(run_load(*args, **kwargs))
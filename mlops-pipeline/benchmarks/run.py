@@ -0,0 +1,125 @@
+"""
+API throughput and latency benchmark.
+
+Seeds (or reuses) a database per size, starts the API with per-request DB
+timing enabled, and drives every endpoint at fixed concurrency levels.
+Results are written as JSON and can be checked against a baseline::
+
+    python -m benchmarks.run --sizes 10000 1000000 --output current.json \\
+        --baseline baseline.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmarks.compare import compare, load
+from benchmarks.loadgen import run_load_sync
+from benchmarks.seed import seeded_database
+from benchmarks.servers import PIPELINE_ROOT, Server
+
+ENDPOINTS = {
+    'health': ('GET', '/api/health', None),
+    'list_models': ('GET', '/api/models', None),
+    'get_model': ('GET', '/api/models/1', None),
+    'list_experiments': ('GET', '/api/experiments', None),
+    'list_deployments': ('GET', '/api/deployments', None),
+    'get_metrics': ('GET', '/api/monitoring/metrics', None),
+    'get_drift': ('GET', '/api/monitoring/drift', None),
+    'get_alerts': ('GET', '/api/monitoring/alerts', None),
+    'dashboard_overview': ('GET', '/api/dashboard/overview', None),
+    'predict': ('POST', '/api/predict', {
+        'model_version_id': 1, 'deployment_id': 1,
+        'features': {'amount': 120.5, 'merchant': 'grocery', 'country': 'US'}
+    }),
+    'log_metrics': ('POST', '/api/monitoring/metrics', {
+        'model_version_id': 1, 'deployment_id': 1, 'accuracy': 0.93,
+        'prediction_count': 500, 'error_count': 2, 'avg_latency': 61.0
+    }),
+}
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PIPELINE_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes, concurrency_levels, requests, duration, server_kind, endpoints, db_dir):
+    """Benchmark each endpoint for every database size and concurrency."""
+    results = []
+    for size in sizes:
+        database_url = seeded_database(db_dir, size)
+        with Server(server_kind, database_url, env={'SERVER_TIMING': '1', 'RESPONSE_CACHE': '0'}) as server:
+            for name in endpoints:
+                method, path, body = ENDPOINTS[name]
+                # Warm up connections and caches before measuring
+                run_load_sync(server.host, server.port, method, path, body,
+                              concurrency=1, requests=min(20, requests))
+                for concurrency in concurrency_levels:
+                    result = run_load_sync(server.host, server.port, method, path, body,
+                                           concurrency=concurrency, requests=requests,
+                                           duration=duration)
+                    row = dict(result.to_dict(), server=server_kind, endpoint=name, size=size)
+                    results.append(row)
+                    print(format_row(row), flush=True)
+    return results
+
+def format_row(row):
+    def ms(value):
+        return f"{value:8.2f}" if value is not None else "       -"
+    return (f"size={row['size']:<9} {row['endpoint']:<20} c={row['concurrency']:<4}"
+            f" rps={row['rps']:9.1f} p50={ms(row['p50_ms'])} p95={ms(row['p95_ms'])}"
+            f" p99={ms(row['p99_ms'])} db={ms(row['db_mean_ms'])} errors={row['errors']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000],
+                        help='prediction log rows per seeded database (10k to 10M)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='requests per endpoint and concurrency level')
+    parser.add_argument('--duration', type=float,
+                        help='cap each load run at this many seconds')
+    parser.add_argument('--server', default='flask', choices=['flask', 'asgi'])
+    parser.add_argument('--endpoints', nargs='+', default=list(ENDPOINTS), choices=list(ENDPOINTS))
+    parser.add_argument('--db-dir', default=os.path.join(PIPELINE_ROOT, '.benchmarks'),
+                        help='directory caching seeded databases')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against this results file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative regression versus the baseline')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.concurrency, args.requests, args.duration,
+                  args.server, args.endpoints, args.db_dir)
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'server': args.server,
+            'requests': args.requests,
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        regressions = compare(load(args.baseline), report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
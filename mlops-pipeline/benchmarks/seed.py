@@ -0,0 +1,148 @@
+"""
+Seed benchmark databases of a configurable size.
+
+Rows are written with bulk Core inserts in large batches inside a single
+transaction, with SQLite durability relaxed, so even the 10M prediction
+log database builds in minutes. Seeded files are cached by size and reused
+across runs.
+"""
+
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, insert
+
+from src.models.model_registry import Base, ModelVersion, Experiment, Deployment
+from src.models.monitoring import ModelMetrics, DriftDetection, Alert, PredictionLog
+
+BATCH_SIZE = 10000
+FEATURES = ['amount', 'merchant', 'country', 'hour', 'card_age_days', 'txn_velocity']
+
+def _relax_durability(engine):
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=OFF')
+        cursor.execute('PRAGMA synchronous=OFF')
+        cursor.close()
+
+def _bulk_insert(conn, table, rows):
+    """Insert an iterable of row dicts in BATCH_SIZE executemany calls."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+def _prediction_logs(size, model_count, deployment_count, rng, now):
+    for i in range(size):
+        probability = rng.random()
+        yield {
+            'model_version_id': rng.randint(1, model_count),
+            'deployment_id': rng.randint(1, deployment_count),
+            'request_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'timestamp': now - timedelta(seconds=size - i),
+            'input_hash': '%064x' % rng.getrandbits(256),
+            'input_features': FEATURES,
+            'prediction': {'class': int(probability > 0.5)},
+            'prediction_probability': {'class_0': 1 - probability, 'class_1': probability},
+            'confidence_score': rng.uniform(0.7, 0.95),
+            'latency': rng.uniform(10, 100),
+        }
+
+def seed_database(database_url, size, seed=42):
+    """Create the schema and populate it with ``size`` prediction logs.
+
+    Registry and monitoring tables are scaled down from ``size`` so list
+    endpoints see realistic proportions.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    model_count = max(10, size // 10000)
+    deployment_count = max(5, model_count // 2)
+    metric_count = max(100, size // 100)
+
+    engine = create_engine(database_url)
+    if engine.dialect.name == 'sqlite':
+        _relax_durability(engine)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        _bulk_insert(conn, ModelVersion.__table__, ({
+            'name': f'model_{i % 50}',
+            'version': f'1.{i // 50}.0',
+            'algorithm': rng.choice(['random_forest', 'xgboost', 'logistic_regression']),
+            'framework': 'scikit-learn',
+            'tags': ['benchmark'],
+            'accuracy': rng.uniform(0.8, 0.97),
+            'hyperparameters': {'n_estimators': rng.choice([50, 100, 200])},
+            'status': 'registered',
+            'stage': 'development',
+            'created_at': now,
+            'updated_at': now,
+        } for i in range(model_count)))
+        _bulk_insert(conn, Deployment.__table__, ({
+            'deployment_id': f'bench-deployment-{i}',
+            'name': f'Benchmark deployment {i}',
+            'environment': 'production',
+            'model_version_id': i + 1,
+            'status': 'active',
+            'deployed_at': now,
+        } for i in range(deployment_count)))
+        _bulk_insert(conn, Experiment.__table__, ({
+            'name': f'experiment_{i}',
+            'run_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'algorithm': 'random_forest',
+            'hyperparameters': {'max_depth': rng.randint(3, 12)},
+            'metrics': {'accuracy': rng.uniform(0.8, 0.97)},
+            'status': 'completed',
+            'start_time': now,
+        } for i in range(model_count * 2)))
+        _bulk_insert(conn, ModelMetrics.__table__, ({
+            'model_version_id': rng.randint(1, model_count),
+            'deployment_id': rng.randint(1, deployment_count),
+            'timestamp': now - timedelta(minutes=metric_count - i),
+            'accuracy': rng.uniform(0.9, 0.96),
+            'prediction_count': rng.randint(100, 1000),
+            'error_count': rng.randint(0, 10),
+            'avg_latency': rng.uniform(50, 150),
+            'custom_metrics': {},
+        } for i in range(metric_count)))
+        _bulk_insert(conn, DriftDetection.__table__, ({
+            'model_version_id': rng.randint(1, model_count),
+            'timestamp': now - timedelta(hours=i),
+            'drift_type': 'data_drift',
+            'drift_detected': rng.random() < 0.1,
+            'drift_score': rng.random(),
+            'threshold': 0.5,
+        } for i in range(metric_count // 10)))
+        _bulk_insert(conn, Alert.__table__, ({
+            'alert_id': f'bench-alert-{i}',
+            'alert_type': rng.choice(['performance', 'drift', 'error', 'resource']),
+            'severity': rng.choice(['low', 'medium', 'high', 'critical']),
+            'title': f'Benchmark alert {i}',
+            'message': 'Synthetic alert for benchmarking',
+            'status': rng.choice(['active', 'resolved']),
+            'triggered_at': now - timedelta(minutes=i),
+        } for i in range(metric_count // 10)))
+        _bulk_insert(conn, PredictionLog.__table__,
+                     _prediction_logs(size, model_count, deployment_count, rng, now))
+    engine.dispose()
+
+def seeded_database(db_dir, size, seed=42):
+    """Return a URL for a database of ``size`` rows, seeding it if missing."""
+    os.makedirs(db_dir, exist_ok=True)
+    path = os.path.join(db_dir, f'bench_{size}_{seed}.db')
+    url = f"sqlite:///{path}"
+    if not os.path.exists(path):
+        partial = path + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        seed_database(f"sqlite:///{partial}", size, seed)
+        os.replace(partial, path)
+    return url
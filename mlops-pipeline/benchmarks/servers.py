@@ -0,0 +1,69 @@
+"""
+Launch the Flask (WSGI) and ASGI apps as subprocesses for load testing.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+PIPELINE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def server_command(kind, port):
+    """Command line that serves the given app variant on ``port``."""
+    if kind == 'flask':
+        return [sys.executable, '-m', 'flask', '--app', 'src.main', 'run',
+                '--host', '127.0.0.1', '--port', str(port), '--with-threads']
+    if kind == 'asgi':
+        return [sys.executable, '-m', 'uvicorn', 'src.asgi:app',
+                '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning',
+                '--backlog', '4096']
+    raise ValueError(f"Unknown server kind: {kind}")
+
+class Server:
+    """Context manager running one app variant against ``database_url``."""
+
+    def __init__(self, kind, database_url, env=None, startup_timeout=30.0):
+        self.kind = kind
+        self.database_url = database_url
+        self.env = env or {}
+        self.startup_timeout = startup_timeout
+        self.host = '127.0.0.1'
+        self.port = free_port()
+        self.process = None
+
+    def __enter__(self):
+        env = dict(os.environ, DATABASE_URL=self.database_url, **self.env)
+        subprocess.run([sys.executable, '-m', 'src.cli.migrate'], cwd=PIPELINE_ROOT, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        self.process = subprocess.Popen(
+            server_command(self.kind, self.port), cwd=PIPELINE_ROOT, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.kind} server exited with code {self.process.returncode}")
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.5):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{self.kind} server did not start within {self.startup_timeout}s")
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
@@ -0,0 +1,152 @@
+"""
+Application startup cost benchmark.
+
+Builds the Flask app in fresh interpreters and reports, as medians over
+several runs, the time to import ``src.app``, the time spent in each
+``create_app`` step, and the cumulative import time of the heaviest
+top-level packages (from ``python -X importtime``)::
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+    python -m benchmarks.startup --set HEALTH_MONITOR=0 --budget-ms 500
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+from benchmarks.servers import PIPELINE_ROOT
+
+HEAVY_MODULES = ('numpy', 'pandas', 'sklearn', 'scipy', 'joblib', 'matplotlib', 'pyarrow')
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from src.app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'steps': app.extensions['startup_timings'],
+    'heavy_modules': sorted(name for name in %r if name in sys.modules),
+}))
+""" % (HEAVY_MODULES,)
+
+def parse_importtime(stderr):
+    """Cumulative import microseconds per top-level package from ``-X importtime``.
+
+    A package is charged the cumulative time of its outermost imports, so
+    ``sqlalchemy`` pulled in by ``src.db`` is reported as ``sqlalchemy``
+    rather than folded into ``src``.
+    """
+    packages = {}
+    lines = [line[len('import time:'):].split('|') for line in stderr.splitlines()
+             if line.startswith('import time:') and 'cumulative' not in line]
+    # importtime prints children before their parent, so walk it in reverse
+    stack = []
+    for _, cumulative, raw_name in reversed(lines):
+        name = raw_name.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        package = name.strip().split('.')[0]
+        del stack[depth:]
+        if package not in stack:
+            packages[package] = packages.get(package, 0) + int(cumulative)
+        stack.append(package)
+    return packages
+
+def probe(env):
+    """Create the app once in a fresh interpreter; returns the probe result."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE],
+        cwd=PIPELINE_ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"App startup failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['imports_us'] = parse_importtime(completed.stderr)
+    return result
+
+def _median(values):
+    return statistics.median(values) if values else 0.0
+
+def run(runs, overrides, top):
+    """Median startup timings over ``runs`` cold starts against a migrated database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+                   HEALTH_SNAPSHOT_INTERVAL='0', **overrides)
+        subprocess.run([sys.executable, '-m', 'src.cli.migrate'], cwd=PIPELINE_ROOT, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        samples = [probe(env) for _ in range(runs)]
+
+    steps = {}
+    for sample in samples:
+        for name, value in sample['steps'].items():
+            steps.setdefault(name, []).append(value)
+    imports = {}
+    for sample in samples:
+        for name, value in sample['imports_us'].items():
+            imports.setdefault(name, []).append(value / 1000)
+    heaviest = sorted(((name, _median(values)) for name, values in imports.items()),
+                      key=lambda item: item[1], reverse=True)[:top]
+
+    import_ms = _median([sample['import_ms'] for sample in samples])
+    create_app_ms = _median([sample['create_app_ms'] for sample in samples])
+    return {
+        'runs': runs,
+        'total_ms': import_ms + create_app_ms,
+        'import_ms': import_ms,
+        'create_app_ms': create_app_ms,
+        'steps_ms': {name: _median(values) for name, values in steps.items()},
+        'imports_ms': dict(heaviest),
+        'heavy_modules_loaded': sorted({name for sample in samples for name in sample['heavy_modules']}),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='number of top-level imports to report')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='environment override for the app, e.g. HEALTH_MONITOR=0')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--budget-ms', type=float,
+                        help='exit non-zero if the median total startup time exceeds this')
+    args = parser.parse_args(argv)
+
+    overrides = dict(item.split('=', 1) for item in args.set)
+    result = run(args.runs, overrides, args.top)
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'overrides': overrides,
+        },
+        'results': result
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"startup {result['total_ms']:.1f} ms "
+          f"(import {result['import_ms']:.1f} ms, create_app {result['create_app_ms']:.1f} ms)")
+    for name, value in result['steps_ms'].items():
+        print(f"  step   {name:<24} {value:8.1f} ms")
+    for name, value in result['imports_ms'].items():
+        print(f"  import {name:<24} {value:8.1f} ms")
+    if result['heavy_modules_loaded']:
+        print(f"  heavy modules loaded: {', '.join(result['heavy_modules_loaded'])}")
+
+    if args.budget_ms is not None and result['total_ms'] > args.budget_ms:
+        print(f"REGRESSION startup {result['total_ms']:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
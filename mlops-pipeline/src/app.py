@@ -0,0 +1,317 @@
+"""
+Flask application factory.
+
+``create_app`` wires configuration, middleware, background services and
+blueprints. It does not create the schema (run ``python -m src.cli.migrate``
+first, or set ``AUTO_MIGRATE=1`` for local development), and optional
+components import their modules only when enabled, so libraries such as
+numpy are loaded by the features that use them rather than at import time.
+Milliseconds spent in each step are recorded in
+``app.extensions['startup_timings']``.
+"""
+
+import atexit
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Flask
+from flask_cors import CORS
+
+logger = logging.getLogger(__name__)
+
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), 'static')
+
+def load_config(app, overrides=None):
+    """Populate ``app.config`` from the environment, then apply ``overrides``."""
+    from src.db import DATABASE_URL
+
+    app.config['SECRET_KEY'] = 'mlops-pipeline-secret-key-2024'
+
+    # Database configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Create missing tables at startup instead of via the migrate command
+    app.config['AUTO_MIGRATE'] = os.environ.get('AUTO_MIGRATE', '0') == '1'
+
+    # Report per-request database time in a Server-Timing header (used by benchmarks)
+    app.config['SERVER_TIMING'] = os.environ.get('SERVER_TIMING', '0') == '1'
+
+    # Opt-in request profiling, served on /api/internal/perf
+    app.config['PERF_PROFILING'] = os.environ.get('PERF_PROFILING', '0') == '1'
+    app.config['PERF_SAMPLE_RATE'] = float(os.environ.get('PERF_SAMPLE_RATE', '0.01'))
+    app.config['PERF_PROFILER'] = os.environ.get('PERF_PROFILER', 'cprofile')  # cprofile, sampling
+    app.config['PERF_N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('PERF_N_PLUS_ONE_THRESHOLD', '10'))
+
+    # Service metrics, served on /metrics
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') == '1'
+
+    # Background model health computation, served from memory on /api/monitoring/health
+    app.config['HEALTH_MONITOR'] = os.environ.get('HEALTH_MONITOR', '1') == '1'
+    app.config['HEALTH_INTERVAL'] = float(os.environ.get('HEALTH_INTERVAL', '10'))
+    app.config['HEALTH_WINDOW'] = float(os.environ.get('HEALTH_WINDOW', '300'))
+    app.config['HEALTH_SNAPSHOT_INTERVAL'] = float(os.environ.get('HEALTH_SNAPSHOT_INTERVAL', '60'))
+
+    # Route prediction logs and model metrics to per-day or per-deployment SQLite files
+    app.config['MONITORING_PARTITIONS'] = os.environ.get('MONITORING_PARTITIONS', '')  # '', day, deployment
+    app.config['PARTITION_PATH'] = os.environ.get(
+        'PARTITION_PATH', os.path.join(os.path.dirname(__file__), 'database', 'partitions')
+    )
+    app.config['PARTITION_QUERY_WORKERS'] = int(os.environ.get('PARTITION_QUERY_WORKERS', '8'))
+
+    # Alert notifications: coalesced digests per channel, rate limited and retried
+    app.config['NOTIFICATIONS'] = os.environ.get('NOTIFICATIONS', '1') == '1'
+    app.config['NOTIFY_DEFAULT_CHANNELS'] = os.environ.get('NOTIFY_DEFAULT_CHANNELS', 'file').split(',')
+    app.config['NOTIFY_POLL_INTERVAL'] = float(os.environ.get('NOTIFY_POLL_INTERVAL', '2'))
+    app.config['NOTIFY_COALESCE_WINDOW'] = float(os.environ.get('NOTIFY_COALESCE_WINDOW', '30'))
+    app.config['NOTIFY_MAX_DIGEST_SIZE'] = int(os.environ.get('NOTIFY_MAX_DIGEST_SIZE', '500'))
+    app.config['NOTIFY_WORKERS'] = int(os.environ.get('NOTIFY_WORKERS', '2'))
+    app.config['NOTIFY_RATE'] = float(os.environ.get('NOTIFY_RATE', '1'))  # per second, per channel
+    app.config['NOTIFY_BURST'] = int(os.environ.get('NOTIFY_BURST', '10'))
+    app.config['NOTIFY_MAX_ATTEMPTS'] = int(os.environ.get('NOTIFY_MAX_ATTEMPTS', '5'))
+    app.config['NOTIFY_BACKOFF'] = float(os.environ.get('NOTIFY_BACKOFF', '1'))
+    # Seconds after which alerts claimed by a dead worker are claimed again
+    app.config['NOTIFY_CLAIM_LEASE'] = float(os.environ.get('NOTIFY_CLAIM_LEASE', '300'))
+    app.config['NOTIFY_FILE_PATH'] = os.environ.get(
+        'NOTIFY_FILE_PATH', os.path.join(os.path.dirname(__file__), 'database', 'notifications.jsonl')
+    )
+    app.config['NOTIFY_WEBHOOK_URL'] = os.environ.get('NOTIFY_WEBHOOK_URL', '')
+    app.config['NOTIFY_SLACK_WEBHOOK_URL'] = os.environ.get('NOTIFY_SLACK_WEBHOOK_URL', '')
+    app.config['NOTIFY_SMTP_HOST'] = os.environ.get('NOTIFY_SMTP_HOST', '')
+    app.config['NOTIFY_SMTP_PORT'] = int(os.environ.get('NOTIFY_SMTP_PORT', '25'))
+    app.config['NOTIFY_SMTP_USER'] = os.environ.get('NOTIFY_SMTP_USER', '')
+    app.config['NOTIFY_SMTP_PASSWORD'] = os.environ.get('NOTIFY_SMTP_PASSWORD', '')
+    app.config['NOTIFY_SMTP_TLS'] = os.environ.get('NOTIFY_SMTP_TLS', '0') == '1'
+    app.config['NOTIFY_EMAIL_FROM'] = os.environ.get('NOTIFY_EMAIL_FROM', 'mlops-alerts@localhost')
+    app.config['NOTIFY_EMAIL_TO'] = [address for address in os.environ.get('NOTIFY_EMAIL_TO', '').split(',')
+                                     if address]
+
+    # GET views marked @shared_get: concurrent identical requests share one execution,
+    # the encoded body is cached briefly and served gzip/brotli-compressed on request
+    app.config['RESPONSE_CACHE'] = os.environ.get('RESPONSE_CACHE', '1') == '1'
+    app.config['RESPONSE_CACHE_TTL'] = float(os.environ.get('RESPONSE_CACHE_TTL', '1'))
+    app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+    app.config['RESPONSE_COMPRESS_MIN_SIZE'] = int(os.environ.get('RESPONSE_COMPRESS_MIN_SIZE', '1024'))
+    app.config['RESPONSE_GZIP_LEVEL'] = int(os.environ.get('RESPONSE_GZIP_LEVEL', '6'))
+    app.config['RESPONSE_BROTLI_QUALITY'] = int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+
+    # Seconds between checks of the registry change counter written by other workers
+    app.config['REGISTRY_CACHE_CHECK_INTERVAL'] = float(os.environ.get('REGISTRY_CACHE_CHECK_INTERVAL', '1'))
+
+    # Feed of promotions committed by other workers (LISTEN on PostgreSQL, event table tail elsewhere)
+    app.config['REGISTRY_EVENTS'] = os.environ.get('REGISTRY_EVENTS', '1') == '1'
+    app.config['REGISTRY_EVENTS_INTERVAL'] = float(os.environ.get('REGISTRY_EVENTS_INTERVAL', '1'))
+
+    if overrides:
+        app.config.update(overrides)
+
+class StartupTimer:
+    """Wall-clock milliseconds per named startup step, including imports."""
+
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (time.perf_counter() - started) * 1000
+
+def _init_server_timing(app):
+    from src.middleware.timing import query_time_ms, start_request_stats, stop_request_stats
+
+    @app.before_request
+    def start_server_timing():
+        if app.config['SERVER_TIMING']:
+            start_request_stats()
+
+    @app.after_request
+    def add_server_timing(response):
+        if app.config['SERVER_TIMING']:
+            db_time = query_time_ms()
+            if db_time is not None:
+                response.headers['Server-Timing'] = f"db;dur={db_time:.3f}"
+        return response
+
+    @app.teardown_request
+    def stop_server_timing(exc):
+        if app.config['SERVER_TIMING']:
+            stop_request_stats()
+
+def _warm_registry_cache(app):
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from src.db import SessionLocal
+    from src.services.registry_cache import registry_cache
+
+    registry_cache.check_interval = app.config['REGISTRY_CACHE_CHECK_INTERVAL']
+    db = SessionLocal()
+    try:
+        registry_cache.warm(db)
+    except SQLAlchemyError as e:
+        raise RuntimeError(
+            "Database schema is missing or out of date; run `python -m src.cli.migrate`"
+        ) from e
+    finally:
+        db.close()
+
+def _start_notifications(app):
+    from src.db import SessionLocal
+    from src.services.notifications import (EmailChannel, FileChannel, NotificationDispatcher,
+                                            WebhookChannel)
+
+    config = app.config
+    channels = [FileChannel(config['NOTIFY_FILE_PATH'])]
+    if config['NOTIFY_WEBHOOK_URL']:
+        channels.append(WebhookChannel(config['NOTIFY_WEBHOOK_URL']))
+    if config['NOTIFY_SLACK_WEBHOOK_URL']:
+        channels.append(WebhookChannel(config['NOTIFY_SLACK_WEBHOOK_URL'], name='slack'))
+    if config['NOTIFY_SMTP_HOST'] and config['NOTIFY_EMAIL_TO']:
+        channels.append(EmailChannel(
+            config['NOTIFY_SMTP_HOST'], config['NOTIFY_EMAIL_FROM'], config['NOTIFY_EMAIL_TO'],
+            port=config['NOTIFY_SMTP_PORT'], username=config['NOTIFY_SMTP_USER'] or None,
+            password=config['NOTIFY_SMTP_PASSWORD'] or None, use_tls=config['NOTIFY_SMTP_TLS']
+        ))
+    dispatcher = NotificationDispatcher(
+        SessionLocal, channels,
+        default_channels=config['NOTIFY_DEFAULT_CHANNELS'],
+        poll_interval=config['NOTIFY_POLL_INTERVAL'],
+        coalesce_window=config['NOTIFY_COALESCE_WINDOW'],
+        max_digest_size=config['NOTIFY_MAX_DIGEST_SIZE'],
+        workers=config['NOTIFY_WORKERS'],
+        rate=config['NOTIFY_RATE'],
+        burst=config['NOTIFY_BURST'],
+        max_attempts=config['NOTIFY_MAX_ATTEMPTS'],
+        backoff=config['NOTIFY_BACKOFF'],
+        claim_lease=config['NOTIFY_CLAIM_LEASE']
+    ).start()
+    # Send or release claimed alerts on a clean shutdown instead of waiting out their lease
+    atexit.register(dispatcher.stop)
+    return dispatcher
+
+def create_app(config=None):
+    """Build the API application; ``config`` overrides environment settings."""
+    timer = StartupTimer()
+
+    with timer.step('flask'):
+        app = Flask(__name__, static_folder=STATIC_FOLDER)
+        CORS(app)
+
+    with timer.step('database'):
+        import src.db  # noqa: F401
+
+    with timer.step('listeners'):
+        from src.services.leaderboard import register_listeners as register_leaderboard_listeners
+        from src.services.registry_cache import register_listeners as register_registry_listeners
+        register_leaderboard_listeners()
+        register_registry_listeners()
+
+    with timer.step('config'):
+        load_config(app, config)
+
+    if app.config['AUTO_MIGRATE']:
+        with timer.step('migrate'):
+            from src.cli.migrate import migrate
+            migrate()
+
+    with timer.step('server_timing'):
+        _init_server_timing(app)
+
+    if app.config['MONITORING_PARTITIONS']:
+        with timer.step('partitions'):
+            from src.services.partitions import PartitionedStore
+            app.extensions['partition_store'] = PartitionedStore(
+                app.config['PARTITION_PATH'],
+                scheme=app.config['MONITORING_PARTITIONS'],
+                workers=app.config['PARTITION_QUERY_WORKERS']
+            )
+
+    with timer.step('routes'):
+        from src.routes.api import api_bp
+        from src.routes.artifacts import artifact_bp
+        from src.routes.datasets import dataset_bp
+        from src.routes.experiments import experiment_runs_bp
+        from src.routes.partitions import partition_bp
+        app.register_blueprint(api_bp, url_prefix='/api')
+        app.register_blueprint(dataset_bp, url_prefix='/api')
+        app.register_blueprint(experiment_runs_bp, url_prefix='/api')
+        app.register_blueprint(artifact_bp, url_prefix='/api')
+        app.register_blueprint(partition_bp, url_prefix='/api')
+
+    if app.config['METRICS_ENABLED']:
+        with timer.step('metrics'):
+            from src.db import engine
+            from src.metrics import register_pool_metrics, registry
+            from src.middleware.metrics import RequestMetrics
+            from src.services.registry_cache import registry_cache
+            RequestMetrics(app)
+            register_pool_metrics(engine)
+            registry.add_collector(registry_cache.prometheus)
+
+    if app.config['PERF_PROFILING']:
+        with timer.step('profiling'):
+            from src.metrics import registry
+            from src.middleware.profiling import RequestProfiler
+            profiler = RequestProfiler(app)
+            registry.add_collector(profiler.prometheus)
+
+    # After metrics and profiling, so their hooks also see responses served from the cache
+    if app.config['RESPONSE_CACHE']:
+        with timer.step('response_cache'):
+            from src.middleware.response_cache import ResponseCache
+            ResponseCache(
+                app,
+                ttl=app.config['RESPONSE_CACHE_TTL'],
+                max_entries=app.config['RESPONSE_CACHE_MAX_ENTRIES'],
+                min_size=app.config['RESPONSE_COMPRESS_MIN_SIZE'],
+                gzip_level=app.config['RESPONSE_GZIP_LEVEL'],
+                brotli_quality=app.config['RESPONSE_BROTLI_QUALITY']
+            )
+
+    with timer.step('registry_cache'):
+        _warm_registry_cache(app)
+
+    if app.config['REGISTRY_EVENTS']:
+        with timer.step('registry_events'):
+            from src.db import SessionLocal, engine
+            from src.services.registry_cache import registry_cache
+            from src.services.registry_events import registry_events
+            registry_events.subscribe(lambda event: registry_cache.invalidate())
+            response_cache = app.extensions.get('response_cache')
+            if response_cache is not None:
+                # Promotions made by other workers also reach this one's cached registry reads
+                registry_events.subscribe(lambda event: response_cache.invalidate(('/api/models', '/api/dashboard')))
+            registry_events.start(engine, SessionLocal, interval=app.config['REGISTRY_EVENTS_INTERVAL'])
+
+    if app.config['HEALTH_MONITOR']:
+        with timer.step('health_monitor'):
+            from src.db import SessionLocal
+            from src.services.health_monitor import HealthMonitor
+            app.extensions['health_monitor'] = HealthMonitor(
+                SessionLocal,
+                interval=app.config['HEALTH_INTERVAL'],
+                window=app.config['HEALTH_WINDOW'],
+                snapshot_interval=app.config['HEALTH_SNAPSHOT_INTERVAL'],
+                disk_path=os.path.dirname(os.path.abspath(__file__)),
+                partition_store=app.extensions.get('partition_store')
+            ).start()
+
+    if app.config['NOTIFICATIONS']:
+        with timer.step('notifications'):
+            dispatcher = app.extensions['notification_dispatcher'] = _start_notifications(app)
+            if app.config['METRICS_ENABLED']:
+                from src.metrics import registry
+                registry.add_collector(dispatcher.prometheus)
+
+    # Registered last: its catch-all route serves the dashboard build
+    with timer.step('frontend'):
+        from src.routes.frontend import frontend_bp
+        app.register_blueprint(frontend_bp)
+
+    app.extensions['startup_timings'] = timer.timings
+    logger.debug("Application startup: %s", timer.timings)
+    return app
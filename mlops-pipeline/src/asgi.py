@@ -0,0 +1,594 @@
+"""
+ASGI variant of the MLOps Pipeline API.
+
+Exposes the same routes as ``src.main`` but serves them from a single event
+loop: database access goes through the SQLAlchemy async engine (aiosqlite
+for SQLite) and inference is pushed to an executor so it never blocks the
+loop. Run with::
+
+    uvicorn src.asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import os
+import sys
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import logging
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.routing import Route
+
+# Import models
+from src.models.model_registry import ModelVersion, Experiment, Deployment, DatasetVersion
+from src.models.monitoring import ModelMetrics, DriftDetection, Alert, PredictionLog, ModelHealth
+from src.cli.migrate import migrate
+from src.db import DATABASE_URL, SessionLocal, async_database_url
+from src.inference import run_inference
+from src.metrics import registry, register_pool_metrics
+from src.middleware.metrics import ASGIRequestMetrics
+from src.services.feature_schema import FeatureValidationError, SchemaError, compile_schema
+from src.services.health_monitor import HealthMonitor
+from src.services.leaderboard import register_listeners as register_leaderboard_listeners
+from src.services.partitions import store_from_env
+from src.services.preprocessing import PipelineError, fit_pipeline, prepare_features, save_pipeline
+from src.services.promotions import PromotionConflict, promote
+from src.services.registry_cache import register_listeners as register_registry_listeners
+
+logger = logging.getLogger(__name__)
+
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), 'static')
+
+# Inference executor: threads by default, processes for CPU-bound models
+INFERENCE_EXECUTOR = os.environ.get('INFERENCE_EXECUTOR', 'thread')
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', os.cpu_count() or 1))
+
+# Create async database engine and session
+engine = create_async_engine(async_database_url(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+register_pool_metrics(engine.sync_engine)
+
+# Create missing tables at startup instead of via python -m src.cli.migrate
+AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', '0') == '1'
+
+# Background model health computation; the monitor thread uses a sync session
+HEALTH_MONITOR = os.environ.get('HEALTH_MONITOR', '1') == '1'
+
+executor = None
+health_monitor = None
+# Per-day or per-deployment SQLite files for monitoring rows (MONITORING_PARTITIONS)
+partition_store = None
+
+@asynccontextmanager
+async def lifespan(app):
+    """Create the inference executor, partition store and health monitor for the lifetime of the app."""
+    global executor, health_monitor, partition_store
+    register_leaderboard_listeners()
+    register_registry_listeners()
+    if AUTO_MIGRATE:
+        async with engine.begin() as conn:
+            await conn.run_sync(migrate)
+    if INFERENCE_EXECUTOR == 'process':
+        executor = ProcessPoolExecutor(max_workers=INFERENCE_WORKERS)
+    else:
+        executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS)
+    partition_store = store_from_env()
+    if HEALTH_MONITOR:
+        health_monitor = HealthMonitor(
+            SessionLocal,
+            interval=float(os.environ.get('HEALTH_INTERVAL', '10')),
+            window=float(os.environ.get('HEALTH_WINDOW', '300')),
+            snapshot_interval=float(os.environ.get('HEALTH_SNAPSHOT_INTERVAL', '60')),
+            disk_path=os.path.dirname(os.path.abspath(__file__)),
+            partition_store=partition_store
+        ).start()
+    try:
+        yield
+    finally:
+        if health_monitor is not None:
+            health_monitor.stop()
+        if partition_store is not None:
+            partition_store.close()
+        executor.shutdown(wait=False)
+        await engine.dispose()
+
+async def get_json(request):
+    """Parse a JSON request body, treating an empty body as ``{}``."""
+    body = await request.body()
+    if not body:
+        return {}
+    return await request.json()
+
+async def fetch_all(query):
+    """Run a select and return the rows serialized with ``to_dict``."""
+    async with AsyncSessionLocal() as db:
+        result = await db.scalars(query)
+        return [row.to_dict() for row in result]
+
+async def run_in_session(fn, *args, **kwargs):
+    """Call ``fn(db, *args, **kwargs)`` with a sync session on a worker thread.
+
+    For services written against the sync ``Session`` (promotions,
+    preprocessing) that take thread locks and must not run on the loop.
+    """
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args, **kwargs)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    return await asyncio.to_thread(call)
+
+def fit_preprocessing(db, spec, feature_schema):
+    """Fit a preprocessing spec and store it; returns the pipeline's URI."""
+    return save_pipeline(fit_pipeline(db, spec, feature_schema))
+
+async def add_row(row):
+    """Insert a single ORM row and return it refreshed from the database."""
+    async with AsyncSessionLocal() as db:
+        db.add(row)
+        await db.commit()
+        await db.refresh(row)
+        return row
+
+# API Routes
+
+async def health_check(request):
+    """Health check endpoint."""
+    return JSONResponse({
+        'status': 'healthy',
+        'service': 'MLOps Pipeline',
+        'version': '1.0.0',
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+# Model Registry API
+async def list_models(request):
+    """List all model versions."""
+    return JSONResponse(await fetch_all(select(ModelVersion)))
+
+async def register_model(request):
+    """Register a new model version."""
+    data = await get_json(request)
+    try:
+        if data.get('feature_schema') is not None:
+            compile_schema(data['feature_schema'])
+        preprocessing_path = None
+        if data.get('preprocessing') is not None:
+            preprocessing_path = await run_in_session(
+                fit_preprocessing, data['preprocessing'], data.get('feature_schema')
+            )
+        model = await add_row(ModelVersion(
+            name=data.get('name'),
+            version=data.get('version'),
+            algorithm=data.get('algorithm'),
+            framework=data.get('framework', 'scikit-learn'),
+            description=data.get('description'),
+            tags=data.get('tags', []),
+            accuracy=data.get('accuracy'),
+            precision=data.get('precision'),
+            recall=data.get('recall'),
+            f1_score=data.get('f1_score'),
+            auc_score=data.get('auc_score'),
+            training_dataset_size=data.get('training_dataset_size'),
+            training_duration=data.get('training_duration'),
+            hyperparameters=data.get('hyperparameters', {}),
+            feature_schema=data.get('feature_schema'),
+            model_path=data.get('model_path'),
+            artifacts_path=data.get('artifacts_path'),
+            preprocessing_path=preprocessing_path
+        ))
+        return JSONResponse(model.to_dict(), status_code=201)
+    except SchemaError as e:
+        return JSONResponse({'error': f'Invalid feature_schema: {e}'}, status_code=400)
+    except PipelineError as e:
+        return JSONResponse({'error': f'Invalid preprocessing: {e}'}, status_code=400)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+async def get_model(request):
+    """Get model details."""
+    model_id = request.path_params['model_id']
+    async with AsyncSessionLocal() as db:
+        model = await db.get(ModelVersion, model_id)
+        if not model:
+            return JSONResponse({'error': 'Model not found'}, status_code=404)
+        return JSONResponse(model.to_dict())
+
+async def promote_model(request):
+    """Promote a model version, archiving the previous holder of an exclusive stage.
+
+    Shares ``promote`` with the Flask app, including ``Idempotency-Key``
+    replays.
+    """
+    model_id = request.path_params['model_id']
+    data = await get_json(request)
+    try:
+        result = await run_in_session(
+            promote, model_id,
+            stage=data.get('stage', 'production'),
+            idempotency_key=request.headers.get('Idempotency-Key') or data.get('idempotency_key'),
+            requested_by=data.get('requested_by'),
+            reason=data.get('reason')
+        )
+        if result is None:
+            return JSONResponse({'error': 'Model not found'}, status_code=404)
+        model, event, replayed = result
+        return JSONResponse(dict(model, promotion=event, replayed=replayed))
+    except PromotionConflict as e:
+        return JSONResponse({'error': str(e)}, status_code=409)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+# Experiment Tracking API
+async def list_experiments(request):
+    """List all experiments."""
+    return JSONResponse(await fetch_all(select(Experiment)))
+
+async def create_experiment(request):
+    """Create a new experiment."""
+    data = await get_json(request)
+    try:
+        experiment = await add_row(Experiment(
+            name=data.get('name'),
+            run_id=data.get('run_id', str(uuid.uuid4())),
+            description=data.get('description'),
+            tags=data.get('tags', []),
+            dataset_name=data.get('dataset_name'),
+            dataset_version=data.get('dataset_version'),
+            feature_set=data.get('feature_set', []),
+            algorithm=data.get('algorithm'),
+            hyperparameters=data.get('hyperparameters', {}),
+            status='running'
+        ))
+        return JSONResponse(experiment.to_dict(), status_code=201)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+# Deployment API
+async def list_deployments(request):
+    """List all deployments."""
+    return JSONResponse(await fetch_all(select(Deployment)))
+
+async def create_deployment(request):
+    """Create a new deployment."""
+    data = await get_json(request)
+    try:
+        deployment = await add_row(Deployment(
+            deployment_id=data.get('deployment_id', str(uuid.uuid4())),
+            name=data.get('name'),
+            description=data.get('description'),
+            environment=data.get('environment', 'production'),
+            deployment_type=data.get('deployment_type', 'blue_green'),
+            traffic_percentage=data.get('traffic_percentage', 100.0),
+            endpoint_url=data.get('endpoint_url'),
+            instance_type=data.get('instance_type'),
+            instance_count=data.get('instance_count', 1),
+            model_version_id=data.get('model_version_id'),
+            status='deploying'
+        ))
+        return JSONResponse(deployment.to_dict(), status_code=201)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+# Monitoring API
+async def get_metrics(request):
+    """Get model performance metrics."""
+    if partition_store is not None:
+        return JSONResponse(await asyncio.to_thread(partition_store.latest, ModelMetrics, limit=100))
+    return JSONResponse(await fetch_all(
+        select(ModelMetrics).order_by(ModelMetrics.timestamp.desc()).limit(100)
+    ))
+
+async def log_metrics(request):
+    """Log model performance metrics."""
+    data = await get_json(request)
+    try:
+        metrics = ModelMetrics(
+            model_version_id=data.get('model_version_id'),
+            deployment_id=data.get('deployment_id'),
+            accuracy=data.get('accuracy'),
+            precision=data.get('precision'),
+            recall=data.get('recall'),
+            f1_score=data.get('f1_score'),
+            auc_score=data.get('auc_score'),
+            prediction_count=data.get('prediction_count', 0),
+            error_count=data.get('error_count', 0),
+            avg_latency=data.get('avg_latency'),
+            p95_latency=data.get('p95_latency'),
+            p99_latency=data.get('p99_latency'),
+            cpu_usage=data.get('cpu_usage'),
+            memory_usage=data.get('memory_usage'),
+            gpu_usage=data.get('gpu_usage'),
+            custom_metrics=data.get('custom_metrics', {})
+        )
+        if partition_store is not None:
+            await asyncio.to_thread(partition_store.add, metrics)
+        else:
+            await add_row(metrics)
+        return JSONResponse(metrics.to_dict(), status_code=201)
+    except Exception as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+async def get_drift_detection(request):
+    """Get drift detection results."""
+    return JSONResponse(await fetch_all(
+        select(DriftDetection).order_by(DriftDetection.timestamp.desc()).limit(50)
+    ))
+
+async def get_alerts(request):
+    """Get active alerts."""
+    return JSONResponse(await fetch_all(
+        select(Alert).where(Alert.status == 'active').order_by(Alert.triggered_at.desc())
+    ))
+
+async def get_model_health(request):
+    """Get the latest computed model health (served from memory)."""
+    if health_monitor is None:
+        return JSONResponse({'error': 'Health monitor is disabled'}, status_code=503)
+    state = health_monitor.latest()
+    models = state['models']
+    for name in ('model_version_id', 'deployment_id'):
+        value = request.query_params.get(name)
+        if value is not None and value.isdigit():
+            models = [m for m in models if m[name] == int(value)]
+    return JSONResponse(dict(state, models=models))
+
+# Prediction API
+async def resolve_scoring_model(data):
+    """Model dict, id and version a scoring request targets.
+
+    A ``model_name`` without ``model_version_id`` resolves to the current
+    production version; returns None for the model if none exists.
+    """
+    model_version_id = data.get('model_version_id', 1)
+    async with AsyncSessionLocal() as db:
+        if data.get('model_name') and 'model_version_id' not in data:
+            model = await db.scalar(
+                select(ModelVersion)
+                .where(ModelVersion.stage == 'production', ModelVersion.name == data['model_name'])
+                .order_by(ModelVersion.id.desc()).limit(1)
+            )
+            if model is None:
+                return None, None, None
+            return model.to_dict(), model.id, model.version
+        model = await db.get(ModelVersion, model_version_id)
+        return model.to_dict() if model else None, model_version_id, '1.0.0'
+
+async def predict(request):
+    """Make a prediction, running inference on the executor."""
+    data = await get_json(request)
+    features = data.get('features', {})
+    if not isinstance(features, dict):
+        return JSONResponse({'error': 'features must be an object'}, status_code=400)
+    model, model_version_id, model_version = await resolve_scoring_model(data)
+    if model_version_id is None:
+        return JSONResponse({'error': 'No production model found'}, status_code=404)
+
+    # Schema validation and preprocessing, shared with the Flask app
+    if model:
+        try:
+            matrix = await asyncio.to_thread(prepare_features, model, [features])
+        except FeatureValidationError as e:
+            return JSONResponse({'error': 'Invalid features', 'errors': e.errors}, status_code=422)
+        if matrix is not None:
+            features = matrix[0]
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, run_inference, features)
+
+    # Log prediction
+    try:
+        log_entry = PredictionLog(
+            request_id=str(uuid.uuid4()),
+            model_version_id=model_version_id,
+            deployment_id=data.get('deployment_id', 1),
+            input_hash='mock_hash',
+            input_features=list(data.get('features', {}).keys()),
+            prediction={'class': result['prediction']},
+            prediction_probability={'class_0': 1-result['probability'], 'class_1': result['probability']},
+            confidence_score=result['confidence'],
+            latency=result['latency'],
+            user_id=data.get('user_id'),
+            session_id=data.get('session_id')
+        )
+        if partition_store is not None:
+            await asyncio.to_thread(partition_store.add, log_entry)
+        else:
+            await add_row(log_entry)
+    except Exception:
+        logger.exception("Error logging prediction")
+
+    return JSONResponse({
+        'prediction': result['prediction'],
+        'probability': result['probability'],
+        'confidence': result['confidence'],
+        'model_version': model_version,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+# Dashboard API
+async def dashboard_overview(request):
+    """Get dashboard overview data."""
+    async with AsyncSessionLocal() as db:
+        # Get counts
+        model_count = await db.scalar(select(func.count()).select_from(ModelVersion))
+        experiment_count = await db.scalar(select(func.count()).select_from(Experiment))
+        deployment_count = await db.scalar(select(func.count()).select_from(Deployment))
+        active_alerts = await db.scalar(
+            select(func.count()).select_from(Alert).where(Alert.status == 'active')
+        )
+
+        # Get recent metrics
+        if partition_store is not None:
+            recent_metrics = next(iter(
+                await asyncio.to_thread(partition_store.latest, ModelMetrics, limit=1)
+            ), None)
+        else:
+            recent_metrics = await db.scalar(
+                select(ModelMetrics).order_by(ModelMetrics.timestamp.desc()).limit(1)
+            )
+            recent_metrics = recent_metrics.to_dict() if recent_metrics else None
+
+        return JSONResponse({
+            'model_count': model_count,
+            'experiment_count': experiment_count,
+            'deployment_count': deployment_count,
+            'active_alerts': active_alerts,
+            'recent_metrics': recent_metrics,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+
+async def prometheus_metrics(request):
+    """Prometheus scrape endpoint."""
+    return Response(registry.expose(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Initialize sample data
+async def init_sample_data(request):
+    """Initialize sample data for demonstration."""
+    import random
+    async with AsyncSessionLocal() as db:
+        try:
+            # Create sample model
+            model = ModelVersion(
+                name='fraud_detection_model',
+                version='1.0.0',
+                algorithm='random_forest',
+                framework='scikit-learn',
+                description='Fraud detection model for credit card transactions',
+                tags=['fraud', 'classification', 'production'],
+                accuracy=0.95,
+                precision=0.92,
+                recall=0.88,
+                f1_score=0.90,
+                auc_score=0.96,
+                training_dataset_size=10000,
+                training_duration=120.5,
+                hyperparameters={'n_estimators': 100, 'max_depth': 10},
+                status='deployed',
+                stage='production'
+            )
+            db.add(model)
+            await db.flush()
+
+            # Create sample deployment
+            deployment = Deployment(
+                deployment_id='fraud-model-prod-001',
+                name='Fraud Detection Production',
+                description='Production deployment of fraud detection model',
+                environment='production',
+                deployment_type='blue_green',
+                traffic_percentage=100.0,
+                endpoint_url='https://api.company.com/fraud/predict',
+                instance_type='t3.medium',
+                instance_count=3,
+                model_version_id=model.id,
+                status='active'
+            )
+            db.add(deployment)
+            await db.flush()
+
+            # Create sample metrics
+            metrics = [
+                ModelMetrics(
+                    model_version_id=model.id,
+                    deployment_id=deployment.id,
+                    accuracy=random.uniform(0.90, 0.96),
+                    precision=random.uniform(0.88, 0.94),
+                    recall=random.uniform(0.85, 0.92),
+                    f1_score=random.uniform(0.87, 0.93),
+                    prediction_count=random.randint(100, 1000),
+                    error_count=random.randint(0, 10),
+                    avg_latency=random.uniform(50, 150),
+                    cpu_usage=random.uniform(20, 80),
+                    memory_usage=random.uniform(30, 70)
+                )
+                for i in range(10)
+            ]
+            if partition_store is not None:
+                for row in metrics:
+                    await asyncio.to_thread(partition_store.add, row)
+            else:
+                db.add_all(metrics)
+
+            await db.commit()
+            return JSONResponse({'message': 'Sample data initialized successfully'})
+        except Exception as e:
+            await db.rollback()
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+# Static file serving
+async def serve(request):
+    path = request.path_params.get('path', '')
+    if path != "" and os.path.isfile(os.path.join(STATIC_FOLDER, path)):
+        return FileResponse(os.path.join(STATIC_FOLDER, path))
+
+    index_path = os.path.join(STATIC_FOLDER, 'index.html')
+    if os.path.exists(index_path):
+        return FileResponse(index_path)
+    return JSONResponse({
+        'message': 'MLOps Pipeline API',
+        'version': '1.0.0',
+        'endpoints': [
+            '/api/health',
+            '/api/models',
+            '/api/experiments',
+            '/api/deployments',
+            '/api/monitoring/metrics',
+            '/api/monitoring/drift',
+            '/api/monitoring/alerts',
+            '/api/predict',
+            '/api/dashboard/overview',
+            '/metrics'
+        ]
+    })
+
+routes = [
+    Route('/api/health', health_check, methods=['GET']),
+    Route('/api/models', list_models, methods=['GET']),
+    Route('/api/models', register_model, methods=['POST']),
+    Route('/api/models/{model_id:int}', get_model, methods=['GET']),
+    Route('/api/models/{model_id:int}/promote', promote_model, methods=['PUT']),
+    Route('/api/experiments', list_experiments, methods=['GET']),
+    Route('/api/experiments', create_experiment, methods=['POST']),
+    Route('/api/deployments', list_deployments, methods=['GET']),
+    Route('/api/deployments', create_deployment, methods=['POST']),
+    Route('/api/monitoring/metrics', get_metrics, methods=['GET']),
+    Route('/api/monitoring/metrics', log_metrics, methods=['POST']),
+    Route('/api/monitoring/drift', get_drift_detection, methods=['GET']),
+    Route('/api/monitoring/alerts', get_alerts, methods=['GET']),
+    Route('/api/monitoring/health', get_model_health, methods=['GET']),
+    Route('/api/predict', predict, methods=['POST']),
+    Route('/api/dashboard/overview', dashboard_overview, methods=['GET']),
+    Route('/api/init-sample-data', init_sample_data, methods=['POST']),
+    Route('/metrics', prometheus_metrics, methods=['GET']),
+    Route('/', serve, methods=['GET']),
+    Route('/{path:path}', serve, methods=['GET']),
+]
+
+# Enable CORS for all routes
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(ASGIRequestMetrics),
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+    ],
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
@@ -0,0 +1,85 @@
+"""
+Generate seeded synthetic registry and monitoring data for scale testing.
+
+Usage::
+
+    python -m src.cli.generate_data --seed 7 --models 2000 --experiments 5000 \\
+        --predictions 2000000 --days 14 --workers 8
+    python -m src.cli.generate_data --predictions 200000 --alerts 2000 --pending-alerts
+
+The same seed, sizes and ``--end`` produce the same rows. Rows are
+appended after the existing primary keys, so the target database does
+not need to be empty. With MONITORING_PARTITIONS set, prediction logs
+and model metrics are written to the partition files under
+PARTITION_PATH.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.cli.migrate import migrate
+from src.db import engine
+from src.services.partitions import store_from_env
+from src.services.synthetic import DEFAULT_CHUNK_SIZE, SyntheticDataGenerator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--models', type=int, default=2000, help='model versions')
+    parser.add_argument('--names', type=int, default=100, help='distinct model names')
+    parser.add_argument('--experiments', type=int, default=5000)
+    parser.add_argument('--predictions', type=int, default=1000000)
+    parser.add_argument('--alerts', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=7, help='days of monitoring history')
+    parser.add_argument('--end', type=datetime.fromisoformat,
+                        help='UTC end of the generated history (default: now)')
+    parser.add_argument('--metric-steps', type=int, default=20, help='logged steps per experiment curve')
+    parser.add_argument('--metrics-interval', type=int, default=15, help='minutes between model metric rows')
+    parser.add_argument('--pending-alerts', action='store_true',
+                        help='leave active alerts unsent for the notification dispatcher')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per insert chunk')
+    args = parser.parse_args(argv)
+    if args.models < 1 or args.days < 1:
+        parser.error('--models and --days must be at least 1')
+
+    migrate(engine)
+    started = time.perf_counter()
+    last_report = [started]
+
+    def progress(counts):
+        now = time.perf_counter()
+        if now - last_report[0] >= 2:
+            last_report[0] = now
+            summary = ', '.join(f"{table}={rows}" for table, rows in sorted(counts.items()))
+            print(f"[{now - started:6.1f}s] {summary}", file=sys.stderr)
+
+    generator = SyntheticDataGenerator(
+        engine, seed=args.seed, end=args.end, days=args.days, workers=args.workers,
+        chunk_size=args.chunk_size, partition_store=store_from_env(), progress=progress
+    )
+    counts = generator.generate(
+        models=args.models, names=args.names, experiments=args.experiments,
+        predictions=args.predictions, alerts=args.alerts, metric_steps=args.metric_steps,
+        metrics_interval=args.metrics_interval, pending_alerts=args.pending_alerts
+    )
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        'seed': args.seed,
+        'start': generator.start.isoformat(),
+        'end': generator.end.isoformat(),
+        'tables': counts,
+        'rows': sum(counts.values()),
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(sum(counts.values()) / seconds) if seconds else None,
+    }, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Create missing tables, columns and indexes in the configured database.
+
+Run once per deploy, before starting the API servers::
+
+    DATABASE_URL=postgresql://... python -m src.cli.migrate
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.db import create_missing_columns, create_missing_indexes, engine
+
+def migrate(bind=engine):
+    """Bring the schema up to date; safe to run repeatedly."""
+    # Import every model module so its tables are registered on Base.metadata
+    from src.models import model_registry, monitoring  # noqa: F401
+    from src.models.model_registry import Base
+    Base.metadata.create_all(bind=bind)
+    create_missing_columns(Base.metadata, bind=bind)
+    create_missing_indexes(Base.metadata, bind=bind)
+    return sorted(Base.metadata.tables)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args(argv)
+    tables = migrate()
+    print(f"Schema up to date on {engine.url.render_as_string(hide_password=True)}: "
+          f"{len(tables)} tables")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
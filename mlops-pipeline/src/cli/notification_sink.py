@@ -0,0 +1,41 @@
+"""
+Run a local stand-in sink for webhook notifications.
+
+Point the API's webhook channel at it to watch digests arrive, optionally
+failing requests to exercise retries and backoff::
+
+    python -m src.cli.notification_sink --port 8025 --output sink.jsonl --fail-rate 0.2
+    NOTIFY_WEBHOOK_URL=http://127.0.0.1:8025/ python src/main.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.notifications import StandInSink
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--output', help='append received payloads to this JSON lines file')
+    parser.add_argument('--fail-first', type=int, default=0, help='fail this many requests first')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='fraction of requests to fail')
+    parser.add_argument('--fail-status', type=int, default=503)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds to wait per request')
+    args = parser.parse_args(argv)
+
+    sink = StandInSink(args.host, args.port, output_path=args.output, fail_first=args.fail_first,
+                       fail_rate=args.fail_rate, fail_status=args.fail_status, latency=args.latency)
+    print(f"Notification sink listening on {sink.url}")
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Received {len(sink.received)} notification(s) in {sink.requests} request(s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Register a dataset version from a local CSV or Parquet file.
+
+Usage::
+
+    python -m src.cli.register_dataset data/transactions.csv \\
+        --name transactions --version 2024.06 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.cli.migrate import migrate
+from src.db import get_db
+from src.services.dataset_profiler import DEFAULT_CHUNK_SIZE, profile_dataset, register_dataset
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('file_path')
+    parser.add_argument('--name', required=True)
+    parser.add_argument('--version', required=True)
+    parser.add_argument('--description')
+    parser.add_argument('--source')
+    parser.add_argument('--format', choices=['csv', 'parquet'])
+    parser.add_argument('--workers', type=int, help='profiling processes (default: CPU count)')
+    parser.add_argument('--chunk-size-mb', type=int, default=DEFAULT_CHUNK_SIZE // (1024 * 1024))
+    parser.add_argument('--dry-run', action='store_true', help='print the profile without registering')
+    args = parser.parse_args(argv)
+
+    options = {'format': args.format, 'workers': args.workers,
+               'chunk_size': args.chunk_size_mb * 1024 * 1024}
+    try:
+        if args.dry_run:
+            result = profile_dataset(args.file_path, **options)
+        else:
+            db = get_db()
+            try:
+                migrate(db.get_bind())
+                result = register_dataset(db, args.name, args.version, args.file_path,
+                                          description=args.description, source=args.source,
+                                          **options).to_dict()
+            finally:
+                db.close()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Export or import a snapshot of the registry and recent monitoring data.
+
+Usage::
+
+    python -m src.cli.snapshot export staging.snapshot.tar --days 7 --workers 4
+    python -m src.cli.snapshot export full.snapshot.tar --tables registry,monitoring,predictions --artifacts
+    DATABASE_URL=sqlite:///staging.db python -m src.cli.snapshot import staging.snapshot.tar --replace
+    python -m src.cli.snapshot inspect staging.snapshot.tar
+
+``--tables`` takes table names or the groups registry, monitoring and
+predictions (default: registry,monitoring). With MONITORING_PARTITIONS
+set, partitioned tables are read from and written to PARTITION_PATH.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.services.partitions import store_from_env
+from src.services.snapshots import SnapshotError, export_snapshot, import_snapshot, read_manifest
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help='write a snapshot archive')
+    export_parser.add_argument('path')
+    export_parser.add_argument('--tables', help='comma-separated tables or groups')
+    export_parser.add_argument('--days', type=int, default=7,
+                               help='days of time-series rows to include (0 for all)')
+    export_parser.add_argument('--workers', type=int, default=4, help='tables exported in parallel (PostgreSQL)')
+    export_parser.add_argument('--artifacts', action='store_true', help='include referenced artifact blobs')
+    export_parser.add_argument('--compress-level', type=int, default=6, choices=range(1, 10))
+
+    import_parser = commands.add_parser('import', help='load a snapshot archive')
+    import_parser.add_argument('path')
+    import_parser.add_argument('--tables', help='only load these tables')
+    import_parser.add_argument('--replace', action='store_true', help='delete existing rows first')
+    import_parser.add_argument('--artifacts', action='store_true', help='load bundled artifact blobs')
+
+    inspect_parser = commands.add_parser('inspect', help='print a snapshot manifest')
+    inspect_parser.add_argument('path')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.command == 'inspect':
+            result = read_manifest(args.path)
+        elif args.command == 'export':
+            manifest = export_snapshot(
+                args.path, tables=_split(args.tables), days=args.days or None,
+                partition_store=store_from_env(), workers=args.workers,
+                include_artifacts=args.artifacts, compresslevel=args.compress_level
+            )
+            result = {'path': args.path, 'bytes': os.path.getsize(args.path),
+                      'tables': {entry['name']: entry['rows'] for entry in manifest['tables']},
+                      'artifacts': len(manifest['artifacts'])}
+        else:
+            artifact_store = None
+            if args.artifacts:
+                from src.services.artifact_store import get_store
+                artifact_store = get_store()
+            result = import_snapshot(args.path, partition_store=store_from_env(),
+                                     tables=_split(args.tables), replace=args.replace,
+                                     artifact_store=artifact_store)
+    except (SnapshotError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if args.command != 'inspect':
+        result['seconds'] = round(time.perf_counter() - started, 3)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Database engine and session configuration shared by the API entry points.
+"""
+
+import os
+from contextlib import nullcontext
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from src.middleware.timing import instrument_engine, phase
+
+# Database configuration
+database_path = os.path.join(os.path.dirname(__file__), 'database', 'mlops.db')
+os.makedirs(os.path.dirname(database_path), exist_ok=True)
+DATABASE_URL = os.environ.get('DATABASE_URL', f"sqlite:///{database_path}")
+
+# Create database engine and session
+engine = create_engine(DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Per-request query time and count, read by the timing middleware
+instrument_engine(engine)
+
+def get_db():
+    """Get database session."""
+    with phase('session'):
+        db = SessionLocal()
+    try:
+        return db
+    finally:
+        pass
+
+def create_missing_indexes(metadata, bind=engine):
+    """Create indexes declared on existing tables, which create_all skips."""
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+def create_missing_columns(metadata, bind=engine):
+    """Add nullable columns declared on existing tables, which create_all skips.
+
+    ``bind`` may be an Engine or a Connection already inside a transaction
+    (e.g. ``AsyncConnection.run_sync``), which is used as-is.
+    """
+    inspector = inspect(bind)
+    added = []
+    with bind.begin() if isinstance(bind, Engine) else nullcontext(bind) as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                preparer = conn.dialect.identifier_preparer
+                conn.execute(text(f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN '
+                                  f'{preparer.format_column(column)} '
+                                  f'{column.type.compile(dialect=conn.dialect)}'))
+                added.append(f'{table.name}.{column.name}')
+    return added
+
+def reset_sequences(conn, tables):
+    """Move PostgreSQL id sequences past rows inserted with explicit primary keys."""
+    if conn.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        if 'id' in table.c:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            ))
+
+def async_database_url(url=DATABASE_URL):
+    """Translate a sync database URL into its asyncio driver equivalent."""
+    drivers = {
+        'sqlite://': 'sqlite+aiosqlite://',
+        'postgresql://': 'postgresql+asyncpg://',
+    }
+    for prefix, async_prefix in drivers.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
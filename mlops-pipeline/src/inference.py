@@ -0,0 +1,39 @@
+"""
+Model inference entry point shared by the WSGI and ASGI apps.
+"""
+
+import random
+
+def run_inference(features):
+    """Make a prediction (mock implementation).
+
+    Kept free of request and database state so it can run in a worker
+    thread or process. ``features`` is the request's feature dict, or a
+    float64 array in model order when the model has a feature schema or
+    preprocessing pipeline.
+    """
+    prediction = random.choice([0, 1])
+    probability = random.random()
+    confidence = random.uniform(0.7, 0.95)
+    return {
+        'prediction': prediction,
+        'probability': probability,
+        'confidence': confidence,
+        'latency': random.uniform(10, 100)
+    }
+
+def run_batch_inference(matrix, count):
+    """Predict ``count`` rows at once (mock implementation).
+
+    ``matrix`` is the preprocessed ``(count, k)`` float64 array, or None
+    for models without a schema or pipeline.
+    """
+    import numpy as np
+    rng = np.random.default_rng()
+    probability = rng.random(count)
+    return {
+        'prediction': (probability >= 0.5).astype(int).tolist(),
+        'probability': probability.tolist(),
+        'confidence': rng.uniform(0.7, 0.95, count).tolist(),
+        'latency': float(rng.uniform(10, 100))
+    }
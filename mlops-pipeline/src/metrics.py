@@ -0,0 +1,299 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Counters, gauges and fixed-bucket histograms keep one value shard per
+thread, so an observation is a plain list update by the owning thread with
+no lock taken; shards are only summed when ``/metrics`` is scraped. Shards
+are keyed by thread ident, which the runtime reuses, so short-lived request
+threads do not grow the registry.
+"""
+
+import os
+import resource
+import threading
+import time
+from bisect import bisect_left
+from threading import get_ident
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+class _ShardedChild:
+    """Fixed-size float vector sharded per thread."""
+
+    __slots__ = ('_size', '_shards', '_lock')
+
+    def __init__(self, size):
+        self._size = size
+        self._shards = {}
+        self._lock = threading.Lock()
+
+    def _new_shard(self):
+        with self._lock:
+            return self._shards.setdefault(get_ident(), [0.0] * self._size)
+
+    def _totals(self):
+        with self._lock:
+            shards = list(self._shards.values())
+        totals = [0.0] * self._size
+        for shard in shards:
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+class CounterChild(_ShardedChild):
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount=1.0):
+        shard = self._shards.get(get_ident()) or self._new_shard()
+        shard[0] += amount
+
+    def get(self):
+        return self._totals()[0]
+
+class GaugeChild:
+    __slots__ = ('_value', '_function', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = value
+
+    def set_function(self, function):
+        """Evaluate ``function`` at scrape time instead of storing a value."""
+        self._function = function
+
+    def inc(self, amount=1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1.0):
+        with self._lock:
+            self._value -= amount
+
+    def get(self):
+        if self._function is not None:
+            return float(self._function())
+        return self._value
+
+class HistogramChild(_ShardedChild):
+    __slots__ = ('_bounds', '_sum_index')
+
+    def __init__(self, bounds):
+        # One slot per bucket, then +Inf and the running sum; the count is
+        # the total of the bucket slots and is derived at scrape time
+        super().__init__(len(bounds) + 2)
+        self._bounds = bounds
+        self._sum_index = len(bounds) + 1
+
+    def observe(self, value):
+        shard = self._shards.get(get_ident()) or self._new_shard()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[self._sum_index] += value
+
+    def get(self):
+        """Return (cumulative bucket counts, sum, count)."""
+        totals = self._totals()
+        cumulative = []
+        running = 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Child metric for one label combination; cache it on hot paths."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            child = self._add_child(values)
+        return child
+
+    def _add_child(self, values):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        with self._lock:
+            return self._children.setdefault(values, self._new_child())
+
+    def _samples(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        for values, child in self._samples():
+            lines.extend(self._expose_child(values, child))
+        return lines
+
+    def _expose_child(self, values, child):
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}']
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount=1.0):
+        self._default.inc(amount)
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def set_function(self, function):
+        self._default.set_function(function)
+
+    def inc(self, amount=1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount=1.0):
+        self._default.dec(amount)
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def _expose_child(self, values, child):
+        cumulative, total, count = child.get()
+        lines = []
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), cumulative):
+            labels = _format_labels(self.labelnames, values, f'le="{_format_value(float(bound))}"')
+            lines.append(f'{self.name}_bucket{labels} {_format_value(bucket_count)}')
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {_format_value(count)}')
+        return lines
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together on ``/metrics``."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.metric_type}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, collector):
+        """Register a callable returning extra exposition text at scrape time."""
+        self._collectors.append(collector)
+
+    def expose(self):
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        text = '\n'.join(lines) + '\n'
+        for collector in self._collectors:
+            text += collector()
+        return text
+
+# Process-wide default registry
+registry = MetricsRegistry()
+
+_process_start = time.time()
+_page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def _resident_memory_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _page_size
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+registry.gauge('process_start_time_seconds', 'Start time of the process since unix epoch in seconds.') \
+    .set(_process_start)
+registry.gauge('process_resident_memory_bytes', 'Resident memory size in bytes.') \
+    .set_function(_resident_memory_bytes)
+registry.gauge('process_cpu_seconds_total', 'Total user and system CPU time spent in seconds.') \
+    .set_function(_cpu_seconds)
+registry.gauge('process_threads', 'Number of live Python threads.') \
+    .set_function(threading.active_count)
+
+def register_pool_metrics(engine, name='default'):
+    """Expose connection pool statistics of a SQLAlchemy engine."""
+    pool = engine.pool
+    gauges = {
+        'size': ('mlops_db_pool_size', 'Configured connection pool size.'),
+        'checkedin': ('mlops_db_pool_checked_in', 'Idle connections in the pool.'),
+        'checkedout': ('mlops_db_pool_checked_out', 'Connections currently in use.'),
+        'overflow': ('mlops_db_pool_overflow', 'Connections opened beyond the pool size.'),
+    }
+    for attribute, (metric_name, documentation) in gauges.items():
+        method = getattr(pool, attribute, None)
+        if callable(method):
+            registry.gauge(metric_name, documentation, ['engine']).labels(name).set_function(method)
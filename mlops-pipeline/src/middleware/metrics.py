@@ -0,0 +1,98 @@
+"""
+Flask hooks recording request metrics into the process registry.
+"""
+
+import time
+
+from flask import Response, g, request
+
+from src.metrics import registry
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class RequestMetrics:
+    """Flask extension counting requests and timing them per route."""
+
+    def __init__(self, app=None, metrics_registry=registry):
+        self.registry = metrics_registry
+        self.requests = metrics_registry.counter(
+            'mlops_http_requests_total', 'HTTP requests by route, method and status.',
+            ['method', 'route', 'status'])
+        self.errors = metrics_registry.counter(
+            'mlops_http_request_errors_total', 'HTTP requests that returned a 5xx status.',
+            ['method', 'route'])
+        self.latency = metrics_registry.histogram(
+            'mlops_http_request_duration_seconds', 'HTTP request latency by route.',
+            ['method', 'route'], buckets=LATENCY_BUCKETS)
+        self.in_flight = metrics_registry.gauge(
+            'mlops_http_requests_in_flight', 'HTTP requests currently being served.')
+        # (method, route, status) -> bound children, so the hot path skips label lookups
+        self._children = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view, methods=['GET'])
+        app.extensions['request_metrics'] = self
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        self.in_flight.inc()
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        self.in_flight.dec()
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        self.observe(request.method, route, response.status_code, elapsed)
+        return response
+
+    def observe(self, method, route, status, elapsed):
+        """Record one finished request."""
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children.setdefault(key, (
+                self.latency.labels(method, route),
+                self.requests.labels(method, route, str(status)),
+                self.errors.labels(method, route) if status >= 500 else None
+            ))
+        latency, requests, errors = children
+        latency.observe(elapsed)
+        requests.inc()
+        if errors is not None:
+            errors.inc()
+
+    def metrics_view(self):
+        """Prometheus scrape endpoint."""
+        return Response(self.registry.expose(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+class ASGIRequestMetrics:
+    """ASGI middleware recording the same request metrics for ``src.asgi``."""
+
+    def __init__(self, app, metrics_registry=registry):
+        self.app = app
+        self.metrics = RequestMetrics(metrics_registry=metrics_registry)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        status = {'code': 500}
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+
+        started = time.perf_counter()
+        self.metrics.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight.dec()
+            route = getattr(scope.get('route'), 'path', '<unmatched>')
+            self.metrics.observe(scope['method'], route, status['code'], time.perf_counter() - started)
@@ -0,0 +1,319 @@
+"""
+Opt-in request profiling middleware for the Flask app.
+
+Records per-route wall time broken into phases (JSON parsing, session
+setup, query, feature preparation, ``to_dict`` serialization, response
+encoding), counts SQL queries per request to surface N+1 patterns, and
+samples cProfile or statistical stack profiles on a configurable
+fraction of requests. The aggregates are served on ``/api/internal/perf``
+as JSON, or as Prometheus text with ``?format=prometheus``.
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+
+from flask import Request, Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+from src.middleware.timing import phase, start_request_stats, stop_request_stats
+
+PHASES = ('json_parse', 'session', 'query', 'features', 'to_dict', 'encode', 'other')
+
+class ProfiledRequest(Request):
+    """Request class that times JSON body parsing."""
+
+    def get_json(self, *args, **kwargs):
+        with phase('json_parse'):
+            return super().get_json(*args, **kwargs)
+
+class ProfiledJSONProvider(DefaultJSONProvider):
+    """JSON provider that times response encoding."""
+
+    def response(self, *args, **kwargs):
+        with phase('encode'):
+            return super().response(*args, **kwargs)
+
+class RouteStats:
+    """Aggregated timings for one (method, route) pair."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.total_max = 0.0
+        self.phase_totals = dict.fromkeys(PHASES, 0.0)
+        self.phase_max = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.queries_max = 0
+        self.n_plus_one = 0
+        self.n_plus_one_example = None
+
+    def to_dict(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': self.total / count * 1000.0,
+            'max_ms': self.total_max * 1000.0,
+            'phases': {
+                name: {
+                    'avg_ms': self.phase_totals[name] / count * 1000.0,
+                    'max_ms': self.phase_max[name] * 1000.0,
+                    'share': self.phase_totals[name] / self.total if self.total else 0.0
+                }
+                for name in PHASES
+            },
+            'queries': {'avg': self.queries / count, 'max': self.queries_max},
+            'n_plus_one': self.n_plus_one,
+            'n_plus_one_example': self.n_plus_one_example
+        }
+
+class StackSampler(threading.Thread):
+    """Statistical profiler sampling the stacks of registered request threads."""
+
+    def __init__(self, interval=0.005, max_depth=64):
+        super().__init__(name='perf-stack-sampler', daemon=True)
+        self.interval = interval
+        self.max_depth = max_depth
+        self.lock = threading.Lock()
+        self.active = {}  # thread id -> route key
+        self.stacks = {}  # route key -> Counter of folded stacks
+
+    def register(self, thread_id, route):
+        with self.lock:
+            self.active[thread_id] = route
+
+    def unregister(self, thread_id):
+        with self.lock:
+            self.active.pop(thread_id, None)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.active:
+                    continue
+                active = dict(self.active)
+            frames = sys._current_frames()
+            for thread_id, route in active.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                folded = ';'.join(reversed(stack))
+                with self.lock:
+                    self.stacks.setdefault(route, Counter())[folded] += 1
+
+    def top(self, limit=20):
+        with self.lock:
+            return {
+                route: [{'stack': stack, 'samples': samples} for stack, samples in counter.most_common(limit)]
+                for route, counter in self.stacks.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.stacks = {}
+
+def _cprofile_rows(profile, limit=25):
+    """Top functions of a cProfile run by cumulative time."""
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    stats.sort_stats('cumulative')
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        call_count, primitive_calls, tottime, cumtime, callers = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            'function': f"{filename.rsplit('/', 1)[-1]}:{line}({name})",
+            'ncalls': call_count,
+            'tottime_ms': tottime * 1000.0,
+            'cumtime_ms': cumtime * 1000.0
+        })
+    return rows
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RequestProfiler:
+    """Flask extension collecting per-route phase timings and profiles."""
+
+    def __init__(self, app=None):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.profiles = deque(maxlen=20)
+        self.sampler = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.sample_rate = app.config.get('PERF_SAMPLE_RATE', 0.01)
+        self.profiler = app.config.get('PERF_PROFILER', 'cprofile')
+        self.n_plus_one_threshold = app.config.get('PERF_N_PLUS_ONE_THRESHOLD', 10)
+        self.profiles = deque(maxlen=app.config.get('PERF_MAX_PROFILES', 20))
+        if self.profiler == 'sampling':
+            self.sampler = StackSampler(interval=app.config.get('PERF_SAMPLING_INTERVAL', 0.005))
+            self.sampler.start()
+
+        app.request_class = ProfiledRequest
+        app.json = ProfiledJSONProvider(app)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/api/internal/perf', 'internal_perf', self.perf_view, methods=['GET', 'DELETE'])
+        app.extensions['request_profiler'] = self
+
+    @staticmethod
+    def _route_key():
+        rule = request.url_rule.rule if request.url_rule else '<unmatched>'
+        return request.method, rule
+
+    def _before_request(self):
+        g.perf_stats = start_request_stats()
+        g.perf_profile = None
+        if self.sample_rate and random.random() < self.sample_rate:
+            if self.sampler is not None:
+                self.sampler.register(threading.get_ident(), ' '.join(self._route_key()))
+                g.perf_profile = 'sampling'
+            else:
+                g.perf_profile = cProfile.Profile()
+                g.perf_profile.enable()
+
+    def _after_request(self, response):
+        stats = g.get('perf_stats')
+        if stats is None:
+            return response
+        total = stats.elapsed()
+        profile = g.pop('perf_profile', None)
+        if isinstance(profile, cProfile.Profile):
+            profile.disable()
+        elif profile == 'sampling':
+            self.sampler.unregister(threading.get_ident())
+
+        phases = dict(stats.phases, query=stats.query_time)
+        phases['other'] = max(0.0, total - sum(phases.values()))
+        key = self._route_key()
+        with self.lock:
+            route = self.routes.get(key)
+            if route is None:
+                route = self.routes[key] = RouteStats()
+            route.count += 1
+            if response.status_code >= 400:
+                route.errors += 1
+            route.total += total
+            route.total_max = max(route.total_max, total)
+            for name, seconds in phases.items():
+                route.phase_totals[name] = route.phase_totals.get(name, 0.0) + seconds
+                route.phase_max[name] = max(route.phase_max.get(name, 0.0), seconds)
+            route.queries += stats.query_count
+            route.queries_max = max(route.queries_max, stats.query_count)
+            if stats.query_count >= self.n_plus_one_threshold:
+                route.n_plus_one += 1
+                route.n_plus_one_example = {
+                    'path': request.full_path,
+                    'queries': stats.query_count,
+                    'timestamp': datetime.utcnow().isoformat()
+                }
+        if isinstance(profile, cProfile.Profile):
+            self.profiles.append({
+                'method': key[0],
+                'route': key[1],
+                'path': request.full_path,
+                'total_ms': total * 1000.0,
+                'queries': stats.query_count,
+                'timestamp': datetime.utcnow().isoformat(),
+                'functions': _cprofile_rows(profile)
+            })
+        return response
+
+    def _teardown_request(self, exc):
+        profile = g.pop('perf_profile', None)
+        if isinstance(profile, cProfile.Profile):
+            profile.disable()
+        elif profile == 'sampling':
+            self.sampler.unregister(threading.get_ident())
+        g.pop('perf_stats', None)
+        stop_request_stats()
+
+    def snapshot(self):
+        """Current aggregates as a JSON-serializable dict."""
+        with self.lock:
+            routes = [
+                dict(stats.to_dict(), method=method, route=rule)
+                for (method, rule), stats in sorted(self.routes.items(), key=lambda item: item[0][1])
+            ]
+        return {
+            'profiler': self.profiler,
+            'sample_rate': self.sample_rate,
+            'n_plus_one_threshold': self.n_plus_one_threshold,
+            'routes': routes,
+            'profiles': list(self.profiles),
+            'stacks': self.sampler.top() if self.sampler is not None else {}
+        }
+
+    def prometheus(self):
+        """Aggregates in the Prometheus text exposition format."""
+        lines = [
+            '# HELP mlops_perf_requests_total Requests observed by the profiler.',
+            '# TYPE mlops_perf_requests_total counter',
+        ]
+        with self.lock:
+            routes = sorted(self.routes.items(), key=lambda item: item[0][1])
+            rows = [(f'method="{method}",route="{_escape_label(rule)}"', stats) for (method, rule), stats in routes]
+            lines += [f'mlops_perf_requests_total{{{labels}}} {stats.count}' for labels, stats in rows]
+            lines += [
+                '# HELP mlops_perf_request_errors_total Requests that returned a 4xx or 5xx status.',
+                '# TYPE mlops_perf_request_errors_total counter',
+            ]
+            lines += [f'mlops_perf_request_errors_total{{{labels}}} {stats.errors}' for labels, stats in rows]
+            lines += [
+                '# HELP mlops_perf_phase_seconds_total Wall time spent in each request phase.',
+                '# TYPE mlops_perf_phase_seconds_total counter',
+            ]
+            for labels, stats in rows:
+                lines += [
+                    f'mlops_perf_phase_seconds_total{{{labels},phase="{name}"}} {stats.phase_totals[name]:.9f}'
+                    for name in PHASES
+                ]
+            lines += [
+                '# HELP mlops_perf_queries_total SQL queries executed.',
+                '# TYPE mlops_perf_queries_total counter',
+            ]
+            lines += [f'mlops_perf_queries_total{{{labels}}} {stats.queries}' for labels, stats in rows]
+            lines += [
+                '# HELP mlops_perf_queries_max Most SQL queries executed by a single request.',
+                '# TYPE mlops_perf_queries_max gauge',
+            ]
+            lines += [f'mlops_perf_queries_max{{{labels}}} {stats.queries_max}' for labels, stats in rows]
+            lines += [
+                '# HELP mlops_perf_n_plus_one_total Requests at or above the N+1 query threshold.',
+                '# TYPE mlops_perf_n_plus_one_total counter',
+            ]
+            lines += [f'mlops_perf_n_plus_one_total{{{labels}}} {stats.n_plus_one}' for labels, stats in rows]
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+        self.profiles.clear()
+        if self.sampler is not None:
+            self.sampler.reset()
+
+    def perf_view(self):
+        """Serve (GET) or reset (DELETE) the collected profiling data."""
+        if request.method == 'DELETE':
+            self.reset()
+            return jsonify({'message': 'Profiling data reset'})
+        if request.args.get('format') == 'prometheus':
+            return Response(self.prometheus(), mimetype='text/plain; version=0.0.4')
+        return jsonify(self.snapshot())
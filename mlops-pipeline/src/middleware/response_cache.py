@@ -0,0 +1,245 @@
+"""
+Coalesced, briefly cached and pre-compressed GET responses.
+
+Views marked with ``@shared_get()`` are served through ``ResponseCache``:
+
+- Identical concurrent GETs (same path and query string) are
+  single-flighted: the first request runs the view while the others wait
+  for its result, so N dashboard clients cost one query and one JSON
+  encoding.
+- The encoded 200 response body is kept for ``ttl`` seconds (default one
+  second) and served from memory until then. Write views marked with
+  ``@invalidates(*paths)`` drop the cached GETs under those path prefixes
+  when they succeed, so a client reading after its own write does not get
+  the old body. Unmarked writes, notably predictions and logged metrics,
+  leave the cache alone and their rows show up once the TTL expires.
+- gzip and, when the ``brotli`` package is installed, brotli variants are
+  compressed once per cached body, on first demand, and picked by the
+  request's ``Accept-Encoding``. Bodies carry an ``ETag`` and a matching
+  ``If-None-Match`` is answered with 304.
+
+Hits, misses and coalesced waits are counted in the metrics registry.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+
+from flask import Response, g, request
+
+from src.metrics import registry
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+INVALIDATION_HISTORY = 1024
+
+def shared_get(ttl=None):
+    """Mark a GET view as coalesced and cached; ``ttl`` overrides the app default."""
+    def decorate(view):
+        view.response_cache_ttl = ttl
+        return view
+    return decorate
+
+def invalidates(*paths):
+    """Mark a write view as dropping cached GETs whose path starts with one of ``paths``."""
+    def decorate(view):
+        view.response_cache_invalidates = paths
+        return view
+    return decorate
+
+class _Entry:
+    """One encoded response body and its compressed variants."""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'expires', 'variants', 'lock')
+
+    def __init__(self, body, mimetype, expires):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.expires = expires
+        self.variants = {'identity': body}
+        self.lock = threading.Lock()
+
+class _Flight:
+    """A view execution that identical concurrent requests wait on."""
+
+    __slots__ = ('done', 'entry', 'generation')
+
+    def __init__(self, generation):
+        self.done = threading.Event()
+        self.entry = None
+        self.generation = generation
+
+class ResponseCache:
+    """Flask extension single-flighting and caching ``@shared_get`` views."""
+
+    def __init__(self, app=None, ttl=1.0, max_entries=256, min_size=1024, gzip_level=6,
+                 brotli_quality=5, wait_timeout=30.0, metrics_registry=registry):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.wait_timeout = wait_timeout
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._generation = 0  # bumped by every invalidation
+        # (generation, paths) of recent invalidations, to tell whether a flight started before one
+        self._invalidations = deque(maxlen=INVALIDATION_HISTORY)
+        self._lock = threading.Lock()
+        requests = metrics_registry.counter(
+            'mlops_response_cache_requests_total', 'Cacheable GET requests by outcome.', ['result'])
+        self._results = {result: requests.labels(result) for result in ('hit', 'miss', 'coalesced', 'bypass')}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['response_cache'] = self
+        self._app = app
+
+    # Request hooks
+
+    def _view_ttl(self):
+        if request.method != 'GET' or request.endpoint is None:
+            return None
+        view = self._app.view_functions.get(request.endpoint)
+        if view is None or not hasattr(view, 'response_cache_ttl'):
+            return None
+        return view.response_cache_ttl if view.response_cache_ttl is not None else self.ttl
+
+    def _before_request(self):
+        ttl = self._view_ttl()
+        if not ttl:
+            return None
+        key = request.full_path
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+                flight = self._flights.get(key)
+                if flight is None:
+                    # This request runs the view; identical ones wait for it
+                    flight = self._flights[key] = _Flight(self._generation)
+                    g.response_flight = (key, flight, ttl)
+        if entry is not None:
+            self._results['hit'].inc()
+            return self._respond(entry, 'HIT')
+        if 'response_flight' in g:
+            self._results['miss'].inc()
+            return None
+        if flight.done.wait(self.wait_timeout) and flight.entry is not None:
+            self._results['coalesced'].inc()
+            return self._respond(flight.entry, 'COALESCED')
+        # The leader failed or produced an uncacheable response: run the view as usual
+        self._results['bypass'].inc()
+        return None
+
+    def _after_request(self, response):
+        if request.method not in SAFE_METHODS:
+            paths = self._view_invalidates()
+            if paths and response.status_code < 400:
+                self.invalidate(paths)
+            return response
+        flight = g.pop('response_flight', None)
+        if flight is None:
+            return response
+        key, flight, ttl = flight
+        entry = None
+        if (response.status_code == 200 and not response.is_streamed
+                and 'Content-Encoding' not in response.headers and 'Set-Cookie' not in response.headers):
+            entry = _Entry(response.get_data(), response.mimetype, time.monotonic() + ttl)
+            with self._lock:
+                if not self._invalidated_since(key, flight.generation):
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        self._land(key, flight, entry)
+        return self._respond(entry, 'MISS') if entry is not None else response
+
+    def _view_invalidates(self):
+        view = self._app.view_functions.get(request.endpoint) if request.endpoint else None
+        return getattr(view, 'response_cache_invalidates', None)
+
+    def _teardown_request(self, exc):
+        # A view that raised never reached after_request; release its waiters
+        flight = g.pop('response_flight', None)
+        if flight is not None:
+            self._land(flight[0], flight[1], None)
+
+    def _land(self, key, flight, entry):
+        flight.entry = entry
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    # Encoding
+
+    def _compress(self, entry, encoding):
+        variant = entry.variants.get(encoding)
+        if variant is not None:
+            return variant
+        with entry.lock:
+            variant = entry.variants.get(encoding)
+            if variant is None:
+                if encoding == 'br':
+                    variant = brotli.compress(entry.body, quality=self.brotli_quality)
+                else:
+                    variant = gzip.compress(entry.body, compresslevel=self.gzip_level, mtime=0)
+                entry.variants[encoding] = variant
+        return variant
+
+    def _respond(self, entry, state):
+        encoding = 'identity'
+        if len(entry.body) >= self.min_size:
+            encoding = request.accept_encodings.best_match(self.encodings) or 'identity'
+        # Each content coding is its own representation, so it gets its own entity tag
+        etag = entry.etag if encoding == 'identity' else f"{entry.etag}-{encoding}"
+        headers = {'ETag': f'"{etag}"', 'Vary': 'Accept-Encoding', 'X-Response-Cache': state}
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(self._compress(entry, encoding), mimetype=entry.mimetype, headers=headers)
+
+    def _invalidated_since(self, key, generation):
+        """Whether an invalidation covering ``key`` happened after ``generation``; holds _lock."""
+        if generation == self._generation:
+            return False
+        if not self._invalidations or self._invalidations[0][0] > generation + 1:
+            return True  # older than the history we keep
+        return any(key.startswith(paths) for seen, paths in self._invalidations if seen > generation)
+
+    def invalidate(self, paths):
+        """Drop cached responses whose path starts with any of ``paths``."""
+        paths = tuple(paths)
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(paths)]:
+                del self._entries[key]
+            self._generation += 1
+            self._invalidations.append((self._generation, paths))
+
+    def clear(self):
+        self.invalidate(('/',))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(body) for entry in self._entries.values() for body in entry.variants.values()),
+                'in_flight': len(self._flights),
+                'encodings': self.encodings,
+            }
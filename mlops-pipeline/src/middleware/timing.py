@@ -0,0 +1,78 @@
+"""
+Per-request timing primitives shared by the profiling and benchmark hooks.
+
+A ``RequestStats`` object is bound to the current request context; the
+engine listeners add query time and count to it, and ``phase`` blocks add
+named wall-clock sections. Outside a tracked request everything is a no-op.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+_request_stats = ContextVar('request_stats', default=None)
+
+class RequestStats:
+    """Timings collected for a single request."""
+
+    __slots__ = ('started', 'query_time', 'query_count', 'phases')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_time = 0.0
+        self.query_count = 0
+        self.phases = {}
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+def start_request_stats():
+    """Bind a fresh RequestStats object to the current request context."""
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+def current_stats():
+    """RequestStats for the current request, or None when not tracking."""
+    return _request_stats.get()
+
+def stop_request_stats():
+    _request_stats.set(None)
+
+def query_time_ms():
+    """Database time spent in the current request, in milliseconds."""
+    stats = _request_stats.get()
+    return stats.query_time * 1000.0 if stats is not None else None
+
+@contextmanager
+def phase(name):
+    """Time a block as the named phase of the current request."""
+    stats = _request_stats.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_phase(name, time.perf_counter() - started)
+
+def instrument_engine(engine):
+    """Accumulate query time and count for every cursor execution on ``engine``."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_start'].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.query_time += time.perf_counter() - started
+            stats.query_count += 1
@@ -3,7 +3,7 @@ Database models for the MLOps model registry.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey
@@ -14,6 +14,9 @@ class ModelVersion(Base):
     """Model version registry for tracking ML models."""
     
     __tablename__ = 'model_versions'
+    __table_args__ = (
+        Index('ix_model_versions_name_version', 'name', 'version'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
@@ -37,13 +40,17 @@ class ModelVersion(Base):
     training_duration = Column(Float)  # in seconds
     hyperparameters = Column(JSON)
     
+    # Input contract: {"features": [{"name", "type", ...}]}, see services/feature_schema.py
+    feature_schema = Column(JSON)
+    
     # File paths and artifacts
     model_path = Column(String(255))
     artifacts_path = Column(String(255))
+    preprocessing_path = Column(String(255))  # cas:// URI of the fitted preprocessing pipeline
     
     # Status and lifecycle
     status = Column(String(20), default='registered')  # registered, validated, deployed, archived
-    stage = Column(String(20), default='development')  # development, staging, production
+    stage = Column(String(20), default='development', index=True)  # development, staging, production, archived
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -75,6 +82,8 @@ class ModelVersion(Base):
             'training_dataset_size': self.training_dataset_size,
             'training_duration': self.training_duration,
             'hyperparameters': self.hyperparameters,
+            'feature_schema': self.feature_schema,
+            'preprocessing_path': self.preprocessing_path,
             'status': self.status,
             'stage': self.stage,
             'created_at': self.created_at.isoformat() if self.created_at else None,
@@ -97,11 +106,11 @@ class Experiment(Base):
     
     # Training configuration
     dataset_name = Column(String(100))
-    dataset_version = Column(String(20))
+    dataset_version = Column(String(20), index=True)
     feature_set = Column(JSON)
     
     # Model configuration
-    algorithm = Column(String(50), nullable=False)
+    algorithm = Column(String(50), nullable=False, index=True)
     hyperparameters = Column(JSON)
     
     # Results
@@ -109,7 +118,7 @@ class Experiment(Base):
     artifacts = Column(JSON)
     
     # Status and timing
-    status = Column(String(20), default='running')  # running, completed, failed, cancelled
+    status = Column(String(20), default='running', index=True)  # running, completed, failed, cancelled
     start_time = Column(DateTime, default=datetime.utcnow)
     end_time = Column(DateTime)
     duration = Column(Float)  # in seconds
@@ -151,6 +160,62 @@ class Experiment(Base):
             'model_version_id': self.model_version_id
         }
 
+class ExperimentMetric(Base):
+    """Step-indexed metric values logged during an experiment run."""
+    
+    __tablename__ = 'experiment_metrics'
+    
+    # Narrow table clustered on (run_id, key, step) for range reads of a curve
+    run_id = Column(String(50), ForeignKey('experiments.run_id'), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    step = Column(Integer, primary_key=True)
+    value = Column(Float, nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ExperimentMetric(run_id='{self.run_id}', key='{self.key}', step={self.step})>"
+    
+    def to_dict(self):
+        """Convert metric point to dictionary for JSON serialization."""
+        return {
+            'run_id': self.run_id,
+            'key': self.key,
+            'step': self.step,
+            'value': self.value,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
+
+class ExperimentScalar(Base):
+    """Scalar metric and hyperparameter values extracted from Experiment JSON.
+    
+    Maintained at write time so leaderboard queries can filter and sort on
+    indexed columns instead of parsing ``metrics``/``hyperparameters``.
+    """
+    
+    __tablename__ = 'experiment_scalars'
+    __table_args__ = (
+        Index('ix_experiment_scalars_value', 'kind', 'key', 'value', 'experiment_id'),
+        Index('ix_experiment_scalars_text', 'kind', 'key', 'value_text', 'experiment_id'),
+    )
+    
+    experiment_id = Column(Integer, ForeignKey('experiments.id'), primary_key=True)
+    kind = Column(String(10), primary_key=True)  # metric, param
+    key = Column(String(100), primary_key=True)  # dotted path for nested values
+    value = Column(Float)  # numeric and boolean values
+    value_text = Column(String(255))  # categorical values
+    
+    def __repr__(self):
+        return f"<ExperimentScalar(experiment_id={self.experiment_id}, kind='{self.kind}', key='{self.key}')>"
+    
+    def to_dict(self):
+        """Convert scalar to dictionary for JSON serialization."""
+        return {
+            'experiment_id': self.experiment_id,
+            'kind': self.kind,
+            'key': self.key,
+            'value': self.value if self.value is not None else self.value_text
+        }
+
 class Deployment(Base):
     """Deployment tracking for model deployments."""
     
@@ -266,3 +331,80 @@ class DatasetVersion(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+class RegistryVersion(Base):
+    """Change counter bumped whenever cached registry state is written."""
+    
+    __tablename__ = 'registry_versions'
+    
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RegistryVersion(name='{self.name}', version={self.version})>"
+    
+    def to_dict(self):
+        """Convert counter to dictionary for JSON serialization."""
+        return {
+            'name': self.name,
+            'version': self.version
+        }
+
+class ModelStageLock(Base):
+    """Per-model-name lock row; promotions update it first to serialize on the name."""
+    
+    __tablename__ = 'model_stage_locks'
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ModelStageLock(name='{self.name}', version={self.version})>"
+    
+    def to_dict(self):
+        """Convert lock to dictionary for JSON serialization."""
+        return {
+            'name': self.name,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class PromotionEvent(Base):
+    """Append-only log of model stage changes."""
+    
+    __tablename__ = 'promotion_events'
+    __table_args__ = (
+        Index('ix_promotion_events_name_created', 'model_name', 'created_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    model_name = Column(String(100), nullable=False)
+    model_version_id = Column(Integer, ForeignKey('model_versions.id'), nullable=False)
+    version = Column(String(20))
+    from_stage = Column(String(20))
+    to_stage = Column(String(20), nullable=False)
+    archived_version_ids = Column(JSON)  # previous holders moved to 'archived'
+    idempotency_key = Column(String(100), unique=True)
+    requested_by = Column(String(100))
+    reason = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<PromotionEvent(model_name='{self.model_name}', version='{self.version}', to_stage='{self.to_stage}')>"
+    
+    def to_dict(self):
+        """Convert event to dictionary for JSON serialization."""
+        return {
+            'id': self.id,
+            'model_name': self.model_name,
+            'model_version_id': self.model_version_id,
+            'version': self.version,
+            'from_stage': self.from_stage,
+            'to_stage': self.to_stage,
+            'archived_version_ids': self.archived_version_ids or [],
+            'idempotency_key': self.idempotency_key,
+            'requested_by': self.requested_by,
+            'reason': self.reason,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
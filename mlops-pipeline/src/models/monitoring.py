@@ -18,7 +18,7 @@ class ModelMetrics(Base):
     deployment_id = Column(Integer, ForeignKey('deployments.id'))
     
     # Timestamp
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Performance metrics
     accuracy = Column(Float)
@@ -77,7 +77,7 @@ class DriftDetection(Base):
     model_version_id = Column(Integer, ForeignKey('model_versions.id'))
     
     # Timestamp
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Drift type
     drift_type = Column(String(20), nullable=False)  # data_drift, concept_drift, prediction_drift
@@ -165,6 +165,7 @@ class Alert(Base):
     
     # Notification
     notification_sent = Column(Boolean, default=False)
+    notification_claimed_at = Column(DateTime)  # set while a dispatcher holds the alert undelivered
     notification_channels = Column(JSON)  # email, slack, webhook, etc.
     
     # Metadata
@@ -191,6 +192,8 @@ class Alert(Base):
             'acknowledged_at': self.acknowledged_at.isoformat() if self.acknowledged_at else None,
             'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
             'notification_sent': self.notification_sent,
+            'notification_claimed_at': (self.notification_claimed_at.isoformat()
+                                        if self.notification_claimed_at else None),
             'notification_channels': self.notification_channels,
             'metadata': self.alert_metadata,
             'tags': self.tags
@@ -207,7 +210,7 @@ class PredictionLog(Base):
     
     # Request information
     request_id = Column(String(50), unique=True, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Input data (hashed or anonymized for privacy)
     input_hash = Column(String(64))  # SHA-256 hash of input
@@ -0,0 +1,762 @@
+from datetime import datetime
+import json
+import logging
+import queue
+import uuid
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import insert
+
+from src.db import get_db
+from src.inference import run_batch_inference, run_inference
+from src.middleware.response_cache import invalidates, shared_get
+from src.middleware.timing import phase
+from src.models.model_registry import ModelVersion, Experiment, Deployment
+from src.models.monitoring import ModelMetrics, DriftDetection, Alert, PredictionLog
+from src.services.artifact_store import get_store, parse_uri
+from src.services.feature_schema import FeatureValidationError, SchemaError, compile_schema, model_schema
+from src.services.preprocessing import PipelineError, fit_pipeline, load_pipeline, prepare_features, save_pipeline
+from src.services.promotions import PromotionConflict, promote, promotion_history
+from src.services.registry_cache import registry_cache
+from src.services.registry_events import registry_events
+
+api_bp = Blueprint('api', __name__)
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 10000
+
+def partition_store():
+    """Partitioned monitoring storage, or None when monitoring tables live in the main database."""
+    return current_app.extensions.get('partition_store')
+
+def serialize(rows):
+    """Convert ORM rows to dictionaries for JSON serialization."""
+    with phase('to_dict'):
+        return [row.to_dict() for row in rows]
+
+# API Routes
+
+@api_bp.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint."""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'MLOps Pipeline',
+        'version': '1.0.0',
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+# Model Registry API
+@api_bp.route('/models', methods=['GET'])
+@shared_get()
+def list_models():
+    """List all model versions."""
+    db = get_db()
+    try:
+        models = db.query(ModelVersion).all()
+        return jsonify(serialize(models))
+    finally:
+        db.close()
+
+@api_bp.route('/models', methods=['POST'])
+@invalidates('/api/models', '/api/dashboard')
+def register_model():
+    """Register a new model version."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        store = get_store()
+        for field in ('model_path', 'artifacts_path'):
+            sha256 = parse_uri(data.get(field))
+            if sha256 and not store.retain(sha256):
+                return jsonify({'error': f'{field} references an unknown artifact'}), 400
+        if data.get('feature_schema') is not None:
+            compile_schema(data['feature_schema'])
+        preprocessing_path = None
+        if data.get('preprocessing') is not None:
+            pipeline = fit_pipeline(db, data['preprocessing'], data.get('feature_schema'))
+            preprocessing_path = save_pipeline(pipeline)
+        model = ModelVersion(
+            name=data.get('name'),
+            version=data.get('version'),
+            algorithm=data.get('algorithm'),
+            framework=data.get('framework', 'scikit-learn'),
+            description=data.get('description'),
+            tags=data.get('tags', []),
+            accuracy=data.get('accuracy'),
+            precision=data.get('precision'),
+            recall=data.get('recall'),
+            f1_score=data.get('f1_score'),
+            auc_score=data.get('auc_score'),
+            training_dataset_size=data.get('training_dataset_size'),
+            training_duration=data.get('training_duration'),
+            hyperparameters=data.get('hyperparameters', {}),
+            feature_schema=data.get('feature_schema'),
+            model_path=data.get('model_path'),
+            artifacts_path=data.get('artifacts_path'),
+            preprocessing_path=preprocessing_path
+        )
+        db.add(model)
+        db.commit()
+        db.refresh(model)
+        return jsonify(model.to_dict()), 201
+    except SchemaError as e:
+        return jsonify({'error': f'Invalid feature_schema: {e}'}), 400
+    except PipelineError as e:
+        return jsonify({'error': f'Invalid preprocessing: {e}'}), 400
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@api_bp.route('/models/<int:model_id>', methods=['GET'])
+def get_model(model_id):
+    """Get model details."""
+    db = get_db()
+    try:
+        model = registry_cache.get(db, model_id)
+        if not model:
+            return jsonify({'error': 'Model not found'}), 404
+        return jsonify(model)
+    finally:
+        db.close()
+
+@api_bp.route('/models/<name>/versions/<version>', methods=['GET'])
+def get_model_by_version(name, version):
+    """Get model details by name and version."""
+    db = get_db()
+    try:
+        model = registry_cache.get_by_name_version(db, name, version)
+        if not model:
+            return jsonify({'error': 'Model not found'}), 404
+        return jsonify(model)
+    finally:
+        db.close()
+
+@api_bp.route('/models/production', methods=['GET'])
+@shared_get()
+def list_production_models():
+    """List models in the production stage, optionally filtered by name."""
+    db = get_db()
+    try:
+        return jsonify(list(registry_cache.production(db, request.args.get('name'))))
+    finally:
+        db.close()
+
+@api_bp.route('/models/<int:model_id>/promote', methods=['PUT'])
+@invalidates('/api/models', '/api/dashboard')
+def promote_model(model_id):
+    """Promote a model version, archiving the previous holder of an exclusive stage.
+
+    Send an ``Idempotency-Key`` header (or ``idempotency_key``) to make
+    retries safe: a repeated key returns the original promotion.
+    """
+    data = request.get_json(silent=True) or {}
+    db = get_db()
+    try:
+        result = promote(
+            db, model_id,
+            stage=data.get('stage', 'production'),
+            idempotency_key=request.headers.get('Idempotency-Key') or data.get('idempotency_key'),
+            requested_by=data.get('requested_by'),
+            reason=data.get('reason')
+        )
+        if result is None:
+            return jsonify({'error': 'Model not found'}), 404
+        model, event, replayed = result
+        return jsonify(dict(model, promotion=event, replayed=replayed))
+    except PromotionConflict as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@api_bp.route('/models/promotions', methods=['GET'])
+@shared_get()
+def list_promotions():
+    """Promotion event log, newest first, optionally filtered by ``name``."""
+    db = get_db()
+    try:
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        return jsonify(promotion_history(db, request.args.get('name'), limit))
+    finally:
+        db.close()
+
+@api_bp.route('/models/promotions/stream', methods=['GET'])
+def stream_promotions():
+    """Server-sent events for every promotion, for workers that keep their own caches."""
+    events = queue.Queue(maxsize=1000)
+
+    def enqueue(event):
+        try:
+            events.put_nowait(event)
+        except queue.Full:
+            pass
+
+    unsubscribe = registry_events.subscribe(enqueue)
+
+    def generate():
+        try:
+            yield ': connected\n\n'
+            while True:
+                try:
+                    event = events.get(timeout=15)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"id: {event['id']}\nevent: promotion\ndata: {json.dumps(event)}\n\n"
+        finally:
+            unsubscribe()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@api_bp.route('/models/<int:model_id>/schema', methods=['GET'])
+def get_feature_schema(model_id):
+    """Get a model version's feature schema and its compiled feature order."""
+    db = get_db()
+    try:
+        model = registry_cache.get(db, model_id)
+        if not model:
+            return jsonify({'error': 'Model not found'}), 404
+        if not model.get('feature_schema'):
+            return jsonify({'error': 'Model has no feature schema'}), 404
+        compiled = model_schema(model)
+        return jsonify(dict(compiled.describe(), schema=model['feature_schema']))
+    finally:
+        db.close()
+
+@api_bp.route('/models/<int:model_id>/schema', methods=['PUT'])
+@invalidates('/api/models')
+def set_feature_schema(model_id):
+    """Attach or replace a model version's feature schema."""
+    schema = request.get_json()
+    db = get_db()
+    try:
+        compile_schema(schema)
+        model = db.get(ModelVersion, model_id)
+        if not model:
+            return jsonify({'error': 'Model not found'}), 404
+        model.feature_schema = schema
+        db.commit()
+        return jsonify(model.to_dict())
+    except SchemaError as e:
+        return jsonify({'error': f'Invalid feature_schema: {e}'}), 400
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@api_bp.route('/models/<int:model_id>/validate', methods=['POST'])
+def validate_features(model_id):
+    """Validate ``{"features": {...}}`` or a ``{"records": [...]}`` batch against the schema."""
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be an object'}), 400
+    db = get_db()
+    try:
+        model = registry_cache.get(db, model_id)
+    finally:
+        db.close()
+    if not model:
+        return jsonify({'error': 'Model not found'}), 404
+    if not model.get('feature_schema'):
+        return jsonify({'error': 'Model has no feature schema'}), 404
+    compiled = model_schema(model)
+    try:
+        if 'records' in data:
+            array = compiled.to_matrix(data['records'])
+        else:
+            array = compiled.to_array(data.get('features'))
+    except FeatureValidationError as e:
+        return jsonify({'valid': False, 'errors': e.errors}), 422
+    return jsonify({'valid': True, 'features': compiled.names, 'shape': list(array.shape)})
+
+# Experiment Tracking API
+@api_bp.route('/experiments', methods=['GET'])
+@shared_get()
+def list_experiments():
+    """List all experiments."""
+    db = get_db()
+    try:
+        experiments = db.query(Experiment).all()
+        return jsonify(serialize(experiments))
+    finally:
+        db.close()
+
+@api_bp.route('/experiments', methods=['POST'])
+@invalidates('/api/experiments', '/api/dashboard')
+def create_experiment():
+    """Create a new experiment."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        experiment = Experiment(
+            name=data.get('name'),
+            run_id=data.get('run_id', str(uuid.uuid4())),
+            description=data.get('description'),
+            tags=data.get('tags', []),
+            dataset_name=data.get('dataset_name'),
+            dataset_version=data.get('dataset_version'),
+            feature_set=data.get('feature_set', []),
+            algorithm=data.get('algorithm'),
+            hyperparameters=data.get('hyperparameters', {}),
+            status='running'
+        )
+        db.add(experiment)
+        db.commit()
+        db.refresh(experiment)
+        return jsonify(experiment.to_dict()), 201
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+# Deployment API
+@api_bp.route('/deployments', methods=['GET'])
+@shared_get()
+def list_deployments():
+    """List all deployments."""
+    db = get_db()
+    try:
+        deployments = db.query(Deployment).all()
+        return jsonify(serialize(deployments))
+    finally:
+        db.close()
+
+@api_bp.route('/deployments', methods=['POST'])
+@invalidates('/api/deployments', '/api/dashboard')
+def create_deployment():
+    """Create a new deployment."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        deployment = Deployment(
+            deployment_id=data.get('deployment_id', str(uuid.uuid4())),
+            name=data.get('name'),
+            description=data.get('description'),
+            environment=data.get('environment', 'production'),
+            deployment_type=data.get('deployment_type', 'blue_green'),
+            traffic_percentage=data.get('traffic_percentage', 100.0),
+            endpoint_url=data.get('endpoint_url'),
+            instance_type=data.get('instance_type'),
+            instance_count=data.get('instance_count', 1),
+            model_version_id=data.get('model_version_id'),
+            status='deploying'
+        )
+        db.add(deployment)
+        db.commit()
+        db.refresh(deployment)
+        return jsonify(deployment.to_dict()), 201
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+# Monitoring API
+@api_bp.route('/monitoring/metrics', methods=['GET'])
+@shared_get()
+def get_metrics():
+    """Get model performance metrics."""
+    store = partition_store()
+    if store is not None:
+        return jsonify(store.latest(ModelMetrics, limit=100))
+    db = get_db()
+    try:
+        metrics = db.query(ModelMetrics).order_by(ModelMetrics.timestamp.desc()).limit(100).all()
+        return jsonify(serialize(metrics))
+    finally:
+        db.close()
+
+@api_bp.route('/monitoring/metrics', methods=['POST'])
+def log_metrics():
+    """Log model performance metrics."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        metrics = ModelMetrics(
+            model_version_id=data.get('model_version_id'),
+            deployment_id=data.get('deployment_id'),
+            accuracy=data.get('accuracy'),
+            precision=data.get('precision'),
+            recall=data.get('recall'),
+            f1_score=data.get('f1_score'),
+            auc_score=data.get('auc_score'),
+            prediction_count=data.get('prediction_count', 0),
+            error_count=data.get('error_count', 0),
+            avg_latency=data.get('avg_latency'),
+            p95_latency=data.get('p95_latency'),
+            p99_latency=data.get('p99_latency'),
+            cpu_usage=data.get('cpu_usage'),
+            memory_usage=data.get('memory_usage'),
+            gpu_usage=data.get('gpu_usage'),
+            custom_metrics=data.get('custom_metrics', {})
+        )
+        store = partition_store()
+        if store is not None:
+            store.add(metrics)
+        else:
+            db.add(metrics)
+            db.commit()
+            db.refresh(metrics)
+        return jsonify(metrics.to_dict()), 201
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@api_bp.route('/monitoring/drift', methods=['GET'])
+@shared_get()
+def get_drift_detection():
+    """Get drift detection results."""
+    db = get_db()
+    try:
+        drift_results = db.query(DriftDetection).order_by(DriftDetection.timestamp.desc()).limit(50).all()
+        return jsonify(serialize(drift_results))
+    finally:
+        db.close()
+
+@api_bp.route('/monitoring/alerts', methods=['GET'])
+@shared_get()
+def get_alerts():
+    """Get active alerts."""
+    db = get_db()
+    try:
+        alerts = db.query(Alert).filter(Alert.status == 'active').order_by(Alert.triggered_at.desc()).all()
+        return jsonify(serialize(alerts))
+    finally:
+        db.close()
+
+@api_bp.route('/monitoring/alerts', methods=['POST'])
+@invalidates('/api/monitoring/alerts', '/api/dashboard')
+def create_alert():
+    """Raise an alert; notifications are sent by the dispatcher, coalesced with similar alerts."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        alert = Alert(
+            alert_id=data.get('alert_id') or str(uuid.uuid4()),
+            alert_type=data.get('alert_type'),
+            severity=data.get('severity', 'medium'),
+            title=data.get('title'),
+            message=data.get('message'),
+            model_version_id=data.get('model_version_id'),
+            deployment_id=data.get('deployment_id'),
+            source_component=data.get('source_component'),
+            notification_channels=data.get('notification_channels'),
+            alert_metadata=data.get('metadata'),
+            tags=data.get('tags', [])
+        )
+        db.add(alert)
+        db.commit()
+        db.refresh(alert)
+        dispatcher = current_app.extensions.get('notification_dispatcher')
+        if dispatcher is not None:
+            dispatcher.wake()
+        return jsonify(alert.to_dict()), 201
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@api_bp.route('/monitoring/notifications', methods=['GET'])
+def get_notification_stats():
+    """Notification dispatcher counters, pending digests and per-channel queues."""
+    dispatcher = current_app.extensions.get('notification_dispatcher')
+    if dispatcher is None:
+        return jsonify({'error': 'Notifications are disabled'}), 503
+    return jsonify(dispatcher.snapshot())
+
+@api_bp.route('/monitoring/health', methods=['GET'])
+def get_model_health():
+    """Get the latest computed model health (served from memory)."""
+    health_monitor = current_app.extensions.get('health_monitor')
+    if health_monitor is None:
+        return jsonify({'error': 'Health monitor is disabled'}), 503
+    state = health_monitor.latest()
+    models = state['models']
+    model_version_id = request.args.get('model_version_id', type=int)
+    deployment_id = request.args.get('deployment_id', type=int)
+    if model_version_id is not None:
+        models = [m for m in models if m['model_version_id'] == model_version_id]
+    if deployment_id is not None:
+        models = [m for m in models if m['deployment_id'] == deployment_id]
+    return jsonify(dict(state, models=models))
+
+# Prediction API
+def resolve_scoring_model(data):
+    """Model dict, id and version a scoring request targets.
+
+    A ``model_name`` without ``model_version_id`` resolves to the current
+    production version; returns None for the model if none exists.
+    """
+    model_version_id = data.get('model_version_id', 1)
+    db = get_db()
+    try:
+        if data.get('model_name') and 'model_version_id' not in data:
+            production = registry_cache.production(db, data['model_name'])
+            if not production:
+                return None, None, None
+            model = production[-1]
+            return model, model['id'], model['version']
+        model = registry_cache.get(db, model_version_id)
+        return model, model_version_id, '1.0.0'
+    finally:
+        db.close()
+
+@api_bp.route('/predict', methods=['POST'])
+def predict():
+    """Make a prediction (mock implementation)."""
+    data = request.get_json()
+    features = data.get('features', {})
+    if not isinstance(features, dict):
+        return jsonify({'error': 'features must be an object'}), 400
+    model, model_version_id, model_version = resolve_scoring_model(data)
+    if model_version_id is None:
+        return jsonify({'error': 'No production model found'}), 404
+    
+    # Schema validation and preprocessing, shared with /predict/batch
+    if model:
+        try:
+            with phase('features'):
+                matrix = prepare_features(model, [features])
+        except FeatureValidationError as e:
+            return jsonify({'error': 'Invalid features', 'errors': e.errors}), 422
+        if matrix is not None:
+            features = matrix[0]
+    
+    result = run_inference(features)
+    prediction = result['prediction']
+    probability = result['probability']
+    confidence = result['confidence']
+    
+    # Log prediction
+    store = partition_store()
+    db = get_db()
+    try:
+        log_entry = PredictionLog(
+            request_id=str(uuid.uuid4()),
+            model_version_id=model_version_id,
+            deployment_id=data.get('deployment_id', 1),
+            input_hash='mock_hash',
+            input_features=list(data.get('features', {}).keys()),
+            prediction={'class': prediction},
+            prediction_probability={'class_0': 1-probability, 'class_1': probability},
+            confidence_score=confidence,
+            latency=result['latency'],
+            user_id=data.get('user_id'),
+            session_id=data.get('session_id')
+        )
+        if store is not None:
+            store.add(log_entry)
+        else:
+            db.add(log_entry)
+            db.commit()
+    except Exception:
+        logger.exception("Error logging prediction")
+    finally:
+        db.close()
+    
+    return jsonify({
+        'prediction': prediction,
+        'probability': probability,
+        'confidence': confidence,
+        'model_version': model_version,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@api_bp.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Score ``{"records": [...]}`` in one vectorized pass (mock implementation)."""
+    data = request.get_json()
+    records = data.get('records')
+    if not isinstance(records, list) or not records:
+        return jsonify({'error': 'records must be a non-empty list'}), 400
+    if not all(isinstance(record, dict) for record in records):
+        return jsonify({'error': 'each record must be an object'}), 400
+    if len(records) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} records per batch'}), 400
+    model, model_version_id, model_version = resolve_scoring_model(data)
+    if model_version_id is None:
+        return jsonify({'error': 'No production model found'}), 404
+    
+    matrix = None
+    if model:
+        try:
+            with phase('features'):
+                matrix = prepare_features(model, records)
+        except FeatureValidationError as e:
+            return jsonify({'error': 'Invalid features', 'errors': e.errors}), 422
+    
+    result = run_batch_inference(matrix, len(records))
+    now = datetime.utcnow()
+    rows = [{
+        'request_id': str(uuid.uuid4()),
+        'model_version_id': model_version_id,
+        'deployment_id': data.get('deployment_id', 1),
+        'input_hash': 'mock_hash',
+        'input_features': list(record.keys()),
+        'prediction': {'class': prediction},
+        'prediction_probability': {'class_0': 1-probability, 'class_1': probability},
+        'confidence_score': confidence,
+        'latency': result['latency'],
+        'user_id': data.get('user_id'),
+        'session_id': data.get('session_id'),
+        'timestamp': now
+    } for record, prediction, probability, confidence in zip(
+        records, result['prediction'], result['probability'], result['confidence'])]
+    
+    # Log predictions with one bulk insert
+    store = partition_store()
+    db = get_db()
+    try:
+        if store is not None:
+            store.insert(PredictionLog.__tablename__, rows)
+        else:
+            db.execute(insert(PredictionLog), rows)
+            db.commit()
+    except Exception:
+        logger.exception("Error logging predictions")
+    finally:
+        db.close()
+    
+    return jsonify({
+        'predictions': result['prediction'],
+        'probabilities': result['probability'],
+        'confidences': result['confidence'],
+        'model_version': model_version,
+        'count': len(records),
+        'timestamp': now.isoformat()
+    })
+
+@api_bp.route('/models/<int:model_id>/preprocessing', methods=['GET'])
+def get_preprocessing(model_id):
+    """Get a model version's fitted preprocessing pipeline."""
+    db = get_db()
+    try:
+        model = registry_cache.get(db, model_id)
+    finally:
+        db.close()
+    if not model:
+        return jsonify({'error': 'Model not found'}), 404
+    if not model.get('preprocessing_path'):
+        return jsonify({'error': 'Model has no preprocessing pipeline'}), 404
+    return jsonify(dict(load_pipeline(model['preprocessing_path']).to_dict(),
+                        uri=model['preprocessing_path']))
+
+# Dashboard API
+@api_bp.route('/dashboard/overview', methods=['GET'])
+@shared_get()
+def dashboard_overview():
+    """Get dashboard overview data."""
+    db = get_db()
+    try:
+        # Get counts
+        model_count = db.query(ModelVersion).count()
+        experiment_count = db.query(Experiment).count()
+        deployment_count = db.query(Deployment).count()
+        active_alerts = db.query(Alert).filter(Alert.status == 'active').count()
+        
+        # Get recent metrics
+        store = partition_store()
+        if store is not None:
+            recent_metrics = next(iter(store.latest(ModelMetrics, limit=1)), None)
+        else:
+            recent_metrics = db.query(ModelMetrics).order_by(ModelMetrics.timestamp.desc()).first()
+            recent_metrics = recent_metrics.to_dict() if recent_metrics else None
+        
+        return jsonify({
+            'model_count': model_count,
+            'experiment_count': experiment_count,
+            'deployment_count': deployment_count,
+            'active_alerts': active_alerts,
+            'recent_metrics': recent_metrics,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    finally:
+        db.close()
+
+# Initialize sample data
+@api_bp.route('/init-sample-data', methods=['POST'])
+@invalidates('/api')
+def init_sample_data():
+    """Initialize sample data for demonstration."""
+    db = get_db()
+    try:
+        # Create sample model
+        model = ModelVersion(
+            name='fraud_detection_model',
+            version='1.0.0',
+            algorithm='random_forest',
+            framework='scikit-learn',
+            description='Fraud detection model for credit card transactions',
+            tags=['fraud', 'classification', 'production'],
+            accuracy=0.95,
+            precision=0.92,
+            recall=0.88,
+            f1_score=0.90,
+            auc_score=0.96,
+            training_dataset_size=10000,
+            training_duration=120.5,
+            hyperparameters={'n_estimators': 100, 'max_depth': 10},
+            status='deployed',
+            stage='production'
+        )
+        db.add(model)
+        db.commit()
+        db.refresh(model)
+        
+        # Create sample deployment
+        deployment = Deployment(
+            deployment_id='fraud-model-prod-001',
+            name='Fraud Detection Production',
+            description='Production deployment of fraud detection model',
+            environment='production',
+            deployment_type='blue_green',
+            traffic_percentage=100.0,
+            endpoint_url='https://api.company.com/fraud/predict',
+            instance_type='t3.medium',
+            instance_count=3,
+            model_version_id=model.id,
+            status='active'
+        )
+        db.add(deployment)
+        db.commit()
+        
+        # Create sample metrics
+        import random
+        for i in range(10):
+            metrics = ModelMetrics(
+                model_version_id=model.id,
+                deployment_id=deployment.id,
+                accuracy=random.uniform(0.90, 0.96),
+                precision=random.uniform(0.88, 0.94),
+                recall=random.uniform(0.85, 0.92),
+                f1_score=random.uniform(0.87, 0.93),
+                prediction_count=random.randint(100, 1000),
+                error_count=random.randint(0, 10),
+                avg_latency=random.uniform(50, 150),
+                cpu_usage=random.uniform(20, 80),
+                memory_usage=random.uniform(30, 70)
+            )
+            if partition_store() is not None:
+                partition_store().add(metrics)
+            else:
+                db.add(metrics)
+        
+        db.commit()
+        return jsonify({'message': 'Sample data initialized successfully'})
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
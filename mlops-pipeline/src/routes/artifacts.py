@@ -0,0 +1,149 @@
+import os
+
+from flask import Blueprint, jsonify, request, send_file
+
+from src.db import get_db
+from src.services.artifact_store import (
+    ArtifactStoreError, UploadOffsetMismatch, artifact_uri, get_store, referenced_hashes
+)
+
+artifact_bp = Blueprint('artifacts', __name__)
+
+@artifact_bp.route('/artifacts/uploads', methods=['POST'])
+def create_upload():
+    """Start a resumable upload.
+
+    If ``sha256`` is given and the blob is already stored, no upload is
+    created and the existing blob is returned instead.
+    """
+    data = request.get_json(silent=True) or {}
+    store = get_store()
+    try:
+        upload = store.create_upload(size=data.get('size'), sha256=data.get('sha256'))
+    except ArtifactStoreError as e:
+        return jsonify({'error': str(e)}), 400
+    if upload is None:
+        sha256 = data['sha256']
+        return jsonify({'sha256': sha256, 'size': store.size(sha256),
+                        'uri': artifact_uri(sha256), 'deduplicated': True}), 200
+    return jsonify(upload), 201
+
+@artifact_bp.route('/artifacts/uploads/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """Upload state; ``offset`` is where the client should resume."""
+    try:
+        return jsonify(get_store().upload_state(upload_id))
+    except (KeyError, ArtifactStoreError):
+        return jsonify({'error': 'Upload not found'}), 404
+
+@artifact_bp.route('/artifacts/uploads/<upload_id>', methods=['PATCH'])
+def append_upload(upload_id):
+    """Append the raw request body at the ``Upload-Offset`` header position."""
+    offset = request.headers.get('Upload-Offset', type=int)
+    if offset is None:
+        return jsonify({'error': 'Upload-Offset header is required'}), 400
+    try:
+        new_offset = get_store().append(upload_id, offset, request.stream)
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except UploadOffsetMismatch as e:
+        response = jsonify({'error': str(e), 'offset': e.expected})
+        response.headers['Upload-Offset'] = str(e.expected)
+        return response, 409
+    except ArtifactStoreError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify({'upload_id': upload_id, 'offset': new_offset})
+    response.headers['Upload-Offset'] = str(new_offset)
+    return response
+
+@artifact_bp.route('/artifacts/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Verify the checksum and commit the upload as a blob."""
+    data = request.get_json(silent=True) or {}
+    try:
+        return jsonify(get_store().complete_upload(upload_id, sha256=data.get('sha256'))), 201
+    except KeyError:
+        return jsonify({'error': 'Upload not found'}), 404
+    except ArtifactStoreError as e:
+        return jsonify({'error': str(e)}), 400
+
+@artifact_bp.route('/artifacts/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    try:
+        get_store().abort_upload(upload_id)
+    except ArtifactStoreError as e:
+        return jsonify({'error': str(e)}), 400
+    return '', 204
+
+@artifact_bp.route('/artifacts/blobs/<sha256>', methods=['GET', 'HEAD'])
+def download_blob(sha256):
+    """Download a blob.
+
+    Served through ``wsgi.file_wrapper``, so servers that implement it with
+    ``sendfile`` (gunicorn, uWSGI) copy the file to the socket in the kernel.
+    Range requests resume interrupted downloads; the hash doubles as ETag.
+    """
+    store = get_store()
+    if not store.exists(sha256):
+        return jsonify({'error': 'Artifact not found'}), 404
+    response = send_file(
+        store.blob_path(sha256),
+        mimetype='application/octet-stream',
+        as_attachment=True,
+        download_name=sha256,
+        etag=sha256,
+        conditional=True,
+        max_age=31536000
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+def import_path(path):
+    """Resolve ``path`` inside ARTIFACT_IMPORT_ROOT, or None when it falls outside.
+
+    Imports are disabled (always None) unless ARTIFACT_IMPORT_ROOT is set.
+    """
+    root = os.environ.get('ARTIFACT_IMPORT_ROOT')
+    if not root:
+        return None
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        return None
+    return resolved
+
+@artifact_bp.route('/artifacts/import', methods=['POST'])
+def import_artifact():
+    """Copy a file under ARTIFACT_IMPORT_ROOT on the server into the store.
+
+    ``path`` is taken relative to the import root; symlinks are resolved
+    before the containment check.
+    """
+    data = request.get_json(silent=True) or {}
+    if not data.get('path'):
+        return jsonify({'error': 'path is required'}), 400
+    if not os.environ.get('ARTIFACT_IMPORT_ROOT'):
+        return jsonify({'error': 'Server-side imports are disabled (set ARTIFACT_IMPORT_ROOT)'}), 403
+    source_path = import_path(data['path'])
+    if source_path is None:
+        return jsonify({'error': 'path must be inside the import root'}), 403
+    try:
+        return jsonify(get_store().import_file(source_path)), 201
+    except ArtifactStoreError as e:
+        return jsonify({'error': str(e)}), 400
+
+@artifact_bp.route('/artifacts/gc', methods=['POST'])
+def collect_garbage():
+    """Delete blobs no model or dataset version references."""
+    data = request.get_json(silent=True) or {}
+    db = get_db()
+    try:
+        referenced = referenced_hashes(db)
+    finally:
+        db.close()
+    result = get_store().collect_garbage(
+        referenced,
+        grace_seconds=float(data.get('grace_seconds', 86400)),
+        dry_run=bool(data.get('dry_run', False))
+    )
+    return jsonify(result)
@@ -0,0 +1,65 @@
+import os
+
+from flask import Blueprint, jsonify, request
+
+from src.db import get_db
+from src.middleware.response_cache import invalidates, shared_get
+from src.models.model_registry import DatasetVersion
+from src.services.dataset_profiler import register_dataset
+
+dataset_bp = Blueprint('datasets', __name__)
+
+@dataset_bp.route('/datasets', methods=['GET'])
+@shared_get()
+def list_datasets():
+    """List all dataset versions."""
+    db = get_db()
+    try:
+        datasets = db.query(DatasetVersion).order_by(DatasetVersion.created_at.desc()).all()
+        return jsonify([dataset.to_dict() for dataset in datasets])
+    finally:
+        db.close()
+
+@dataset_bp.route('/datasets', methods=['POST'])
+@invalidates('/api/datasets')
+def create_dataset():
+    """Register a dataset version by profiling a file on local disk."""
+    data = request.get_json()
+    db = get_db()
+    try:
+        if not data.get('name') or not data.get('version') or not data.get('file_path'):
+            return jsonify({'error': 'name, version and file_path are required'}), 400
+        workers = data.get('workers')
+        if workers is not None:
+            if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+                return jsonify({'error': 'workers must be a positive integer'}), 400
+            # One profiling process per core at most
+            workers = min(workers, os.cpu_count() or 1)
+        dataset = register_dataset(
+            db,
+            name=data['name'],
+            version=data['version'],
+            file_path=data['file_path'],
+            description=data.get('description'),
+            source=data.get('source'),
+            format=data.get('format'),
+            workers=workers
+        )
+        return jsonify(dataset.to_dict()), 201
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@dataset_bp.route('/datasets/<int:dataset_id>', methods=['GET'])
+def get_dataset(dataset_id):
+    """Get dataset version details."""
+    db = get_db()
+    try:
+        dataset = db.query(DatasetVersion).filter(DatasetVersion.id == dataset_id).first()
+        if not dataset:
+            return jsonify({'error': 'Dataset not found'}), 404
+        return jsonify(dataset.to_dict())
+    finally:
+        db.close()
@@ -0,0 +1,149 @@
+from flask import Blueprint, jsonify, request
+
+from src.db import get_db
+from src.middleware.response_cache import invalidates, shared_get
+from src.services.experiment_tracking import complete_run, get_experiment, log_metrics, read_metrics
+from src.services.leaderboard import backfill_scalars, compare, leaderboard, parse_range
+
+experiment_runs_bp = Blueprint('experiment_runs', __name__)
+
+@experiment_runs_bp.route('/experiments/<run_id>/metrics', methods=['POST'])
+@invalidates('/api/experiments')
+def log_run_metrics(run_id):
+    """Log metric values for one or more steps of a run.
+
+    Accepts ``{"step": 3, "metrics": {...}}`` or a batch as
+    ``{"entries": [{"step": 3, "metrics": {...}, "timestamp": ...}, ...]}``.
+    """
+    data = request.get_json()
+    db = get_db()
+    try:
+        experiment = get_experiment(db, run_id)
+        if not experiment:
+            return jsonify({'error': 'Experiment not found'}), 404
+        entries = data.get('entries') if 'entries' in data else [data]
+        count = log_metrics(db, run_id, entries)
+        return jsonify({'run_id': run_id, 'points': count}), 201
+    except (KeyError, TypeError, ValueError) as e:
+        db.rollback()
+        return jsonify({'error': f"Invalid metric entry: {e}"}), 400
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+@experiment_runs_bp.route('/experiments/<run_id>/metrics', methods=['GET'])
+@shared_get()
+def get_run_metrics(run_id):
+    """Get metric series for a run, optionally downsampled with max_points."""
+    keys = request.args.get('keys')
+    db = get_db()
+    try:
+        if not get_experiment(db, run_id):
+            return jsonify({'error': 'Experiment not found'}), 404
+        series = read_metrics(
+            db, run_id,
+            keys=keys.split(',') if keys else None,
+            max_points=request.args.get('max_points', type=int),
+            start_step=request.args.get('start_step', type=int),
+            end_step=request.args.get('end_step', type=int)
+        )
+        return jsonify({'run_id': run_id, 'metrics': series})
+    finally:
+        db.close()
+
+@experiment_runs_bp.route('/experiments/<run_id>/complete', methods=['PUT'])
+@invalidates('/api/experiments')
+def complete_experiment(run_id):
+    """Mark a run finished and fill end_time, duration and summary metrics."""
+    data = request.get_json(silent=True) or {}
+    db = get_db()
+    try:
+        experiment = get_experiment(db, run_id)
+        if not experiment:
+            return jsonify({'error': 'Experiment not found'}), 404
+        status = data.get('status', 'completed')
+        if status not in ('completed', 'failed', 'cancelled'):
+            return jsonify({'error': f"Invalid status: {status}"}), 400
+        experiment = complete_run(db, experiment, status=status, metrics=data.get('metrics'))
+        return jsonify(experiment.to_dict())
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
+
+def _prefixed_filters(prefix):
+    """Collect ``prefix.<key>=<min>:<max>`` query arguments into ranges."""
+    return {
+        name[len(prefix):]: parse_range(value)
+        for name, value in request.args.items()
+        if name.startswith(prefix)
+    }
+
+@experiment_runs_bp.route('/experiments/leaderboard', methods=['GET'])
+@shared_get()
+def get_leaderboard():
+    """Top-k experiments by a metric.
+
+    Filters: ``algorithm``, ``dataset_version``, ``status``, hyperparameter
+    ranges as ``param.<key>=<min>:<max>`` (or an exact value) and metric
+    ranges as ``metric.<key>=<min>:<max>``.
+    """
+    metric = request.args.get('metric')
+    if not metric:
+        return jsonify({'error': 'metric is required'}), 400
+    order = request.args.get('order', 'desc')
+    if order not in ('asc', 'desc'):
+        return jsonify({'error': f"Invalid order: {order}"}), 400
+    db = get_db()
+    try:
+        results = leaderboard(
+            db, metric,
+            k=min(request.args.get('k', 10, type=int), 1000),
+            order=order,
+            algorithm=request.args.get('algorithm'),
+            dataset_version=request.args.get('dataset_version'),
+            status=request.args.get('status'),
+            param_filters=_prefixed_filters('param.'),
+            metric_filters=_prefixed_filters('metric.')
+        )
+        return jsonify({'metric': metric, 'order': order, 'results': results})
+    except ValueError as e:
+        return jsonify({'error': f"Invalid filter: {e}"}), 400
+    finally:
+        db.close()
+
+@experiment_runs_bp.route('/experiments/compare', methods=['GET'])
+@shared_get()
+def compare_experiments():
+    """Compare metrics and hyperparameters of runs given as ``run_ids=a,b,c``."""
+    run_ids = request.args.get('run_ids')
+    if not run_ids:
+        return jsonify({'error': 'run_ids is required'}), 400
+    metrics = request.args.get('metrics')
+    params = request.args.get('params')
+    db = get_db()
+    try:
+        return jsonify(compare(
+            db, run_ids.split(','),
+            metrics=metrics.split(',') if metrics is not None else None,
+            params=params.split(',') if params is not None else None
+        ))
+    finally:
+        db.close()
+
+@experiment_runs_bp.route('/experiments/leaderboard/rebuild', methods=['POST'])
+@invalidates('/api/experiments')
+def rebuild_leaderboard():
+    """Rebuild the extracted scalar index, e.g. after bulk imports."""
+    db = get_db()
+    try:
+        count = backfill_scalars(db)
+        return jsonify({'experiments': count})
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 400
+    finally:
+        db.close()
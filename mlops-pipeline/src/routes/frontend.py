@@ -0,0 +1,40 @@
+import os
+
+from flask import Blueprint, current_app, jsonify, send_from_directory
+
+frontend_bp = Blueprint('frontend', __name__)
+
+# Static file serving
+@frontend_bp.route('/', defaults={'path': ''})
+@frontend_bp.route('/<path:path>')
+def serve(path):
+    static_folder_path = current_app.static_folder
+    if static_folder_path is None:
+        return "Static folder not configured", 404
+
+    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+        return send_from_directory(static_folder_path, path)
+    else:
+        index_path = os.path.join(static_folder_path, 'index.html')
+        if os.path.exists(index_path):
+            return send_from_directory(static_folder_path, 'index.html')
+        else:
+            return jsonify({
+                'message': 'MLOps Pipeline API',
+                'version': '1.0.0',
+                'endpoints': [
+                    '/api/health',
+                    '/api/models',
+                    '/api/datasets',
+                    '/api/artifacts/blobs/<sha256>',
+                    '/api/experiments',
+                    '/api/deployments',
+                    '/api/monitoring/metrics',
+                    '/api/monitoring/drift',
+                    '/api/monitoring/alerts',
+                    '/api/monitoring/health',
+                    '/api/predict',
+                    '/api/dashboard/overview',
+                    '/metrics'
+                ]
+            })
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func, select
+
+from src.db import get_db
+from src.middleware.response_cache import invalidates, shared_get
+from src.models.monitoring import PredictionLog
+from src.services.partitions import PARTITIONED_MODELS
+
+partition_bp = Blueprint('partitions', __name__)
+
+def _store():
+    return current_app.extensions.get('partition_store')
+
+def _parse_day(value):
+    return datetime.strptime(value, '%Y%m%d') if value else None
+
+@partition_bp.route('/monitoring/partitions', methods=['GET'])
+@shared_get()
+def list_partitions():
+    """List partition files; ``?counts=1`` adds row counts (one parallel scan)."""
+    store = _store()
+    if store is None:
+        return jsonify({'error': 'Monitoring partitions are disabled'}), 404
+    partitions = []
+    for table in PARTITIONED_MODELS:
+        entries = store.stats(table)
+        if request.args.get('counts') == '1':
+            counts = dict(store.fan_out(
+                table, lambda db, key: db.execute(select(func.count()).select_from(
+                    PARTITIONED_MODELS[table].__table__)).scalar()
+            ))
+            for entry in entries:
+                entry['row_count'] = counts.get(entry['key'])
+        partitions.extend(entries)
+    return jsonify({'scheme': store.scheme, 'partitions': partitions})
+
+@partition_bp.route('/monitoring/partitions/<table>/<key>', methods=['DELETE'])
+@invalidates('/api/monitoring', '/api/dashboard')
+def drop_partition(table, key):
+    """Drop one partition by deleting its file."""
+    store = _store()
+    if store is None:
+        return jsonify({'error': 'Monitoring partitions are disabled'}), 404
+    try:
+        if not store.drop(table, key):
+            return jsonify({'error': 'Partition not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'dropped': [key]})
+
+@partition_bp.route('/monitoring/partitions/<table>', methods=['DELETE'])
+@invalidates('/api/monitoring', '/api/dashboard')
+def drop_partitions_before(table):
+    """Drop every day partition older than ``?before=YYYYMMDD``."""
+    store = _store()
+    if store is None:
+        return jsonify({'error': 'Monitoring partitions are disabled'}), 404
+    try:
+        before = _parse_day(request.args.get('before'))
+        if before is None:
+            return jsonify({'error': 'before is required'}), 400
+        if table not in PARTITIONED_MODELS:
+            return jsonify({'error': f'Table is not partitioned: {table}'}), 400
+        return jsonify({'dropped': store.drop_before(table, before)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@partition_bp.route('/monitoring/predictions', methods=['GET'])
+@shared_get()
+def list_predictions():
+    """Recent prediction logs, optionally filtered by model, deployment and day range.
+
+    ``start``/``end`` are ``YYYYMMDD`` days; with day partitions, files
+    outside the range are not opened.
+    """
+    try:
+        start = _parse_day(request.args.get('start'))
+        end = _parse_day(request.args.get('end'))
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYYMMDD'}), 400
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    filters = []
+    for name in ('model_version_id', 'deployment_id'):
+        value = request.args.get(name, type=int)
+        if value is not None:
+            filters.append(getattr(PredictionLog, name) == value)
+    if start is not None:
+        filters.append(PredictionLog.timestamp >= start)
+    if end is not None:
+        filters.append(PredictionLog.timestamp <= end.replace(hour=23, minute=59, second=59, microsecond=999999))
+
+    store = _store()
+    if store is not None:
+        return jsonify(store.latest(PredictionLog, limit=limit, start=start, end=end, filters=filters))
+    db = get_db()
+    try:
+        logs = db.scalars(
+            select(PredictionLog).where(*filters).order_by(PredictionLog.timestamp.desc()).limit(limit)
+        )
+        return jsonify([log.to_dict() for log in logs])
+    finally:
+        db.close()
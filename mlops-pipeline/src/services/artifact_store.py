@@ -0,0 +1,273 @@
+"""
+Filesystem-backed, content-addressed artifact store.
+
+Blobs live under ``<root>/blobs/<aa>/<bb>/<sha256>`` and are referenced from
+``ModelVersion.model_path``/``artifacts_path``/``preprocessing_path`` and
+``DatasetVersion.file_path`` as ``cas://<sha256>``. Identical content is stored once. Uploads are
+appended to a staging file under ``<root>/uploads`` at an explicit offset,
+so an interrupted upload resumes from the last byte received; completing
+it hashes the staging file in fixed-size blocks and renames it into place
+(or discards it when the blob already exists). Appending to and completing
+an upload hold an exclusive ``flock`` on its staging file, so concurrent
+requests for one upload, from any worker, are applied one at a time.
+
+Garbage collection spares unreferenced blobs younger than a grace period,
+so every path that hands out an existing blob (a deduplicated upload, a
+registration naming it) refreshes its mtime through ``retain``.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+
+CAS_PREFIX = 'cas://'
+HASH_BLOCK_SIZE = 8 * 1024 * 1024
+COPY_BLOCK_SIZE = 1024 * 1024
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+class ArtifactStoreError(Exception):
+    """Invalid request against the artifact store."""
+
+class UploadOffsetMismatch(ArtifactStoreError):
+    """Chunk offset does not match the bytes already received."""
+
+    def __init__(self, expected):
+        super().__init__(f"Upload offset mismatch, expected {expected}")
+        self.expected = expected
+
+def is_sha256(value):
+    return bool(value) and bool(_SHA256_RE.match(value))
+
+def artifact_uri(sha256):
+    return f"{CAS_PREFIX}{sha256}"
+
+def parse_uri(uri):
+    """Return the blob hash referenced by a ``cas://`` URI, else None."""
+    if uri and uri.startswith(CAS_PREFIX) and is_sha256(uri[len(CAS_PREFIX):]):
+        return uri[len(CAS_PREFIX):]
+    return None
+
+class ArtifactStore:
+    """Content-addressed blob storage rooted at a local directory."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.blob_root = os.path.join(self.root, 'blobs')
+        self.upload_root = os.path.join(self.root, 'uploads')
+        os.makedirs(self.blob_root, exist_ok=True)
+        os.makedirs(self.upload_root, exist_ok=True)
+
+    # Blobs
+
+    def blob_path(self, sha256):
+        if not is_sha256(sha256):
+            raise ArtifactStoreError(f"Invalid sha256: {sha256}")
+        return os.path.join(self.blob_root, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256):
+        return is_sha256(sha256) and os.path.exists(self.blob_path(sha256))
+
+    def size(self, sha256):
+        return os.path.getsize(self.blob_path(sha256))
+
+    def retain(self, sha256):
+        """Restart the GC grace period of an existing blob; False if it does not exist."""
+        if not is_sha256(sha256):
+            return False
+        try:
+            os.utime(self.blob_path(sha256))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _commit_blob(self, staging_path, sha256):
+        """Move a fully written staging file into place, deduplicating."""
+        path = self.blob_path(sha256)
+        if self.retain(sha256):
+            os.remove(staging_path)
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.chmod(staging_path, 0o444)
+        os.replace(staging_path, path)
+        return True
+
+    def import_file(self, source_path):
+        """Copy a local file into the store, hashing while copying."""
+        if not os.path.isfile(source_path):
+            raise ArtifactStoreError(f"File not found: {source_path}")
+        staging_path = os.path.join(self.upload_root, f"import-{uuid.uuid4().hex}.part")
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as source, open(staging_path, 'wb') as target:
+            for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+                target.write(block)
+        sha256 = digest.hexdigest()
+        created = self._commit_blob(staging_path, sha256)
+        return {'sha256': sha256, 'size': self.size(sha256), 'uri': artifact_uri(sha256),
+                'deduplicated': not created}
+
+    def import_bytes(self, data):
+        """Store an in-memory payload, e.g. a small serialized config."""
+        staging_path = os.path.join(self.upload_root, f"import-{uuid.uuid4().hex}.part")
+        with open(staging_path, 'wb') as target:
+            target.write(data)
+        sha256 = hashlib.sha256(data).hexdigest()
+        created = self._commit_blob(staging_path, sha256)
+        return {'sha256': sha256, 'size': len(data), 'uri': artifact_uri(sha256),
+                'deduplicated': not created}
+
+    # Resumable uploads
+
+    def _upload_paths(self, upload_id):
+        if not re.match(r'^[0-9a-f]{32}$', upload_id or ''):
+            raise ArtifactStoreError(f"Invalid upload id: {upload_id}")
+        base = os.path.join(self.upload_root, upload_id)
+        return base + '.part', base + '.json'
+
+    def create_upload(self, size=None, sha256=None):
+        """Start an upload; returns its state, or None if the blob already exists."""
+        if sha256 is not None and not is_sha256(sha256):
+            raise ArtifactStoreError(f"Invalid sha256: {sha256}")
+        if sha256 and self.retain(sha256):
+            return None
+        upload_id = uuid.uuid4().hex
+        data_path, meta_path = self._upload_paths(upload_id)
+        open(data_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump({'size': size, 'sha256': sha256, 'created_at': time.time()}, f)
+        return self.upload_state(upload_id)
+
+    @contextmanager
+    def _locked_upload(self, upload_id):
+        """Hold the upload's staging file open for appending under an exclusive lock."""
+        data_path, _ = self._upload_paths(upload_id)
+        try:
+            # No O_CREAT: a completed or aborted upload must not be recreated empty
+            fd = os.open(data_path, os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        with os.fdopen(fd, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield f
+
+    def upload_state(self, upload_id):
+        data_path, meta_path = self._upload_paths(upload_id)
+        if not os.path.exists(meta_path):
+            raise KeyError(upload_id)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return {'upload_id': upload_id, 'offset': os.path.getsize(data_path),
+                'size': meta['size'], 'sha256': meta['sha256']}
+
+    def append(self, upload_id, offset, stream):
+        """Append bytes from ``stream`` at ``offset``; returns the new offset."""
+        with self._locked_upload(upload_id) as f:
+            # Read the offset under the lock: a concurrent chunk may just have been written
+            state = self.upload_state(upload_id)
+            if offset != state['offset']:
+                raise UploadOffsetMismatch(state['offset'])
+            written = state['offset']
+            for block in iter(lambda: stream.read(COPY_BLOCK_SIZE), b''):
+                written += len(block)
+                if state['size'] is not None and written > state['size']:
+                    f.truncate(state['offset'])
+                    raise ArtifactStoreError("Upload exceeds declared size")
+                f.write(block)
+        return written
+
+    def complete_upload(self, upload_id, sha256=None):
+        """Verify and commit an upload; returns the blob descriptor."""
+        with self._locked_upload(upload_id):
+            return self._complete_locked(upload_id, sha256)
+
+    def _complete_locked(self, upload_id, sha256):
+        state = self.upload_state(upload_id)
+        data_path, meta_path = self._upload_paths(upload_id)
+        if state['size'] is not None and state['offset'] != state['size']:
+            raise ArtifactStoreError(
+                f"Upload incomplete: received {state['offset']} of {state['size']} bytes"
+            )
+        digest = hashlib.sha256()
+        with open(data_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        actual = digest.hexdigest()
+        expected = sha256 or state['sha256']
+        if expected and expected != actual:
+            self.abort_upload(upload_id)
+            raise ArtifactStoreError(f"Checksum mismatch: expected {expected}, got {actual}")
+        created = self._commit_blob(data_path, actual)
+        os.remove(meta_path)
+        return {'sha256': actual, 'size': self.size(actual), 'uri': artifact_uri(actual),
+                'deduplicated': not created}
+
+    def abort_upload(self, upload_id):
+        for path in self._upload_paths(upload_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # Garbage collection
+
+    def iter_blobs(self):
+        for directory, _, files in os.walk(self.blob_root):
+            for name in files:
+                if is_sha256(name):
+                    yield name, os.path.join(directory, name)
+
+    def collect_garbage(self, referenced, grace_seconds=86400, dry_run=False):
+        """Delete blobs not in ``referenced`` and stale uploads older than the grace period.
+
+        The grace period protects blobs uploaded but not yet attached to a
+        model or dataset version.
+        """
+        cutoff = time.time() - grace_seconds
+        removed, freed, kept = [], 0, 0
+        for sha256, path in self.iter_blobs():
+            stat = os.stat(path)
+            if sha256 in referenced or stat.st_mtime > cutoff:
+                kept += 1
+                continue
+            removed.append(sha256)
+            freed += stat.st_size
+            if not dry_run:
+                os.remove(path)
+        stale_uploads = 0
+        for name in os.listdir(self.upload_root):
+            path = os.path.join(self.upload_root, name)
+            if os.stat(path).st_mtime <= cutoff:
+                stale_uploads += 1
+                if not dry_run:
+                    os.remove(path)
+        return {'removed': removed, 'freed_bytes': freed, 'kept': kept,
+                'stale_uploads': stale_uploads, 'dry_run': dry_run}
+
+def referenced_hashes(db):
+    """Blob hashes referenced by any ModelVersion or DatasetVersion."""
+    from src.models.model_registry import DatasetVersion, ModelVersion
+    columns = [ModelVersion.model_path, ModelVersion.artifacts_path, ModelVersion.preprocessing_path,
+               DatasetVersion.file_path]
+    hashes = set()
+    for column in columns:
+        for (uri,) in db.query(column).filter(column.like(f'{CAS_PREFIX}%')):
+            sha256 = parse_uri(uri)
+            if sha256:
+                hashes.add(sha256)
+    return hashes
+
+_default_store = None
+
+def get_store():
+    """Process-wide store rooted at ARTIFACT_STORE_PATH."""
+    global _default_store
+    if _default_store is None:
+        root = os.environ.get(
+            'ARTIFACT_STORE_PATH',
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'artifacts')
+        )
+        _default_store = ArtifactStore(root)
+    return _default_store
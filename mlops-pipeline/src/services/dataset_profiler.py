@@ -0,0 +1,334 @@
+"""
+Streaming dataset profiling for DatasetVersion registration.
+
+A file is split into chunks that are profiled in parallel by a process
+pool while a background thread computes its SHA-256 checksum, so each
+chunk is read once per pass and memory stays bounded by
+``chunk_size * workers`` regardless of file size. Per-column partial
+statistics (null counts, inferred type, mean/std via Chan's parallel
+update, min/max and a mergeable quantile sketch) are merged as chunks
+complete.
+
+CSV files are split on line boundaries, so quoted fields must not contain
+newlines. Parquet files are split by row group and need ``pyarrow``.
+"""
+
+import hashlib
+import io
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from src.models.model_registry import DatasetVersion
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+CHECKSUM_BLOCK_SIZE = 8 * 1024 * 1024
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch with bounded memory.
+
+    Level ``i`` holds items of weight ``2**i``; a full level is sorted and
+    every other item (from a random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k=1024, seed=None):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        self._random = random.Random(seed)
+
+    def update_array(self, values):
+        """Add a numpy array, halving it in bulk before it enters the levels."""
+        import numpy as np
+        self.count += len(values)
+        level = 0
+        if len(values) > self.k:
+            values = np.sort(values)
+            while len(values) > self.k:
+                values = values[self._random.randint(0, 1)::2]
+                level += 1
+        while len(self.levels) <= level:
+            self.levels.append([])
+        self.levels[level].extend(values.tolist())
+        self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level >= len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items.sort()
+                offset = self._random.randint(0, 1)
+                promoted = items[offset::2]
+                self.levels[level] = []
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[level + 1].extend(promoted)
+            level += 1
+
+    def quantiles(self, fractions=QUANTILES):
+        weighted = sorted(
+            (value, 1 << level) for level, items in enumerate(self.levels) for value in items
+        )
+        if not weighted:
+            return {}
+        total = sum(weight for _, weight in weighted)
+        result = {}
+        for fraction in fractions:
+            target = fraction * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            result[f"p{int(round(fraction * 100)):02d}"] = value
+        return result
+
+    def __getstate__(self):
+        return {'k': self.k, 'levels': self.levels, 'count': self.count}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._random = random.Random()
+
+class ColumnStats:
+    """Partial statistics for one column, mergeable across chunks."""
+
+    def __init__(self):
+        self.dtype = 'empty'
+        self.count = 0
+        self.nulls = 0
+        self.numeric_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = None
+
+    @staticmethod
+    def merge_types(left, right):
+        if left == 'empty':
+            return right
+        if right == 'empty' or left == right:
+            return left
+        if {left, right} <= {'integer', 'float'}:
+            return 'float'
+        return 'string'
+
+    def update_numeric(self, values):
+        """Fold a numpy array of non-null numbers into the running stats."""
+        n = len(values)
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._combine(n, batch_mean, batch_m2, float(values.min()), float(values.max()))
+        if self.sketch is None:
+            self.sketch = QuantileSketch()
+        self.sketch.update_array(values)
+
+    def _combine(self, n, mean, m2, minimum, maximum):
+        total = self.numeric_count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.numeric_count * n / total
+        self.numeric_count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def merge(self, other):
+        self.dtype = self.merge_types(self.dtype, other.dtype)
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.numeric_count:
+            self._combine(other.numeric_count, other.mean, other.m2, other.min, other.max)
+            if self.sketch is None:
+                self.sketch = other.sketch
+            else:
+                self.sketch.merge(other.sketch)
+
+    def summary(self):
+        stats = {'count': self.count - self.nulls}
+        if self.numeric_count and self.dtype in ('integer', 'float', 'boolean'):
+            stats.update({
+                'mean': self.mean,
+                'std': math.sqrt(self.m2 / (self.numeric_count - 1)) if self.numeric_count > 1 else 0.0,
+                'min': self.min,
+                'max': self.max,
+                'quantiles': self.sketch.quantiles() if self.sketch else {}
+            })
+        return stats
+
+def _dtype_name(series):
+    import pandas as pd
+    if series.isna().all():
+        return 'empty'
+    if pd.api.types.is_bool_dtype(series):
+        return 'boolean'
+    if pd.api.types.is_integer_dtype(series):
+        return 'integer'
+    if pd.api.types.is_float_dtype(series):
+        return 'float'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    return 'string'
+
+def _profile_frame(frame):
+    """Partial ColumnStats for every column of a pandas DataFrame."""
+    columns = {}
+    for name in frame.columns:
+        series = frame[name]
+        stats = ColumnStats()
+        stats.dtype = _dtype_name(series)
+        stats.count = len(series)
+        stats.nulls = int(series.isna().sum())
+        if stats.dtype in ('integer', 'float', 'boolean'):
+            stats.update_numeric(series.dropna().to_numpy(dtype='float64'))
+        columns[str(name)] = stats
+    return len(frame), columns
+
+def _profile_csv_range(path, start, end, columns, delimiter):
+    import pandas as pd
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if not data.strip():
+        return 0, {}
+    frame = pd.read_csv(io.BytesIO(data), header=None, names=columns, sep=delimiter,
+                        low_memory=False)
+    return _profile_frame(frame)
+
+def _profile_parquet_row_group(path, row_group):
+    import pyarrow.parquet as pq
+    frame = pq.ParquetFile(path).read_row_group(row_group).to_pandas()
+    return _profile_frame(frame)
+
+def _csv_tasks(path, chunk_size, delimiter):
+    """Yield (function, args) tasks covering the file on line boundaries."""
+    import csv
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        columns = next(csv.reader([header_line.decode('utf-8-sig')], delimiter=delimiter))
+        start = f.tell()
+        while start < file_size:
+            f.seek(min(start + chunk_size, file_size))
+            f.readline()
+            end = min(f.tell(), file_size)
+            yield _profile_csv_range, (path, start, end, columns, delimiter)
+            start = end
+
+def _parquet_tasks(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Profiling parquet files requires the pyarrow package")
+    for row_group in range(pq.ParquetFile(path).num_row_groups):
+        yield _profile_parquet_row_group, (path, row_group)
+
+def file_checksum(path, block_size=CHECKSUM_BLOCK_SIZE):
+    """SHA-256 of a file, streamed in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('parquet', 'pq'):
+        return 'parquet'
+    if extension in ('csv', 'tsv', 'txt'):
+        return 'csv'
+    raise ValueError(f"Unsupported dataset format: {extension or path}")
+
+def profile_dataset(path, format=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, delimiter=None):
+    """Profile a local CSV or Parquet file in parallel, bounded-memory chunks.
+
+    Returns a dict matching the DatasetVersion statistics columns.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"Dataset file not found: {path}")
+    format = format or detect_format(path)
+    if format == 'csv':
+        delimiter = delimiter or ('\t' if path.lower().endswith('.tsv') else ',')
+        tasks = _csv_tasks(path, chunk_size, delimiter)
+    elif format == 'parquet':
+        tasks = _parquet_tasks(path)
+    else:
+        raise ValueError(f"Unsupported dataset format: {format}")
+
+    checksum_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dataset-checksum')
+    checksum = checksum_executor.submit(file_checksum, path)
+
+    workers = workers or os.cpu_count() or 1
+    row_count = 0
+    columns = {}
+    column_order = []
+    try:
+        # Spawned workers: forking a server process would copy its threads' locks
+        # (and any open database connections) into the children mid-use
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            pending = set()
+            # Keep at most two chunks per worker in flight to bound memory
+            for function, args in tasks:
+                pending.add(executor.submit(function, *args))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    row_count += _merge_results(done, columns, column_order)
+            done, _ = wait(pending)
+            row_count += _merge_results(done, columns, column_order)
+    finally:
+        checksum_executor.shutdown()
+
+    return {
+        'format': format,
+        'row_count': row_count,
+        'column_count': len(column_order),
+        'file_size': os.path.getsize(path),
+        'missing_values': {name: columns[name].nulls for name in column_order},
+        'data_types': {name: columns[name].dtype for name in column_order},
+        'statistics': {name: columns[name].summary() for name in column_order},
+        'checksum': checksum.result()
+    }
+
+def _merge_results(futures, columns, column_order):
+    rows = 0
+    for future in futures:
+        chunk_rows, chunk_columns = future.result()
+        rows += chunk_rows
+        for name, stats in chunk_columns.items():
+            if name not in columns:
+                columns[name] = ColumnStats()
+                column_order.append(name)
+            columns[name].merge(stats)
+    return rows
+
+def register_dataset(db, name, version, file_path, description=None, source=None,
+                     format=None, **profile_options):
+    """Profile ``file_path`` and store it as a new DatasetVersion."""
+    profile = profile_dataset(file_path, format=format, **profile_options)
+    dataset = DatasetVersion(
+        name=name,
+        version=version,
+        description=description,
+        source=source,
+        file_path=os.path.abspath(file_path),
+        **profile
+    )
+    db.add(dataset)
+    db.commit()
+    db.refresh(dataset)
+    return dataset
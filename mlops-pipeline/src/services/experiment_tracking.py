@@ -0,0 +1,208 @@
+"""
+Experiment run logging: step-indexed metric time series.
+
+Metric points go into the narrow ``experiment_metrics`` table keyed by
+(run_id, key, step), so logging an epoch is one small bulk insert instead
+of a rewrite of ``Experiment.metrics``. Reads can be downsampled in SQL to
+a fixed number of points per key for plotting long runs.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, insert, select
+
+from src.models.model_registry import Experiment, ExperimentMetric
+
+def _parse_timestamp(value):
+    if value is None:
+        return datetime.utcnow()
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value)
+    return datetime.fromisoformat(value)
+
+def metric_rows(run_id, entries):
+    """Flatten ``[{'step', 'metrics', 'timestamp'?}, ...]`` into table rows."""
+    rows = []
+    for entry in entries:
+        step = int(entry['step'])
+        timestamp = _parse_timestamp(entry.get('timestamp'))
+        for key, value in entry['metrics'].items():
+            rows.append({
+                'run_id': run_id,
+                'key': str(key),
+                'step': step,
+                'value': float(value),
+                'timestamp': timestamp
+            })
+    return rows
+
+def _upsert(db, rows):
+    """Bulk insert rows, overwriting any point already logged at the same step."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = dialect_insert(ExperimentMetric)
+        statement = statement.on_conflict_do_update(
+            index_elements=['run_id', 'key', 'step'],
+            set_={'value': statement.excluded.value, 'timestamp': statement.excluded.timestamp}
+        )
+        db.execute(statement, rows)
+    else:
+        db.execute(insert(ExperimentMetric), rows)
+
+def log_metrics(db, run_id, entries):
+    """Store a batch of metric entries for ``run_id``; returns points written."""
+    rows = metric_rows(run_id, entries)
+    if rows:
+        _upsert(db, rows)
+        db.commit()
+    return len(rows)
+
+def read_metrics(db, run_id, keys=None, max_points=None, start_step=None, end_step=None):
+    """Metric series for a run as ``{key: [{'step', 'value', ...}]}``.
+
+    With ``max_points``, steps are grouped into at most that many equal-width
+    buckets per key and each bucket reports its first step and the mean,
+    min and max value, so a long curve keeps its envelope.
+    """
+    filters = [ExperimentMetric.run_id == run_id]
+    if keys:
+        filters.append(ExperimentMetric.key.in_(keys))
+    if start_step is not None:
+        filters.append(ExperimentMetric.step >= start_step)
+    if end_step is not None:
+        filters.append(ExperimentMetric.step <= end_step)
+
+    series = {}
+    if max_points:
+        low, high = db.execute(
+            select(func.min(ExperimentMetric.step), func.max(ExperimentMetric.step)).where(*filters)
+        ).one()
+        if low is None:
+            return series
+        width = max(1, -(-(high - low + 1) // max_points))
+        bucket = ((ExperimentMetric.step - low) // width).label('bucket')
+        query = (
+            select(
+                ExperimentMetric.key,
+                bucket,
+                func.min(ExperimentMetric.step),
+                func.avg(ExperimentMetric.value),
+                func.min(ExperimentMetric.value),
+                func.max(ExperimentMetric.value)
+            )
+            .where(*filters)
+            .group_by(ExperimentMetric.key, bucket)
+            .order_by(ExperimentMetric.key, bucket)
+        )
+        for key, _, step, mean, minimum, maximum in db.execute(query):
+            series.setdefault(key, []).append(
+                {'step': step, 'value': mean, 'min': minimum, 'max': maximum}
+            )
+        return series
+
+    query = (
+        select(ExperimentMetric.key, ExperimentMetric.step, ExperimentMetric.value)
+        .where(*filters)
+        .order_by(ExperimentMetric.key, ExperimentMetric.step)
+    )
+    for key, step, value in db.execute(query):
+        series.setdefault(key, []).append({'step': step, 'value': value})
+    return series
+
+def last_values(db, run_id):
+    """Value at the highest logged step for every key of a run."""
+    latest = (
+        select(ExperimentMetric.key, func.max(ExperimentMetric.step).label('step'))
+        .where(ExperimentMetric.run_id == run_id)
+        .group_by(ExperimentMetric.key)
+        .subquery()
+    )
+    query = (
+        select(ExperimentMetric.key, ExperimentMetric.value)
+        .join(latest, (ExperimentMetric.key == latest.c.key) & (ExperimentMetric.step == latest.c.step))
+        .where(ExperimentMetric.run_id == run_id)
+    )
+    return {key: value for key, value in db.execute(query)}
+
+def complete_run(db, experiment, status='completed', metrics=None):
+    """Close a run: set end time and duration and summarize its metrics.
+
+    The summary is the last logged value of every key, overlaid with any
+    explicitly supplied ``metrics``.
+    """
+    experiment.status = status
+    experiment.end_time = datetime.utcnow()
+    if experiment.start_time:
+        experiment.duration = (experiment.end_time - experiment.start_time).total_seconds()
+    summary = dict(experiment.metrics or {})
+    summary.update(last_values(db, experiment.run_id))
+    summary.update(metrics or {})
+    experiment.metrics = summary
+    db.commit()
+    db.refresh(experiment)
+    return experiment
+
+def get_experiment(db, run_id):
+    return db.query(Experiment).filter(Experiment.run_id == run_id).first()
+
+class RunLogger:
+    """Client-side buffer batching ``log_metrics`` calls to the API.
+
+    Points are flushed when ``batch_size`` entries are buffered, when
+    ``flush_interval`` seconds have passed since the last flush, or on
+    ``close``::
+
+        with RunLogger('http://localhost:5000', run_id) as logger:
+            for epoch in range(epochs):
+                logger.log_metrics(epoch, {'loss': loss, 'val_loss': val_loss})
+    """
+
+    def __init__(self, base_url, run_id, batch_size=100, flush_interval=5.0, session=None):
+        import requests
+        self.url = f"{base_url.rstrip('/')}/api/experiments/{run_id}/metrics"
+        self.complete_url = f"{base_url.rstrip('/')}/api/experiments/{run_id}/complete"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session = session or requests.Session()
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def log_metrics(self, step, metrics, timestamp=None):
+        entry = {'step': step, 'metrics': metrics,
+                 'timestamp': (timestamp or datetime.utcnow()).isoformat()}
+        with self._lock:
+            self._buffer.append(entry)
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if entries:
+            response = self.session.post(self.url, json={'entries': entries})
+            response.raise_for_status()
+
+    def complete(self, status='completed', metrics=None):
+        self.flush()
+        response = self.session.put(self.complete_url, json={'status': status, 'metrics': metrics or {}})
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.complete(status='completed' if exc_type is None else 'failed')
@@ -0,0 +1,235 @@
+"""
+Per-model feature schemas compiled into validators and converters.
+
+A schema is stored on ``ModelVersion.feature_schema`` as::
+
+    {"features": [
+        {"name": "amount", "type": "float", "min": 0},
+        {"name": "merchant", "type": "category", "categories": ["grocery", "travel"]},
+        {"name": "is_new_customer", "type": "bool", "required": false, "default": 0}
+    ]}
+
+Types are ``float``, ``int``, ``bool`` and ``category`` (encoded as the
+category's index). Compiling resolves each field's rules once, so
+converting a payload is a single pass that writes into a preallocated
+float64 array in model order. Batches are converted column by column with
+one ``numpy.array`` call per field when the values are already plain
+numbers, falling back to a per-value pass only to pinpoint errors.
+Optional fields without a default become NaN.
+"""
+
+import json
+import math
+import threading
+from functools import lru_cache
+
+FIELD_TYPES = ('float', 'int', 'bool', 'category')
+MAX_ERROR_ROWS = 20
+MAX_MODEL_SCHEMAS = 256
+_MISSING = object()
+_NUMBER_TYPES = frozenset((int, float))
+
+class SchemaError(ValueError):
+    """The feature schema definition itself is invalid."""
+
+class FeatureValidationError(ValueError):
+    """A payload does not match the schema; ``errors`` lists problems per field."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid feature(s)")
+        self.errors = errors
+
+class _Field:
+    __slots__ = ('name', 'type', 'required', 'default', 'min', 'max', 'categories')
+
+    def __init__(self, spec):
+        if not isinstance(spec, dict) or not isinstance(spec.get('name'), str):
+            raise SchemaError("Each feature needs a string 'name'")
+        self.name = spec['name']
+        self.type = spec.get('type', 'float')
+        if self.type not in FIELD_TYPES:
+            raise SchemaError(f"{self.name}: unknown type '{self.type}'")
+        self.required = bool(spec.get('required', True))
+        self.min = spec.get('min')
+        self.max = spec.get('max')
+        for bound in ('min', 'max'):
+            value = getattr(self, bound)
+            if value is not None and (type(value) not in _NUMBER_TYPES or math.isnan(value)):
+                raise SchemaError(f"{self.name}: '{bound}' must be a number")
+        self.categories = None
+        if self.type == 'category':
+            categories = spec.get('categories')
+            if not isinstance(categories, list) or not categories:
+                raise SchemaError(f"{self.name}: category features need a non-empty 'categories' list")
+            if not all(isinstance(value, (str, int, float)) for value in categories):
+                raise SchemaError(f"{self.name}: categories must be strings or numbers")
+            self.categories = {value: float(index) for index, value in enumerate(categories)}
+        default = spec.get('default')
+        self.default = None if default is None else self.convert(default)
+        if default is not None and self.default is None:
+            raise SchemaError(f"{self.name}: default {default!r} does not match type '{self.type}'")
+
+    def convert(self, value):
+        """Float encoding of one value, or None if it has the wrong type."""
+        kind = type(value)
+        if self.type == 'category':
+            if kind is list or kind is dict:
+                return None
+            return self.categories.get(value)
+        if self.type == 'bool':
+            if kind is bool or (kind is int and value in (0, 1)):
+                return float(value)
+            return None
+        if kind is bool or kind not in _NUMBER_TYPES:
+            return None
+        if self.type == 'int' and kind is float and not value.is_integer():
+            return None
+        return float(value)
+
+    def check(self, value):
+        """Return (encoded value, error code or None) for one raw value."""
+        if value is _MISSING or value is None:
+            if self.default is not None:
+                return self.default, None
+            return math.nan, 'missing' if self.required else None
+        encoded = self.convert(value)
+        if encoded is None:
+            if self.type == 'category' and type(value) not in (list, dict):
+                return math.nan, 'unknown_category'
+            return math.nan, 'type'
+        if math.isnan(encoded) or (self.min is not None and encoded < self.min) or \
+                (self.max is not None and encoded > self.max):
+            return encoded, 'range'
+        return encoded, None
+
+    def message(self, code, value=None):
+        if code == 'missing':
+            return f"'{self.name}' is required"
+        if code == 'type':
+            return f"'{self.name}' must be of type {self.type}"
+        if code == 'unknown_category':
+            return f"'{self.name}' has unknown category {value!r}"
+        bounds = [f">= {self.min}"] if self.min is not None else []
+        if self.max is not None:
+            bounds.append(f"<= {self.max}")
+        return f"'{self.name}' must be a number {' and '.join(bounds)}".rstrip()
+
+class CompiledSchema:
+    """Validator/converter from JSON feature payloads to float64 arrays."""
+
+    def __init__(self, schema):
+        if not isinstance(schema, dict) or not isinstance(schema.get('features'), list):
+            raise SchemaError("Schema must be an object with a 'features' list")
+        self.fields = [_Field(spec) for spec in schema['features']]
+        self.names = [field.name for field in self.fields]
+        if len(set(self.names)) != len(self.names):
+            raise SchemaError("Feature names must be unique")
+        self.width = len(self.fields)
+
+    def to_array(self, payload):
+        """Convert one ``{name: value}`` payload to a 1-D array in model order."""
+        import numpy as np
+        if not isinstance(payload, dict):
+            raise FeatureValidationError([{'field': None, 'error': 'type',
+                                           'message': 'features must be an object'}])
+        out = np.empty(self.width, dtype=np.float64)
+        errors = []
+        get = payload.get
+        for index, field in enumerate(self.fields):
+            value = get(field.name, _MISSING)
+            out[index], code = field.check(value)
+            if code:
+                errors.append({'field': field.name, 'error': code,
+                               'message': field.message(code, value)})
+        if errors:
+            raise FeatureValidationError(errors)
+        return out
+
+    def to_matrix(self, records):
+        """Convert a list of payloads to a C-contiguous ``(n, width)`` array.
+
+        Errors are reported once per field and error kind, with the first
+        offending row indices and a total count.
+        """
+        import numpy as np
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise FeatureValidationError([{'field': None, 'error': 'type',
+                                           'message': 'records must be a list of objects'}])
+        out = np.empty((len(records), self.width), dtype=np.float64)
+        errors = {}
+        for index, field in enumerate(self.fields):
+            values = [record.get(field.name) for record in records]
+            column = self._fast_column(field, values, np)
+            if column is None:
+                column = self._slow_column(field, values, errors)
+            out[:, index] = column
+        if errors:
+            raise FeatureValidationError(list(errors.values()))
+        return out
+
+    @staticmethod
+    def _fast_column(field, values, np):
+        """Vectorized conversion for all-numeric columns; None if it cannot apply."""
+        if field.type not in ('float', 'int') or not set(map(type, values)) <= _NUMBER_TYPES:
+            return None
+        column = np.array(values, dtype=np.float64)
+        if np.isnan(column).any() or (field.type == 'int' and not np.array_equal(column, np.trunc(column))):
+            return None
+        if (field.min is not None and (column < field.min).any()) or \
+                (field.max is not None and (column > field.max).any()):
+            return None
+        return column
+
+    @staticmethod
+    def _slow_column(field, values, errors):
+        column = []
+        for row, value in enumerate(values):
+            encoded, code = field.check(value)
+            column.append(encoded)
+            if code:
+                entry = errors.get((field.name, code))
+                if entry is None:
+                    entry = errors[(field.name, code)] = {
+                        'field': field.name, 'error': code,
+                        'message': field.message(code, value), 'rows': [], 'count': 0
+                    }
+                entry['count'] += 1
+                if len(entry['rows']) < MAX_ERROR_ROWS:
+                    entry['rows'].append(row)
+        return column
+
+    def describe(self):
+        return {'features': self.names, 'width': self.width}
+
+@lru_cache(maxsize=256)
+def _compile_canonical(canonical):
+    return CompiledSchema(json.loads(canonical))
+
+def compile_schema(schema):
+    """Compiled schema, cached by content so repeated lookups are cheap."""
+    return _compile_canonical(json.dumps(schema, sort_keys=True))
+
+_model_schemas = {}
+_model_schemas_lock = threading.Lock()
+
+def model_schema(model):
+    """Compiled schema of a model version dict, or None if it has none.
+
+    Cached by ``(id, updated_at)``, which changes whenever the schema is
+    replaced, so scoring requests skip serializing the schema for
+    ``compile_schema``'s content key.
+    """
+    schema = model.get('feature_schema')
+    if not schema:
+        return None
+    key = (model.get('id'), model.get('updated_at'))
+    if key[0] is None:
+        return compile_schema(schema)
+    compiled = _model_schemas.get(key)
+    if compiled is None:
+        compiled = compile_schema(schema)
+        with _model_schemas_lock:
+            if len(_model_schemas) >= MAX_MODEL_SCHEMAS:
+                del _model_schemas[next(iter(_model_schemas))]
+            _model_schemas[key] = compiled
+    return compiled
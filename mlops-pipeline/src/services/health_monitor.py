@@ -0,0 +1,413 @@
+"""
+Periodic model health computation from live monitoring signals.
+
+A background thread tails ``prediction_logs``, ``model_metrics`` and
+``drift_detection`` by primary key, appending new rows to ring buffers
+per (model_version_id, deployment_id) that grow to hold the window (up to
+a cap, past which health reports ``window_truncated``), and samples host CPU,
+memory and disk usage from ``/proc``. Every tick it recomputes health over
+a sliding window and publishes the result as an immutable dict, so
+``/api/monitoring/health`` is served from memory without a database
+query. ``ModelHealth`` rows are written at a slower snapshot interval.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, select
+
+from src.models.monitoring import DriftDetection, ModelHealth, ModelMetrics, PredictionLog
+from src.services.partitions import PARTITIONED_MODELS
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+STATUS_PENALTY = {'healthy': 0.0, 'degraded': 15.0, 'unhealthy': 35.0}
+STATUS_ORDER = ('healthy', 'degraded', 'unhealthy')
+
+DEFAULT_THRESHOLDS = {
+    # (degraded, unhealthy) limits; a value at or above the limit takes the status
+    'error_rate': (0.01, 0.05),
+    'p95_latency': (250.0, 1000.0),
+    'cpu_utilization': (80.0, 95.0),
+    'memory_utilization': (80.0, 95.0),
+    'disk_utilization': (85.0, 95.0),
+    'drift_rate': (0.01, 0.5),
+    'idle_seconds': (900.0, 3600.0),
+}
+
+class RingBuffer:
+    """Float columns keyed by timestamp, in a ring that grows to cover ``span``.
+
+    When full, the buffer doubles as long as its oldest sample is still
+    within ``span`` seconds of the new one, up to ``max_capacity``; past
+    that the oldest rows are overwritten and ``truncated(since)`` reports
+    whether a window lost samples.
+    """
+
+    def __init__(self, fields, capacity=4096, span=None, max_capacity=None):
+        import numpy as np
+        self.fields = fields
+        self.capacity = capacity
+        self.span = span
+        self.max_capacity = max(capacity, max_capacity or capacity)
+        self._data = np.full((len(fields) + 1, capacity), np.nan)
+        self._next = 0
+        self._size = 0
+        self._overwritten = -math.inf  # newest timestamp dropped to make room
+
+    def _grow(self):
+        import numpy as np
+        capacity = min(self.capacity * 2, self.max_capacity)
+        data = np.full((self._data.shape[0], capacity), np.nan)
+        # Unroll the ring so the oldest sample comes first
+        data[:, :self.capacity] = np.concatenate(
+            (self._data[:, self._next:], self._data[:, :self._next]), axis=1)
+        self._data = data
+        self._next = self.capacity
+        self.capacity = capacity
+
+    def append(self, timestamp, *values):
+        if self._size == self.capacity:
+            oldest = self._data[0, self._next]
+            if (self.span is not None and self.capacity < self.max_capacity
+                    and timestamp - oldest <= self.span):
+                self._grow()
+            else:
+                self._overwritten = max(self._overwritten, oldest)
+        column = self._next
+        self._data[0, column] = timestamp
+        self._data[1:, column] = values
+        self._next = (column + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def __len__(self):
+        return self._size
+
+    def window(self, since):
+        """Columns for samples with a timestamp at or after ``since``."""
+        data = self._data[:, :self._size]
+        mask = data[0] >= since
+        return {name: data[i + 1, mask] for i, name in enumerate(self.fields)}, data[0, mask]
+
+    def truncated(self, since):
+        """Whether samples at or after ``since`` were overwritten."""
+        return self._overwritten >= since
+
+    def latest_timestamp(self):
+        if not self._size:
+            return None
+        return self._data[0, (self._next - 1) % self.capacity]
+
+def _timestamp(value):
+    # Columns hold naive UTC datetimes; a bare .timestamp() would read them as local time
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else time.time()
+
+def _status(value, limits):
+    if value is None or math.isnan(value):
+        return 'healthy'
+    degraded, unhealthy = limits
+    if value >= unhealthy:
+        return 'unhealthy'
+    if value >= degraded:
+        return 'degraded'
+    return 'healthy'
+
+def _worst(*statuses):
+    return max(statuses, key=STATUS_ORDER.index)
+
+def _float(value):
+    return None if value is None or math.isnan(value) else float(value)
+
+class ResourceSampler:
+    """Host CPU, memory and disk utilization in percent, read from /proc."""
+
+    def __init__(self, disk_path='/'):
+        self.disk_path = disk_path
+        self._last_cpu = self._cpu_times()
+
+    @staticmethod
+    def _cpu_times():
+        try:
+            with open('/proc/stat') as f:
+                fields = [float(value) for value in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0.0)
+        return idle, sum(fields)
+
+    def cpu(self):
+        current = self._cpu_times()
+        previous, self._last_cpu = self._last_cpu, current
+        if current is None or previous is None or current[1] <= previous[1]:
+            return None
+        idle = current[0] - previous[0]
+        total = current[1] - previous[1]
+        return 100.0 * (1.0 - idle / total)
+
+    @staticmethod
+    def memory():
+        try:
+            info = {}
+            with open('/proc/meminfo') as f:
+                for line in f:
+                    name, _, value = line.partition(':')
+                    info[name] = float(value.split()[0])
+            return 100.0 * (1.0 - info['MemAvailable'] / info['MemTotal'])
+        except (OSError, KeyError, ValueError, ZeroDivisionError):
+            return None
+
+    def disk(self):
+        try:
+            stat = os.statvfs(self.disk_path)
+        except OSError:
+            return None
+        if not stat.f_blocks:
+            return None
+        return 100.0 * (1.0 - stat.f_bavail / stat.f_blocks)
+
+    def sample(self):
+        return {'cpu_utilization': self.cpu(), 'memory_utilization': self.memory(),
+                'disk_utilization': self.disk()}
+
+class HealthMonitor:
+    """Background health computation over sliding windows of live signals.
+
+    ``latest()`` returns the last published state and never touches the
+    database. With several worker processes each one runs its own monitor;
+    set ``snapshot_interval`` to 0 on all but one to avoid duplicate
+    ``ModelHealth`` rows.
+    """
+
+    def __init__(self, session_factory, interval=10.0, window=300.0, snapshot_interval=60.0,
+                 capacity=4096, max_capacity=262144, thresholds=None, disk_path='/',
+                 partition_store=None):
+        self.session_factory = session_factory
+        self.partition_store = partition_store
+        self.interval = interval
+        self.window = window
+        self.snapshot_interval = snapshot_interval
+        self.capacity = capacity
+        self.max_capacity = max_capacity
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.resources = ResourceSampler(disk_path)
+        self._predictions = {}
+        self._metrics = {}
+        self._drift = {}
+        self._last_ids = {}
+        self._state = {'timestamp': None, 'models': []}
+        self._last_snapshot = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Ingestion
+
+    def _buffer(self, buffers, key, fields):
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = RingBuffer(fields, self.capacity, span=self.window,
+                                               max_capacity=self.max_capacity)
+        return buffer
+
+    def _tail(self, db, model, columns, partition=None, batch_size=5000):
+        """Yield rows of ``model`` inserted since the last tick, in id order."""
+        source = (model.__tablename__, partition)
+        last_id = self._last_ids.get(source)
+        if last_id is None:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.window)
+            first = db.execute(select(func.min(model.id)).where(model.timestamp >= cutoff)).scalar()
+            if first is None:
+                first = (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+            last_id = first - 1
+        while True:
+            rows = db.execute(
+                select(model.id, *columns).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            ).all()
+            yield from rows
+            if rows:
+                last_id = rows[-1][0]
+            if len(rows) < batch_size:
+                break
+        self._last_ids[source] = last_id
+
+    def _tail_sources(self, db, model, columns):
+        """Tail the main database, or every partition overlapping the window."""
+        if self.partition_store is None or model.__tablename__ not in PARTITIONED_MODELS:
+            yield from self._tail(db, model, columns)
+            return
+        since = datetime.utcnow() - timedelta(seconds=self.window)
+        for key in self.partition_store.partitions(model.__tablename__, start=since):
+            with self.partition_store.session(model.__tablename__, key) as partition_db:
+                yield from self._tail(partition_db, model, columns, key)
+
+    def poll(self, db):
+        """Append rows written since the previous poll to the ring buffers."""
+        for _, model_version_id, deployment_id, timestamp, latency, confidence in self._tail_sources(
+                db, PredictionLog, (PredictionLog.model_version_id, PredictionLog.deployment_id,
+                                    PredictionLog.timestamp, PredictionLog.latency,
+                                    PredictionLog.confidence_score)):
+            self._buffer(self._predictions, (model_version_id, deployment_id),
+                         ('latency', 'confidence')).append(
+                _timestamp(timestamp), NAN if latency is None else latency,
+                NAN if confidence is None else confidence)
+        for row in self._tail_sources(
+                db, ModelMetrics, (ModelMetrics.model_version_id, ModelMetrics.deployment_id,
+                                   ModelMetrics.timestamp, ModelMetrics.prediction_count,
+                                   ModelMetrics.error_count, ModelMetrics.accuracy,
+                                   ModelMetrics.avg_latency)):
+            _, model_version_id, deployment_id, timestamp, predictions, errors, accuracy, latency = row
+            self._buffer(self._metrics, (model_version_id, deployment_id),
+                         ('predictions', 'errors', 'accuracy', 'latency')).append(
+                _timestamp(timestamp), predictions or 0, errors or 0,
+                NAN if accuracy is None else accuracy, NAN if latency is None else latency)
+        for _, model_version_id, timestamp, detected, score in self._tail(
+                db, DriftDetection, (DriftDetection.model_version_id, DriftDetection.timestamp,
+                                     DriftDetection.drift_detected, DriftDetection.drift_score)):
+            self._buffer(self._drift, model_version_id, ('detected', 'score')).append(
+                _timestamp(timestamp), 1.0 if detected else 0.0, NAN if score is None else score)
+
+    # Health computation
+
+    def _model_health(self, key, now, resources):
+        import numpy as np
+        model_version_id, deployment_id = key
+        since = now - self.window
+        indicators = {}
+
+        predictions, _ = (self._predictions[key].window(since) if key in self._predictions
+                          else ({'latency': np.empty(0), 'confidence': np.empty(0)}, None))
+        latency = predictions['latency'][~np.isnan(predictions['latency'])]
+        avg_latency = float(latency.mean()) if len(latency) else None
+        p95_latency = float(np.percentile(latency, 95)) if len(latency) else None
+        indicators['prediction_count'] = int(len(predictions['latency']))
+        truncated = key in self._predictions and self._predictions[key].truncated(since)
+        indicators['p95_latency'] = p95_latency
+
+        last_prediction = (self._predictions[key].latest_timestamp()
+                           if key in self._predictions else None)
+        idle_seconds = now - last_prediction if last_prediction is not None else None
+        indicators['idle_seconds'] = idle_seconds
+
+        error_rate = None
+        if key in self._metrics:
+            metrics, _ = self._metrics[key].window(since)
+            truncated = truncated or self._metrics[key].truncated(since)
+            total = metrics['predictions'].sum()
+            if total:
+                error_rate = float(metrics['errors'].sum() / total)
+            accuracy = metrics['accuracy'][~np.isnan(metrics['accuracy'])]
+            indicators['accuracy'] = float(accuracy[-1]) if len(accuracy) else None
+            if avg_latency is None:
+                reported = metrics['latency'][~np.isnan(metrics['latency'])]
+                avg_latency = float(reported.mean()) if len(reported) else None
+
+        drift_rate = None
+        if model_version_id in self._drift:
+            drift, _ = self._drift[model_version_id].window(since)
+            truncated = truncated or self._drift[model_version_id].truncated(since)
+            if len(drift['detected']):
+                drift_rate = float(drift['detected'].mean())
+                scores = drift['score'][~np.isnan(drift['score'])]
+                indicators['max_drift_score'] = float(scores.max()) if len(scores) else None
+                indicators['drift_checks'] = int(len(drift['detected']))
+
+        # Counts and rates then cover only the newest max_capacity samples
+        indicators['window_truncated'] = truncated
+
+        thresholds = self.thresholds
+        prediction_health = _worst(_status(error_rate, thresholds['error_rate']),
+                                   _status(idle_seconds, thresholds['idle_seconds']))
+        performance_health = _status(p95_latency, thresholds['p95_latency'])
+        resource_health = _worst(*(_status(resources[name], thresholds[name]) for name in resources))
+        data_health = _status(drift_rate, thresholds['drift_rate'])
+        components = (prediction_health, performance_health, resource_health, data_health)
+        score = max(0.0, 100.0 - sum(STATUS_PENALTY[status] for status in components))
+
+        return {
+            'model_version_id': model_version_id,
+            'deployment_id': deployment_id,
+            'timestamp': datetime.utcfromtimestamp(now).isoformat(),
+            'overall_health': _worst(*components),
+            'health_score': score,
+            'prediction_health': prediction_health,
+            'performance_health': performance_health,
+            'resource_health': resource_health,
+            'data_health': data_health,
+            'last_prediction_time': (datetime.utcfromtimestamp(last_prediction).isoformat()
+                                     if last_prediction is not None else None),
+            'error_rate': error_rate,
+            'avg_response_time': avg_latency,
+            'cpu_utilization': _float(resources['cpu_utilization']),
+            'memory_utilization': _float(resources['memory_utilization']),
+            'disk_utilization': _float(resources['disk_utilization']),
+            'data_quality_score': 100.0 * (1.0 - drift_rate) if drift_rate is not None else None,
+            'missing_data_rate': None,
+            'health_indicators': indicators
+        }
+
+    def compute(self, now=None):
+        """Recompute and publish health for every model seen in any signal."""
+        now = now or time.time()
+        resources = {name: (NAN if value is None else value)
+                     for name, value in self.resources.sample().items()}
+        keys = set(self._predictions) | set(self._metrics)
+        models = [self._model_health(key, now, resources)
+                  for key in sorted(keys, key=lambda key: (key[0] or 0, key[1] or 0))]
+        self._state = {'timestamp': datetime.utcfromtimestamp(now).isoformat(),
+                       'window_seconds': self.window, 'models': models}
+        return self._state
+
+    def latest(self):
+        return self._state
+
+    # Persistence and scheduling
+
+    def write_snapshot(self, db, state=None):
+        state = state or self._state
+        rows = []
+        for model in state['models']:
+            row = dict(model)
+            for column in ('timestamp', 'last_prediction_time'):
+                row[column] = datetime.fromisoformat(row[column]) if row[column] else None
+            rows.append(row)
+        if rows:
+            db.execute(insert(ModelHealth), rows)
+            db.commit()
+        return len(rows)
+
+    def tick(self):
+        db = self.session_factory()
+        try:
+            self.poll(db)
+            state = self.compute()
+            if self.snapshot_interval and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+                self._last_snapshot = time.monotonic()
+                self.write_snapshot(db, state)
+        except Exception:
+            db.rollback()
+            logger.exception("Health monitor tick failed")
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.tick()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
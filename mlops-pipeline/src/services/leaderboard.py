@@ -0,0 +1,184 @@
+"""
+Experiment comparison and leaderboard queries.
+
+Numeric and categorical leaves of ``Experiment.metrics`` and
+``Experiment.hyperparameters`` are mirrored into ``experiment_scalars``
+whenever an experiment is flushed, so top-k and range filters run as
+index scans on (kind, key, value) rather than JSON parsing in Python.
+The mirroring runs in mapper listeners that each server installs at
+startup with ``register_listeners()``.
+"""
+
+import math
+
+from sqlalchemy import and_, delete, event, inspect, insert, or_, select
+from sqlalchemy.orm import aliased
+
+from src.models.model_registry import Experiment, ExperimentScalar
+
+SCALAR_KINDS = {'metric': 'metrics', 'param': 'hyperparameters'}
+
+def _flatten(value, prefix=''):
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _flatten(child, f"{prefix}{key}.")
+    elif prefix:
+        yield prefix[:-1], value
+
+def scalar_rows(experiment_id, metrics, hyperparameters):
+    """Rows for experiment_scalars from the experiment's JSON columns."""
+    rows = []
+    for kind, source in (('metric', metrics), ('param', hyperparameters)):
+        for key, value in _flatten(source or {}):
+            row = {'experiment_id': experiment_id, 'kind': kind, 'key': key[:100],
+                   'value': None, 'value_text': None}
+            if isinstance(value, bool):
+                row['value'] = float(value)
+            elif isinstance(value, (int, float)):
+                if isinstance(value, float) and not math.isfinite(value):
+                    continue
+                row['value'] = float(value)
+            elif isinstance(value, str):
+                row['value_text'] = value[:255]
+            else:
+                continue
+            rows.append(row)
+    return rows
+
+def _sync_scalars(connection, experiment):
+    connection.execute(
+        delete(ExperimentScalar).where(ExperimentScalar.experiment_id == experiment.id)
+    )
+    rows = scalar_rows(experiment.id, experiment.metrics, experiment.hyperparameters)
+    if rows:
+        connection.execute(insert(ExperimentScalar), rows)
+
+def _experiment_inserted(mapper, connection, target):
+    _sync_scalars(connection, target)
+
+def _experiment_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in SCALAR_KINDS.values()):
+        _sync_scalars(connection, target)
+
+_LISTENERS = (('after_insert', _experiment_inserted), ('after_update', _experiment_updated))
+
+def register_listeners():
+    """Mirror experiment writes into experiment_scalars; safe to call more than once."""
+    for identifier, listener in _LISTENERS:
+        if not event.contains(Experiment, identifier, listener):
+            event.listen(Experiment, identifier, listener)
+
+def backfill_scalars(db, batch_size=1000):
+    """Rebuild experiment_scalars for every experiment (e.g. after bulk loads)."""
+    db.execute(delete(ExperimentScalar))
+    last_id = 0
+    total = 0
+    while True:
+        batch = db.execute(
+            select(Experiment.id, Experiment.metrics, Experiment.hyperparameters)
+            .where(Experiment.id > last_id)
+            .order_by(Experiment.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        rows = [row for experiment_id, metrics, params in batch
+                for row in scalar_rows(experiment_id, metrics, params)]
+        if rows:
+            db.execute(insert(ExperimentScalar), rows)
+        last_id = batch[-1][0]
+        total += len(batch)
+    db.commit()
+    return total
+
+def parse_range(text):
+    """Parse ``min:max`` (either side optional) or an exact value."""
+    if ':' not in text:
+        try:
+            value = float(text)
+        except ValueError:
+            return text
+        return value, value
+    low, _, high = text.partition(':')
+    return (float(low) if low else None, float(high) if high else None)
+
+def _join_scalar(query, kind, key, condition):
+    scalar = aliased(ExperimentScalar)
+    filters = [scalar.experiment_id == Experiment.id, scalar.kind == kind, scalar.key == key]
+    if isinstance(condition, str):
+        filters.append(scalar.value_text == condition)
+    else:
+        low, high = condition
+        if low is not None:
+            filters.append(scalar.value >= low)
+        if high is not None:
+            filters.append(scalar.value <= high)
+    return query.join(scalar, and_(*filters))
+
+def leaderboard(db, metric, k=10, order='desc', algorithm=None, dataset_version=None,
+                status=None, param_filters=None, metric_filters=None):
+    """Top-k experiments by ``metric`` with optional attribute and range filters.
+
+    ``param_filters``/``metric_filters`` map keys to ``(low, high)`` ranges or
+    to a string for an exact categorical match.
+    """
+    ranked = aliased(ExperimentScalar)
+    query = select(Experiment, ranked.value).join(
+        ranked, and_(ranked.experiment_id == Experiment.id,
+                     ranked.kind == 'metric', ranked.key == metric,
+                     ranked.value.isnot(None))
+    )
+    for key, condition in (param_filters or {}).items():
+        query = _join_scalar(query, 'param', key, condition)
+    for key, condition in (metric_filters or {}).items():
+        query = _join_scalar(query, 'metric', key, condition)
+    if algorithm:
+        query = query.where(Experiment.algorithm == algorithm)
+    if dataset_version:
+        query = query.where(Experiment.dataset_version == dataset_version)
+    if status:
+        query = query.where(Experiment.status == status)
+    # Tie-break on the index's trailing column so SQLite can walk the index in order
+    if order == 'asc':
+        query = query.order_by(ranked.value.asc(), ranked.experiment_id.asc())
+    else:
+        query = query.order_by(ranked.value.desc(), ranked.experiment_id.desc())
+    query = query.limit(k)
+    return [
+        {'rank': rank, 'value': value, 'experiment': experiment.to_dict()}
+        for rank, (experiment, value) in enumerate(db.execute(query).all(), start=1)
+    ]
+
+def compare(db, run_ids, metrics=None, params=None):
+    """Side-by-side scalar metrics and hyperparameters for the given runs."""
+    experiments = db.execute(
+        select(Experiment.id, Experiment.run_id, Experiment.name, Experiment.algorithm,
+               Experiment.dataset_version, Experiment.status)
+        .where(Experiment.run_id.in_(run_ids))
+    ).all()
+    by_id = {
+        row.id: {'run_id': row.run_id, 'name': row.name, 'algorithm': row.algorithm,
+                 'dataset_version': row.dataset_version, 'status': row.status,
+                 'metrics': {}, 'params': {}}
+        for row in experiments
+    }
+    if not by_id:
+        return []
+    query = select(ExperimentScalar).where(ExperimentScalar.experiment_id.in_(by_id))
+    if metrics is not None or params is not None:
+        wanted = []
+        if metrics:
+            wanted.append(and_(ExperimentScalar.kind == 'metric', ExperimentScalar.key.in_(metrics)))
+        if params:
+            wanted.append(and_(ExperimentScalar.kind == 'param', ExperimentScalar.key.in_(params)))
+        if not wanted:
+            return list(by_id.values())
+        query = query.where(or_(*wanted))
+    for scalar in db.scalars(query):
+        section = 'metrics' if scalar.kind == 'metric' else 'params'
+        by_id[scalar.experiment_id][section][scalar.key] = (
+            scalar.value if scalar.value is not None else scalar.value_text
+        )
+    order = {run_id: index for index, run_id in enumerate(run_ids)}
+    return sorted(by_id.values(), key=lambda row: order.get(row['run_id'], len(order)))
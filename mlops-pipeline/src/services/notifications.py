@@ -0,0 +1,624 @@
+"""
+Alert notification dispatcher.
+
+A background thread claims undelivered alerts from the ``alerts`` table
+(an atomic ``UPDATE ... RETURNING`` of ``notification_sent``, so several
+API workers never send the same alert twice) and coalesces them into
+digests keyed by channel set, alert type, severity, model and deployment.
+A digest is released once its coalescing window has passed or it reaches
+``max_digest_size``, so an alert storm becomes one notification per key
+per window instead of one per alert.
+
+Each channel has its own worker pool and queue. Workers take a token from
+the channel's token bucket before every attempt and retry failures with
+exponential backoff and jitter. ``notification_sent`` stays set when the
+digest reached at least one channel; alerts no channel accepted are
+released for a later retry.
+
+A claim is a lease: ``notification_claimed_at`` is stamped when an alert
+is claimed, renewed while the dispatcher still holds it and cleared once
+it is delivered. Alerts whose lease is older than ``claim_lease`` seconds,
+because the worker holding them crashed or was killed, are claimed again
+by any dispatcher. Delivery is therefore at least once: a worker that dies
+after sending but before confirming causes a repeat notification.
+
+Channels are pluggable: anything with a ``name`` and a ``send(digest)``
+that raises on failure. Webhook (JSON POST), email (SMTP) and file (JSON
+lines) channels are built in, and ``StandInSink`` is a local HTTP
+receiver with failure injection for exercising delivery end to end.
+"""
+
+import json
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import and_, or_, select, update
+
+from src.models.monitoring import Alert
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SAMPLE_SIZE = 20
+CLAIM_BATCH_SIZE = 1000
+
+class NotificationError(Exception):
+    """Delivery failed; the attempt may be retried."""
+
+class PermanentNotificationError(NotificationError):
+    """Delivery failed in a way retrying will not fix (e.g. HTTP 400)."""
+
+class TokenBucket:
+    """Allows ``rate`` operations per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available; otherwise return the seconds until one is."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, stop=None):
+        """Block until a token is taken; returns False if ``stop`` is set first."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if stop is not None and stop.wait(wait):
+                return False
+            if stop is None:
+                time.sleep(wait)
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+# Channels
+
+def digest_summary(digest):
+    """One-line description used as an email subject or chat text."""
+    extra = f" (+{digest['count'] - 1} similar)" if digest['count'] > 1 else ''
+    return f"[{(digest['severity'] or 'medium').upper()}] {digest['title']}{extra}"
+
+class Channel:
+    """Base class for notification channels."""
+
+    name = None
+
+    def send(self, digest):
+        raise NotImplementedError
+
+class WebhookChannel(Channel):
+    """POSTs the digest as JSON; 5xx, 429 and network errors are retried."""
+
+    def __init__(self, url, name='webhook', timeout=10.0, headers=None):
+        self.url = url
+        self.name = name
+        self.timeout = timeout
+        self.headers = dict({'Content-Type': 'application/json'}, **(headers or {}))
+
+    def send(self, digest):
+        body = json.dumps(dict(digest, text=digest_summary(digest)), default=str).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code != 429:
+                raise PermanentNotificationError(f"{self.url} rejected notification: HTTP {e.code}")
+            raise NotificationError(f"{self.url} failed: HTTP {e.code}")
+        except (urllib.error.URLError, OSError) as e:
+            raise NotificationError(f"{self.url} unreachable: {e}")
+
+class EmailChannel(Channel):
+    """Sends the digest as a plain-text email over SMTP."""
+
+    def __init__(self, host, sender, recipients, port=25, username=None, password=None,
+                 use_tls=False, timeout=10.0, name='email'):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.name = name
+
+    def send(self, digest):
+        message = EmailMessage()
+        message['Subject'] = digest_summary(digest)
+        message['From'] = self.sender
+        message['To'] = ', '.join(self.recipients)
+        lines = [f"{digest['count']} alert(s) between {digest['first_triggered_at']} "
+                 f"and {digest['last_triggered_at']}", '']
+        lines.extend(f"- {alert['triggered_at']} {alert['title']}: {alert['message']}"
+                     for alert in digest['alerts'])
+        if digest['count'] > len(digest['alerts']):
+            lines.append(f"... and {digest['count'] - len(digest['alerts'])} more")
+        message.set_content('\n'.join(lines))
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.use_tls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or '')
+                smtp.send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise PermanentNotificationError(f"Recipients refused: {e.recipients}")
+        except (smtplib.SMTPException, OSError) as e:
+            raise NotificationError(f"SMTP delivery via {self.host} failed: {e}")
+
+class FileChannel(Channel):
+    """Appends each digest as one JSON line."""
+
+    def __init__(self, path, name='file'):
+        self.path = path
+        self.name = name
+        self._lock = threading.Lock()
+
+    def send(self, digest):
+        line = json.dumps(dict(digest, text=digest_summary(digest)), default=str)
+        try:
+            with self._lock, open(self.path, 'a') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            raise NotificationError(f"Cannot write {self.path}: {e}")
+
+# Delivery
+
+class _Digest:
+    """Alerts coalesced under one key, pending delivery to its channels."""
+
+    def __init__(self, key, channels, alert):
+        self.key = key
+        self.channels = channels
+        self.opened_at = time.monotonic()
+        self.alerts = []
+        self.alert_ids = []
+        self.first = self.last = alert
+        self.pending = len(channels)
+        self.delivered = 0
+        self.lock = threading.Lock()
+
+    def add(self, alert):
+        self.alert_ids.append(alert['id'])
+        if len(self.alerts) < DIGEST_SAMPLE_SIZE:
+            self.alerts.append(alert)
+        self.last = alert
+
+    def payload(self):
+        return {
+            'key': self.key,
+            'alert_type': self.first['alert_type'],
+            'severity': self.first['severity'],
+            'model_version_id': self.first['model_version_id'],
+            'deployment_id': self.first['deployment_id'],
+            'title': self.first['title'],
+            'count': len(self.alert_ids),
+            'first_triggered_at': self.first['triggered_at'],
+            'last_triggered_at': self.last['triggered_at'],
+            'alert_ids': self.alert_ids,
+            'alerts': self.alerts,
+        }
+
+class ChannelPool:
+    """Worker threads delivering digests to one channel under a rate limit."""
+
+    def __init__(self, channel, on_done, workers=2, rate=1.0, burst=10, max_attempts=5,
+                 backoff=1.0, max_backoff=60.0):
+        self.channel = channel
+        self.on_done = on_done
+        self.bucket = TokenBucket(rate, burst)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = {'sent': 0, 'failed': 0, 'retries': 0, 'alerts_sent': 0}
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"notify-{channel.name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, digest):
+        self._queue.put(digest)
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            digest = self._queue.get()
+            if digest is None:
+                return
+            self.on_done(digest, self.channel.name, self._deliver(digest))
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _deliver(self, digest):
+        payload = digest.payload()
+        for attempt in range(1, self.max_attempts + 1):
+            if not self.bucket.acquire(self._stop):
+                break
+            try:
+                self.channel.send(payload)
+                self._count('sent')
+                self._count('alerts_sent', payload['count'])
+                return True
+            except PermanentNotificationError as e:
+                logger.warning("Notification to %s dropped: %s", self.channel.name, e)
+                break
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    logger.warning("Notification to %s failed after %d attempts: %s",
+                                   self.channel.name, attempt, e)
+                    break
+                self._count('retries')
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                if self._stop.wait(delay * random.uniform(0.5, 1.0)):
+                    break
+        self._count('failed')
+        return False
+
+    def stop(self, timeout=5.0):
+        """Deliver what is queued within ``timeout``, then abandon retries."""
+        for _ in self._threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+class NotificationDispatcher:
+    """Claims new alerts, coalesces them into digests and hands them to channel pools.
+
+    ``channels`` are Channel instances; an alert is sent to the channels
+    named in its ``notification_channels`` that are configured, or to
+    ``default_channels`` when none are.
+    """
+
+    def __init__(self, session_factory, channels, default_channels=('file',), poll_interval=2.0,
+                 coalesce_window=30.0, max_digest_size=500, workers=2, rate=1.0, burst=10,
+                 max_attempts=5, backoff=1.0, max_backoff=60.0, claim_lease=300.0):
+        self.session_factory = session_factory
+        self.channels = {channel.name: channel for channel in channels}
+        self.default_channels = tuple(name for name in default_channels if name in self.channels) \
+            or tuple(self.channels)[:1]
+        self.poll_interval = poll_interval
+        self.coalesce_window = coalesce_window
+        self.max_digest_size = max_digest_size
+        self.max_backoff = max_backoff
+        self.claim_lease = claim_lease
+        self.pools = {
+            name: ChannelPool(channel, self._completed, workers=workers, rate=rate, burst=burst,
+                              max_attempts=max_attempts, backoff=backoff, max_backoff=max_backoff)
+            for name, channel in self.channels.items()
+        }
+        self.stats = {'claimed': 0, 'digests': 0, 'alerts_delivered': 0, 'released': 0,
+                      'unroutable_channels': 0}
+        self._pending = {}
+        self._failed = []
+        self._held = set()  # claimed ids whose lease we keep renewing
+        self._delivered = []  # delivered ids whose lease is still to be cleared
+        self._renewed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Coalescing
+
+    def _route(self, alert):
+        requested = alert.get('notification_channels') or ()
+        if isinstance(requested, str):
+            requested = (requested,)
+        routed = tuple(sorted({name for name in requested if name in self.channels}))
+        if len(routed) < len(set(requested)):
+            self.stats['unroutable_channels'] += 1
+        return routed or self.default_channels
+
+    def submit(self, alert):
+        """Add a claimed alert dict to its digest; returns the digest key."""
+        channels = self._route(alert)
+        key = '/'.join(str(part) for part in (
+            '+'.join(channels), alert['alert_type'], alert['severity'],
+            f"model={alert['model_version_id']}", f"deployment={alert['deployment_id']}"
+        ))
+        with self._lock:
+            digest = self._pending.get(key)
+            if digest is None:
+                digest = self._pending[key] = _Digest(key, channels, alert)
+            digest.add(alert)
+        return key
+
+    def flush(self, force=False):
+        """Hand digests whose window has passed (or that are full) to the channel pools."""
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key, digest in self._pending.items()
+                   if force or now - digest.opened_at >= self.coalesce_window
+                   or len(digest.alert_ids) >= self.max_digest_size]
+            digests = [self._pending.pop(key) for key in due]
+        for digest in digests:
+            self.stats['digests'] += 1
+            for name in digest.channels:
+                self.pools[name].put(digest)
+        return len(digests)
+
+    def _completed(self, digest, channel, ok):
+        with digest.lock:
+            digest.pending -= 1
+            digest.delivered += ok
+            finished = digest.pending == 0
+        if finished:
+            with self._lock:
+                if digest.delivered:
+                    self.stats['alerts_delivered'] += len(digest.alert_ids)
+                    self._delivered.extend(digest.alert_ids)
+                else:
+                    self._failed.append((time.monotonic(), digest.alert_ids))
+
+    # Database
+
+    def _update(self, db, ids, **values):
+        for start in range(0, len(ids), CLAIM_BATCH_SIZE):
+            db.execute(update(Alert).where(Alert.id.in_(ids[start:start + CLAIM_BATCH_SIZE]))
+                       .values(**values).execution_options(synchronize_session=False))
+
+    def claim(self, db, limit=CLAIM_BATCH_SIZE):
+        """Atomically take up to ``limit`` unsent (or abandoned) active alerts and submit them."""
+        now = datetime.utcnow()
+        claimable = or_(
+            Alert.notification_sent.is_(False),
+            # Claimed by a dispatcher that stopped renewing its lease
+            and_(Alert.notification_claimed_at.isnot(None),
+                 Alert.notification_claimed_at < now - timedelta(seconds=self.claim_lease))
+        )
+        candidates = (select(Alert.id)
+                      .where(claimable, Alert.status == 'active')
+                      .order_by(Alert.id).limit(limit))
+        statement = (update(Alert)
+                     .where(Alert.id.in_(candidates), claimable)
+                     .values(notification_sent=True, notification_claimed_at=now)
+                     .returning(Alert)
+                     .execution_options(synchronize_session=False))
+        alerts = [alert.to_dict() for alert in db.scalars(statement)]
+        db.commit()
+        with self._lock:
+            self._held.update(alert['id'] for alert in alerts)
+        for alert in sorted(alerts, key=lambda alert: alert['id']):
+            self.submit(alert)
+        self.stats['claimed'] += len(alerts)
+        return len(alerts)
+
+    def release_failed(self, db, delay=None):
+        """Clear ``notification_sent`` on alerts no channel accepted, ``delay`` seconds after
+        the failure (default ``max_backoff``), so they are claimed and retried later."""
+        cutoff = time.monotonic() - (self.max_backoff if delay is None else delay)
+        with self._lock:
+            failed = [alert_id for failed_at, ids in self._failed if failed_at <= cutoff for alert_id in ids]
+            self._failed = [(failed_at, ids) for failed_at, ids in self._failed if failed_at > cutoff]
+        self._update(db, failed, notification_sent=False, notification_claimed_at=None)
+        db.commit()
+        with self._lock:
+            self._held.difference_update(failed)
+        self.stats['released'] += len(failed)
+        return len(failed)
+
+    def confirm_delivered(self, db):
+        """Clear the lease on delivered alerts so they are never claimed again."""
+        with self._lock:
+            delivered, self._delivered = self._delivered, []
+        self._update(db, delivered, notification_claimed_at=None)
+        db.commit()
+        with self._lock:
+            self._held.difference_update(delivered)
+        return len(delivered)
+
+    def renew_leases(self, db, force=False):
+        """Push back the lease on alerts still held, every third of ``claim_lease``."""
+        if not force and time.monotonic() - self._renewed_at < self.claim_lease / 3:
+            return 0
+        self._renewed_at = time.monotonic()
+        with self._lock:
+            held = sorted(self._held)
+        self._update(db, held, notification_claimed_at=datetime.utcnow())
+        db.commit()
+        return len(held)
+
+    def tick(self):
+        db = self.session_factory()
+        try:
+            self.release_failed(db)
+            self.confirm_delivered(db)
+            self.renew_leases(db)
+            while self.claim(db) == CLAIM_BATCH_SIZE:
+                pass
+            self.flush()
+        except Exception:
+            db.rollback()
+            logger.exception("Notification dispatcher tick failed")
+        finally:
+            db.close()
+
+    def wake(self):
+        """Poll now instead of waiting for the next interval (e.g. after creating an alert)."""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.tick()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Stop polling, send pending digests within ``timeout`` and release the rest."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(force=True)
+        for pool in self.pools.values():
+            pool.stop(timeout)
+        db = self.session_factory()
+        try:
+            self.release_failed(db, delay=0)
+            self.confirm_delivered(db)
+        finally:
+            db.close()
+
+    def snapshot(self):
+        with self._lock:
+            pending = [{'key': digest.key, 'count': len(digest.alert_ids),
+                        'age_seconds': round(time.monotonic() - digest.opened_at, 3)}
+                       for digest in self._pending.values()]
+        return dict(self.stats, held=len(self._held), pending_digests=pending, channels={
+            name: dict(pool.stats, queued=pool.queued, tokens=round(pool.bucket.tokens, 3))
+            for name, pool in self.pools.items()
+        })
+
+    def prometheus(self):
+        """Queue depths and delivery counts in the Prometheus text exposition format."""
+        state = self.snapshot()
+        channels = sorted(state['channels'].items())
+        lines = [
+            '# HELP mlops_notification_queue_depth Digests waiting for a channel worker.',
+            '# TYPE mlops_notification_queue_depth gauge',
+        ]
+        lines += [f'mlops_notification_queue_depth{{channel="{name}"}} {pool["queued"]}'
+                  for name, pool in channels]
+        lines += [
+            '# HELP mlops_notification_digests_total Digest deliveries per channel and outcome.',
+            '# TYPE mlops_notification_digests_total counter',
+        ]
+        for name, pool in channels:
+            lines += [f'mlops_notification_digests_total{{channel="{name}",result="{result}"}} {pool[result]}'
+                      for result in ('sent', 'failed')]
+        lines += [
+            '# HELP mlops_notification_pending_digests Digests still coalescing alerts.',
+            '# TYPE mlops_notification_pending_digests gauge',
+            f'mlops_notification_pending_digests {len(state["pending_digests"])}',
+            '# HELP mlops_notification_held_alerts Claimed alerts whose lease this worker renews.',
+            '# TYPE mlops_notification_held_alerts gauge',
+            f'mlops_notification_held_alerts {state["held"]}',
+            '# HELP mlops_notification_alerts_claimed_total Alerts claimed for notification.',
+            '# TYPE mlops_notification_alerts_claimed_total counter',
+            f'mlops_notification_alerts_claimed_total {state["claimed"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+# Local stand-in sink
+
+class StandInSink:
+    """Local HTTP receiver for webhook notifications.
+
+    Records every payload in ``received`` (and as JSON lines in
+    ``output_path`` if given) and can fail the first ``fail_first``
+    requests or a random ``fail_rate`` share with ``fail_status`` to
+    exercise retries.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, output_path=None, fail_first=0, fail_rate=0.0,
+                 fail_status=503, latency=0.0):
+        self.output_path = output_path
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.latency = latency
+        self.received = []
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                status = sink.record(body)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def record(self, body):
+        """Store one payload; returns the HTTP status to answer with."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+            if self.requests <= self.fail_first or random.random() < self.fail_rate:
+                return self.fail_status
+            payload = json.loads(body or b'null')
+            self.received.append(payload)
+            if self.output_path:
+                with open(self.output_path, 'a') as f:
+                    f.write(json.dumps({'received_at': datetime.utcnow().isoformat(),
+                                        'payload': payload}) + '\n')
+        return 200
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='notification-sink',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,284 @@
+"""
+Partitioned SQLite storage for high-volume monitoring tables.
+
+``prediction_logs`` and ``model_metrics`` rows are routed to one SQLite
+file per partition, ``<root>/<table>/<key>.db``, keyed by UTC day
+(``20240611``) or by deployment (``deployment_3``). Each file holds the
+regular table definition, so the ORM models and queries work unchanged
+against any partition. Reads fan out across partitions on a thread pool
+(sqlite3 releases the GIL while a statement runs) and are merged in
+Python; day partitions outside a query's time range are skipped by file
+name, and ``latest`` stops opening older days once it has enough rows.
+Retention is a file deletion per partition.
+
+Primary keys are assigned by each partition file, so ``id`` is unique only
+within a partition: rows from different files can share an id. Rows are
+identified by ``(partition, id)``; ``latest`` adds the partition key to
+every row, and ``prediction_logs.request_id`` is globally unique.
+
+Writes and ``drop`` take a per-partition lock, so within a process a write
+never lands in a file that is being deleted. A write whose file was
+deleted by another process after its engine was opened notices that the
+file changed before committing, and retries against a new file.
+"""
+
+import heapq
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from src.middleware.timing import instrument_engine
+from src.models.monitoring import ModelMetrics, PredictionLog
+
+PARTITIONED_MODELS = {model.__tablename__: model for model in (PredictionLog, ModelMetrics)}
+SCHEMES = ('day', 'deployment')
+_KEY_RE = re.compile(r'^(\d{8}|deployment_\d+)$')
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+def store_from_env():
+    """Store configured by MONITORING_PARTITIONS and PARTITION_PATH; None if unset.
+
+    Used by the CLI tools and the ASGI app, which have no Flask config.
+    """
+    scheme = os.environ.get('MONITORING_PARTITIONS', '')
+    if not scheme:
+        return None
+    root = os.environ.get('PARTITION_PATH', os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'partitions'
+    ))
+    return PartitionedStore(root, scheme=scheme,
+                            workers=int(os.environ.get('PARTITION_QUERY_WORKERS', '8')))
+
+class _PartitionDropped(Exception):
+    """The partition file was deleted or replaced while a write was in progress."""
+
+class PartitionedStore:
+    """Routes monitoring rows to per-day or per-deployment SQLite files.
+
+    Row ids are per partition file, not global (see the module docstring).
+    """
+
+    def __init__(self, root, scheme='day', workers=8):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown partition scheme: {scheme}")
+        self.root = os.path.abspath(root)
+        self.scheme = scheme
+        self.workers = workers
+        self._engines = {}
+        self._inodes = {}  # (table, key) -> inode of the file each engine was opened on
+        self._partition_locks = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='partition-query')
+        for table in PARTITIONED_MODELS:
+            os.makedirs(os.path.join(self.root, table), exist_ok=True)
+
+    # Routing
+
+    def partition_key(self, timestamp=None, deployment_id=None):
+        if self.scheme == 'deployment':
+            return f"deployment_{int(deployment_id or 0)}"
+        return (timestamp or datetime.utcnow()).strftime('%Y%m%d')
+
+    def _row_key(self, row):
+        return self.partition_key(row.get('timestamp'), row.get('deployment_id'))
+
+    def path(self, table, key):
+        if table not in PARTITIONED_MODELS:
+            raise ValueError(f"Table is not partitioned: {table}")
+        if not _KEY_RE.match(key):
+            raise ValueError(f"Invalid partition key: {key}")
+        return os.path.join(self.root, table, f"{key}.db")
+
+    def engine(self, table, key):
+        """Engine for one partition, creating the file and schema on first use."""
+        engine = self._engines.get((table, key))
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get((table, key))
+            if engine is None:
+                engine = create_engine(f"sqlite:///{self.path(table, key)}")
+                event.listen(engine, 'connect', _sqlite_pragmas)
+                instrument_engine(engine)
+                model_table = PARTITIONED_MODELS[table].__table__
+                model_table.create(bind=engine, checkfirst=True)
+                for index in model_table.indexes:
+                    index.create(bind=engine, checkfirst=True)
+                self._inodes[(table, key)] = os.stat(self.path(table, key)).st_ino
+                self._engines[(table, key)] = engine
+        return engine
+
+    def _partition_lock(self, table, key):
+        with self._lock:
+            return self._partition_locks.setdefault((table, key), threading.Lock())
+
+    def _forget(self, table, key):
+        with self._lock:
+            engine = self._engines.pop((table, key), None)
+            self._inodes.pop((table, key), None)
+        if engine is not None:
+            engine.dispose()
+
+    def _check_live(self, table, key):
+        """Raise _PartitionDropped if the file behind the cached engine is gone."""
+        try:
+            inode = os.stat(self.path(table, key)).st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode is None or inode != self._inodes.get((table, key)):
+            raise _PartitionDropped(f"{table}/{key}")
+
+    @contextmanager
+    def session(self, table, key):
+        db = Session(bind=self.engine(table, key), autoflush=False)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # Writes
+
+    def add(self, obj):
+        """Persist one ORM object into its partition; returns it refreshed."""
+        table = obj.__tablename__
+        if obj.timestamp is None:
+            obj.timestamp = datetime.utcnow()
+        key = self.partition_key(obj.timestamp, obj.deployment_id)
+        assign_id = obj.id is None
+        while True:
+            with self._partition_lock(table, key), self.session(table, key) as db:
+                db.add(obj)
+                db.flush()
+                try:
+                    self._check_live(table, key)
+                except _PartitionDropped:
+                    db.rollback()
+                else:
+                    db.commit()
+                    db.refresh(obj)
+                    db.expunge(obj)
+                    return obj
+            if assign_id:
+                obj.id = None
+            self._forget(table, key)
+
+    def insert(self, table, rows):
+        """Bulk insert row dicts, one transaction per partition touched."""
+        groups = {}
+        now = datetime.utcnow()
+        for row in rows:
+            row.setdefault('timestamp', now)
+            groups.setdefault(self._row_key(row), []).append(row)
+        statement = insert(PARTITIONED_MODELS[table].__table__)
+        for key, group in groups.items():
+            while True:
+                try:
+                    with self._partition_lock(table, key), self.engine(table, key).begin() as conn:
+                        conn.execute(statement, group)
+                        self._check_live(table, key)
+                    break
+                except _PartitionDropped:
+                    self._forget(table, key)
+        return {key: len(group) for key, group in groups.items()}
+
+    # Reads
+
+    def partitions(self, table, start=None, end=None):
+        """Partition keys of ``table``; day partitions are pruned to [start, end]."""
+        directory = os.path.join(self.root, table)
+        keys = sorted(name[:-3] for name in os.listdir(directory)
+                      if name.endswith('.db') and _KEY_RE.match(name[:-3]))
+        if self.scheme == 'day':
+            if start is not None:
+                keys = [key for key in keys if key >= start.strftime('%Y%m%d')]
+            if end is not None:
+                keys = [key for key in keys if key <= end.strftime('%Y%m%d')]
+        return keys
+
+    def fan_out(self, table, function, start=None, end=None):
+        """Run ``function(session, key)`` on every matching partition in parallel.
+
+        Returns ``[(key, result), ...]`` in partition order.
+        """
+        def run(key):
+            with self.session(table, key) as db:
+                return key, function(db, key)
+        return list(self._executor.map(run, self.partitions(table, start, end)))
+
+    def latest(self, model, limit=100, start=None, end=None, filters=()):
+        """Newest ``limit`` rows across partitions as dicts, by timestamp.
+
+        Day partitions hold disjoint time ranges, so they are read newest
+        first, ``workers`` at a time, until ``limit`` rows are found; older
+        files are not opened. Deployment partitions are all read and merged.
+        """
+        table = model.__tablename__
+
+        def query(key):
+            statement = (select(model).where(*filters)
+                         .order_by(model.timestamp.desc()).limit(limit))
+            with self.session(table, key) as db:
+                return [dict(row.to_dict(), partition=key) for row in db.scalars(statement)]
+
+        keys = self.partitions(table, start, end)
+        if self.scheme == 'day':
+            keys.reverse()
+            rows = []
+            for offset in range(0, len(keys), self.workers):
+                for batch in self._executor.map(query, keys[offset:offset + self.workers]):
+                    rows.extend(batch)
+                if len(rows) >= limit:
+                    break
+            return rows[:limit]
+        rows = heapq.merge(*self._executor.map(query, keys),
+                           key=lambda row: row['timestamp'] or '', reverse=True)
+        return [row for _, row in zip(range(limit), rows)]
+
+    def stats(self, table):
+        partitions = []
+        for key in self.partitions(table):
+            path = self.path(table, key)
+            size = sum(os.path.getsize(path + suffix) for suffix in ('', '-wal')
+                       if os.path.exists(path + suffix))
+            partitions.append({'table': table, 'key': key, 'size_bytes': size})
+        return partitions
+
+    # Retention
+
+    def drop(self, table, key):
+        """Delete one partition file; returns False if it did not exist."""
+        path = self.path(table, key)
+        # Writers hold the same lock, so none is midway through a transaction on this file
+        with self._partition_lock(table, key):
+            self._forget(table, key)
+            existed = os.path.exists(path)
+            for suffix in ('', '-wal', '-shm', '-journal'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        return existed
+
+    def drop_before(self, table, day):
+        """Drop day partitions strictly older than ``day`` (a date or datetime)."""
+        if self.scheme != 'day':
+            raise ValueError("Time-based retention needs the 'day' partition scheme")
+        cutoff = day.strftime('%Y%m%d')
+        return [key for key in self.partitions(table) if key < cutoff and self.drop(table, key)]
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._inodes.clear()
@@ -0,0 +1,352 @@
+"""
+Declarative feature preprocessing fitted at model registration.
+
+A pipeline spec names its input columns and an ordered list of steps::
+
+    {"inputs": ["amount", "hour", "merchant"],
+     "steps": [
+        {"op": "impute", "columns": ["amount"], "strategy": "median"},
+        {"op": "standardize", "columns": ["amount"]},
+        {"op": "bucketize", "column": "hour", "boundaries": [6, 12, 18]},
+        {"op": "hash_encode", "column": "merchant", "buckets": 16}
+     ],
+     "fit": {"dataset_version_id": 3}}
+
+``fit`` is either a registered dataset or inline ``{"records": [...]}``.
+Fitting runs the steps over the training columns once and records their
+learned parameters (fill values, means, quantile boundaries); the fitted
+pipeline is stored as JSON in the artifact store and referenced from
+``ModelVersion.preprocessing_path``. Transforms work column by column
+over whole batches with NumPy, so one online request and a batch of
+thousands share the same code path.
+"""
+
+import json
+import zlib
+from functools import lru_cache
+
+from src.services.artifact_store import get_store, parse_uri
+from src.services.feature_schema import FeatureValidationError, compile_schema, model_schema
+
+STEP_TYPES = ('impute', 'standardize', 'bucketize', 'hash_encode')
+IMPUTE_STRATEGIES = ('mean', 'median', 'most_frequent', 'constant')
+PIPELINE_FORMAT = 1
+
+class PipelineError(ValueError):
+    """The preprocessing spec is invalid or cannot be fitted."""
+
+def _is_missing(values):
+    """Boolean mask of missing entries in a float or object column."""
+    import numpy as np
+    if values.dtype == object:
+        # Element-wise comparisons on object arrays; NaN is the only value != itself
+        return np.asarray((values == None) | (values != values), dtype=bool)  # noqa: E711
+    return np.isnan(values)
+
+def _stable_hash(value, buckets):
+    # crc32 instead of hash(): str hashing is salted per process
+    return zlib.crc32(str(value).encode('utf-8')) % buckets
+
+def _numeric(name, column):
+    """Float view of a column; object columns are converted, None becoming NaN."""
+    import numpy as np
+    if column.dtype != object:
+        return column
+    try:
+        return np.array([np.nan if value is None else value for value in column], dtype=np.float64)
+    except (TypeError, ValueError):
+        raise FeatureValidationError([{'field': name, 'error': 'type',
+                                       'message': f"'{name}' must be numeric"}])
+
+def record_columns(records, inputs, categorical=(), schema=None):
+    """Input columns from JSON records.
+
+    With a compiled feature schema the records are validated first and
+    numeric inputs come from its converted matrix; ``categorical`` inputs
+    always keep their raw values.
+    """
+    import numpy as np
+    matrix = schema.to_matrix(records) if schema is not None else None
+    positions = {name: index for index, name in enumerate(schema.names)} if schema is not None else {}
+    columns = {}
+    for name in inputs:
+        values = [record.get(name) for record in records]
+        if name in categorical:
+            columns[name] = np.array(values, dtype=object)
+        elif name in positions:
+            columns[name] = matrix[:, positions[name]]
+        else:
+            columns[name] = _numeric(name, np.array(values, dtype=object))
+    return columns
+
+def _step_columns(step):
+    return step['columns'] if 'columns' in step else [step['column']]
+
+class Pipeline:
+    """Ordered preprocessing steps with their fitted parameters."""
+
+    def __init__(self, inputs, steps):
+        self.inputs = list(inputs)
+        self.steps = steps
+        self.categorical = {step['column'] for step in steps if step['op'] == 'hash_encode'}
+        self.outputs = self._output_names()
+
+    def _output_names(self):
+        names = list(self.inputs)
+        for step in self.steps:
+            if step['op'] == 'hash_encode':
+                index = names.index(step['column'])
+                names[index:index + 1] = [f"{step['column']}#{bucket}" for bucket in range(step['buckets'])]
+        return names
+
+    # Fitting
+
+    @classmethod
+    def fit(cls, spec, columns):
+        """Validate ``spec`` and learn step parameters from training ``columns``."""
+        if not isinstance(spec, dict) or not isinstance(spec.get('steps'), list):
+            raise PipelineError("Preprocessing must be an object with a 'steps' list")
+        inputs = spec.get('inputs') or list(columns)
+        missing = [name for name in inputs if name not in columns]
+        if missing:
+            raise PipelineError(f"Training data has no column(s): {', '.join(missing)}")
+        known = set(inputs)
+        steps = []
+        for raw in spec['steps']:
+            step = cls._validate_step(raw, known)
+            steps.append(step)
+            if step['op'] == 'hash_encode':
+                known.discard(step['column'])
+
+        pipeline = cls(inputs, [])
+        current = {name: columns[name] for name in inputs}
+        for step in steps:
+            fitter = getattr(pipeline, f"_fit_{step['op']}")
+            fitter(step, current)
+            current = pipeline._apply(step, current)
+        pipeline.steps = steps
+        pipeline.categorical = {step['column'] for step in steps if step['op'] == 'hash_encode'}
+        pipeline.outputs = pipeline._output_names()
+        for name in pipeline.outputs:
+            if current[name].dtype == object:
+                try:
+                    _numeric(name, current[name])
+                except FeatureValidationError:
+                    raise PipelineError(f"Column {name} is not numeric; hash_encode it or fix the data")
+        return pipeline
+
+    @staticmethod
+    def _validate_step(raw, known):
+        if not isinstance(raw, dict) or raw.get('op') not in STEP_TYPES:
+            raise PipelineError(f"Each step needs an 'op' in {', '.join(STEP_TYPES)}")
+        step = dict(raw)
+        if step['op'] in ('bucketize', 'hash_encode'):
+            if not isinstance(step.get('column'), str):
+                raise PipelineError(f"{step['op']} needs a 'column'")
+        elif not isinstance(step.get('columns'), list) or not step['columns']:
+            raise PipelineError(f"{step['op']} needs a non-empty 'columns' list")
+        unknown = [name for name in _step_columns(step) if name not in known]
+        if unknown:
+            raise PipelineError(f"{step['op']} references unknown column(s): {', '.join(unknown)}")
+        if step['op'] == 'impute' and step.setdefault('strategy', 'mean') not in IMPUTE_STRATEGIES:
+            raise PipelineError(f"Unknown impute strategy: {step['strategy']}")
+        if step['op'] == 'impute' and step['strategy'] == 'constant' and 'value' not in step:
+            raise PipelineError("Constant imputation needs a 'value'")
+        if step['op'] == 'bucketize' and 'boundaries' not in step:
+            bins = step.get('bins')
+            if not isinstance(bins, int) or bins < 2:
+                raise PipelineError("bucketize needs 'boundaries' or an integer 'bins' >= 2")
+        if step['op'] == 'hash_encode':
+            buckets = step.setdefault('buckets', 16)
+            if not isinstance(buckets, int) or buckets < 1:
+                raise PipelineError("hash_encode 'buckets' must be a positive integer")
+        return step
+
+    def _fit_impute(self, step, columns):
+        import numpy as np
+        values = {}
+        for name in step['columns']:
+            column = columns[name]
+            present = column[~_is_missing(column)]
+            if step['strategy'] == 'constant':
+                values[name] = step['value']
+            elif not len(present):
+                raise PipelineError(f"Cannot impute {name}: no training values")
+            elif step['strategy'] == 'most_frequent':
+                uniques, counts = np.unique(present.astype(str) if column.dtype == object else present,
+                                            return_counts=True)
+                value = uniques[counts.argmax()]
+                values[name] = str(value) if column.dtype == object else float(value)
+            elif column.dtype == object:
+                raise PipelineError(f"Cannot compute {step['strategy']} of categorical column {name}")
+            else:
+                values[name] = float(np.mean(present) if step['strategy'] == 'mean' else np.median(present))
+        step['values'] = values
+
+    def _fit_standardize(self, step, columns):
+        import numpy as np
+        step['mean'], step['std'] = {}, {}
+        for name in step['columns']:
+            column = _numeric(name, columns[name])
+            if np.isnan(column).all():
+                raise PipelineError(f"Cannot standardize {name}: no training values")
+            std = float(np.nanstd(column))
+            step['mean'][name] = float(np.nanmean(column))
+            step['std'][name] = std if std > 0 else 1.0
+
+    def _fit_bucketize(self, step, columns):
+        import numpy as np
+        if 'boundaries' in step:
+            step['boundaries'] = sorted(float(value) for value in step['boundaries'])
+            return
+        column = _numeric(step['column'], columns[step['column']])
+        fractions = np.linspace(0, 1, step['bins'] + 1)[1:-1]
+        step['boundaries'] = np.unique(np.nanquantile(column, fractions)).tolist()
+
+    def _fit_hash_encode(self, step, columns):
+        pass
+
+    # Transforms
+
+    def _apply(self, step, columns):
+        import numpy as np
+        columns = dict(columns)
+        op = step['op']
+        if op == 'impute':
+            for name, value in step['values'].items():
+                column = columns[name]
+                mask = _is_missing(column)
+                if mask.any():
+                    column = column.copy()
+                    column[mask] = value
+                    columns[name] = column
+        elif op == 'standardize':
+            for name in step['columns']:
+                column = _numeric(name, columns[name])
+                columns[name] = (column - step['mean'][name]) / step['std'][name]
+        elif op == 'bucketize':
+            name = step['column']
+            column = _numeric(name, columns[name])
+            buckets = np.searchsorted(np.asarray(step['boundaries']), column, side='right').astype(np.float64)
+            buckets[np.isnan(column)] = np.nan
+            columns[name] = buckets
+        elif op == 'hash_encode':
+            name = step['column']
+            column = columns.pop(name)
+            present = ~_is_missing(column)
+            encoded = np.zeros((len(column), step['buckets']), dtype=np.float64)
+            if present.any():
+                # Hash each distinct value once, then scatter by inverse index
+                uniques, inverse = np.unique(column[present].astype(str), return_inverse=True)
+                codes = np.array([_stable_hash(value, step['buckets']) for value in uniques], dtype=np.intp)
+                encoded[np.flatnonzero(present), codes[inverse]] = 1.0
+            for bucket in range(step['buckets']):
+                columns[f"{name}#{bucket}"] = encoded[:, bucket]
+        return columns
+
+    def transform(self, columns):
+        """Apply every step to ``{name: 1-D array}``; returns a C-contiguous (n, k) float64 matrix."""
+        import numpy as np
+        current = {name: columns[name] for name in self.inputs}
+        for step in self.steps:
+            current = self._apply(step, current)
+        return np.ascontiguousarray(np.column_stack(
+            [_numeric(name, current[name]) for name in self.outputs]
+        ), dtype=np.float64)
+
+    def transform_records(self, records, schema=None):
+        return self.transform(record_columns(records, self.inputs, self.categorical, schema))
+
+    # Serialization
+
+    def to_dict(self):
+        return {'format': PIPELINE_FORMAT, 'inputs': self.inputs, 'steps': self.steps,
+                'outputs': self.outputs}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != PIPELINE_FORMAT:
+            raise PipelineError(f"Unsupported pipeline format: {data.get('format')}")
+        return cls(data['inputs'], data['steps'])
+
+def training_columns(db, fit, inputs=None, categorical=(), schema=None):
+    """Load training columns for fitting from inline records or a registered dataset."""
+    if not isinstance(fit, dict):
+        raise PipelineError("Preprocessing needs 'fit' data: records or dataset_version_id")
+    if 'records' in fit:
+        records = fit['records']
+        if not isinstance(records, list) or not records or not isinstance(records[0], dict):
+            raise PipelineError("fit.records must be a non-empty list of objects")
+        try:
+            return record_columns(records, inputs or list(records[0]), categorical, schema)
+        except FeatureValidationError as e:
+            raise PipelineError(f"Invalid fit records: {'; '.join(error['message'] for error in e.errors)}")
+    if 'dataset_version_id' in fit:
+        return _dataset_columns(db, fit['dataset_version_id'], inputs)
+    raise PipelineError("Preprocessing needs 'fit' data: records or dataset_version_id")
+
+def _dataset_columns(db, dataset_version_id, inputs):
+    import numpy as np
+    import pandas as pd
+    from src.models.model_registry import DatasetVersion
+    from src.services.dataset_profiler import detect_format
+
+    dataset = db.get(DatasetVersion, dataset_version_id)
+    if dataset is None:
+        raise PipelineError(f"Dataset version not found: {dataset_version_id}")
+    sha256 = parse_uri(dataset.file_path)
+    path = get_store().blob_path(sha256) if sha256 else dataset.file_path
+    file_format = dataset.format or detect_format(path)
+    if file_format == 'parquet':
+        frame = pd.read_parquet(path, columns=inputs)
+    else:
+        frame = pd.read_csv(path, usecols=inputs)
+    columns = {}
+    for name in frame.columns:
+        series = frame[name]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            columns[name] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            columns[name] = series.astype(object).where(series.notna(), None).to_numpy()
+    return columns
+
+def fit_pipeline(db, spec, feature_schema=None):
+    """Fit a spec; inputs default to the feature schema's fields."""
+    if not isinstance(spec, dict) or not isinstance(spec.get('steps'), list):
+        raise PipelineError("Preprocessing must be an object with a 'steps' list")
+    spec = dict(spec)
+    schema = compile_schema(feature_schema) if feature_schema else None
+    if not spec.get('inputs') and schema is not None:
+        spec['inputs'] = schema.names
+    categorical = {step.get('column') for step in spec['steps']
+                   if isinstance(step, dict) and step.get('op') == 'hash_encode'}
+    columns = training_columns(db, spec.get('fit'), spec.get('inputs'), categorical, schema)
+    return Pipeline.fit({key: value for key, value in spec.items() if key != 'fit'}, columns)
+
+def save_pipeline(pipeline, store=None):
+    """Store a fitted pipeline as a JSON blob; returns its ``cas://`` URI."""
+    payload = json.dumps(pipeline.to_dict(), sort_keys=True).encode('utf-8')
+    return (store or get_store()).import_bytes(payload)['uri']
+
+@lru_cache(maxsize=128)
+def load_pipeline(uri):
+    """Fitted pipeline by URI; blobs are immutable so it is cached for the process."""
+    sha256 = parse_uri(uri)
+    if sha256 is None:
+        raise PipelineError(f"Preprocessing path is not an artifact URI: {uri}")
+    with open(get_store().blob_path(sha256), 'rb') as f:
+        return Pipeline.from_dict(json.load(f))
+
+def prepare_features(model, records):
+    """Feature matrix for a model version dict, shared by online and batch scoring.
+
+    Returns None when the model has neither a feature schema nor a
+    preprocessing pipeline, in which case callers pass features through.
+    Raises FeatureValidationError for invalid records.
+    """
+    schema = model_schema(model)
+    if model.get('preprocessing_path'):
+        return load_pipeline(model['preprocessing_path']).transform_records(records, schema)
+    if schema is not None:
+        return schema.to_matrix(records)
+    return None
@@ -0,0 +1,156 @@
+"""
+Transactional model promotion.
+
+``promote`` moves a model version to a stage in one transaction:
+
+1. An idempotency key seen before returns the recorded event instead of
+   promoting again (a key reused for a different request is a conflict).
+2. The model name is locked by updating its ``model_stage_locks`` row,
+   which takes a row lock on PostgreSQL and the write lock on SQLite, so
+   promotions of one model serialize across workers while different
+   models proceed independently. Within a process a per-name mutex keeps
+   threads from queuing on the database.
+3. Other versions holding an exclusive stage are archived.
+4. A ``promotion_events`` row is written, plus a ``NOTIFY`` on
+   PostgreSQL, and the event is published to local subscribers after
+   commit.
+"""
+
+import json
+import threading
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.model_registry import ModelStageLock, ModelVersion, PromotionEvent
+from src.services.registry_events import NOTIFY_CHANNEL, registry_events
+
+STAGES = ('development', 'staging', 'production', 'archived')
+EXCLUSIVE_STAGES = ('production',)
+
+class PromotionError(Exception):
+    """The promotion request is invalid."""
+
+class PromotionConflict(PromotionError):
+    """The idempotency key was already used for a different promotion."""
+
+_name_locks = {}
+_name_locks_guard = threading.Lock()
+
+def _name_lock(name):
+    with _name_locks_guard:
+        lock = _name_locks.get(name)
+        if lock is None:
+            lock = _name_locks[name] = threading.Lock()
+        return lock
+
+def _lock_model_name(db, name):
+    """Take the database-level lock for ``name`` for the rest of the transaction."""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+    if dialect_insert is not None:
+        db.execute(dialect_insert(ModelStageLock).values(name=name, version=0)
+                   .on_conflict_do_nothing(index_elements=['name']))
+    elif db.get(ModelStageLock, name) is None:
+        with db.begin_nested():
+            db.add(ModelStageLock(name=name, version=0))
+    db.execute(update(ModelStageLock).where(ModelStageLock.name == name)
+               .values(version=ModelStageLock.version + 1, updated_at=datetime.utcnow()))
+
+def _replay(db, idempotency_key, model_id, stage):
+    event = db.scalars(select(PromotionEvent)
+                       .where(PromotionEvent.idempotency_key == idempotency_key)).first()
+    if event is None:
+        return None
+    if event.model_version_id != model_id or event.to_stage != stage:
+        raise PromotionConflict(f"Idempotency key {idempotency_key!r} was used for another promotion")
+    return event
+
+def promote(db, model_id, stage='production', idempotency_key=None, requested_by=None, reason=None):
+    """Move a model version to ``stage``; returns ``(model, event, replayed)`` as dicts.
+
+    Returns None when the model does not exist.
+    """
+    if stage not in STAGES:
+        raise PromotionError(f"Unknown stage: {stage}")
+    model = db.get(ModelVersion, model_id)
+    if model is None:
+        return None
+    if idempotency_key:
+        event = _replay(db, idempotency_key, model_id, stage)
+        if event is not None:
+            return model.to_dict(), event.to_dict(), True
+
+    with _name_lock(model.name):
+        try:
+            _lock_model_name(db, model.name)
+            # Re-read under the lock: a concurrent promotion may have committed meanwhile
+            if idempotency_key:
+                event = _replay(db, idempotency_key, model_id, stage)
+                if event is not None:
+                    db.rollback()
+                    return db.get(ModelVersion, model_id).to_dict(), event.to_dict(), True
+            model = db.scalars(select(ModelVersion).where(ModelVersion.id == model_id)
+                               .execution_options(populate_existing=True)).one()
+            archived = []
+            if stage in EXCLUSIVE_STAGES:
+                holders = db.scalars(select(ModelVersion)
+                                     .where(ModelVersion.name == model.name, ModelVersion.stage == stage,
+                                            ModelVersion.id != model.id)
+                                     .execution_options(populate_existing=True)).all()
+                for holder in holders:
+                    holder.stage = 'archived'
+                    holder.status = 'archived'
+                    archived.append(holder.id)
+
+            from_stage = model.stage
+            model.stage = stage
+            if stage == 'production':
+                model.status = 'deployed'
+                model.deployed_at = datetime.utcnow()
+            elif stage == 'archived':
+                model.status = 'archived'
+
+            event = PromotionEvent(
+                model_name=model.name,
+                model_version_id=model.id,
+                version=model.version,
+                from_stage=from_stage,
+                to_stage=stage,
+                archived_version_ids=archived,
+                idempotency_key=idempotency_key,
+                requested_by=requested_by,
+                reason=reason
+            )
+            db.add(event)
+            db.flush()
+            payload = event.to_dict()
+            if db.get_bind().dialect.name == 'postgresql':
+                db.execute(select(func.pg_notify(NOTIFY_CHANNEL, json.dumps(payload))))
+            db.commit()
+        except IntegrityError:
+            # Same idempotency key committed by a worker without our in-process lock
+            db.rollback()
+            event = _replay(db, idempotency_key, model_id, stage) if idempotency_key else None
+            if event is None:
+                raise
+            return db.get(ModelVersion, model_id).to_dict(), event.to_dict(), True
+        except Exception:
+            db.rollback()
+            raise
+
+    registry_events.publish(payload)
+    return model.to_dict(), payload, False
+
+def promotion_history(db, name=None, limit=100):
+    """Newest promotion events first, optionally for one model name."""
+    query = select(PromotionEvent).order_by(PromotionEvent.id.desc()).limit(limit)
+    if name:
+        query = query.where(PromotionEvent.model_name == name)
+    return [event.to_dict() for event in db.scalars(query)]
@@ -0,0 +1,203 @@
+"""
+In-memory read-through cache of the model registry.
+
+Model versions are cached as serialized dicts by id, by (name, version)
+and as the list of production models per name. Any flush that writes a
+ModelVersion or Deployment bumps a counter row in ``registry_versions``
+in the same transaction and clears this process's cache on commit; other
+processes notice the new counter value on their next staleness check (at
+most once per ``check_interval`` seconds, a single primary-key read) and
+drop their entries. The session listeners doing the bump are installed by
+``register_listeners()`` at server startup.
+"""
+
+import threading
+import time
+from itertools import chain
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.model_registry import Deployment, ModelVersion, RegistryVersion
+
+COUNTER_NAME = 'model_registry'
+WATCHED_MODELS = (ModelVersion, Deployment)
+
+_caches = []
+
+def current_version(db):
+    return db.execute(
+        select(RegistryVersion.version).where(RegistryVersion.name == COUNTER_NAME)
+    ).scalar()
+
+def bump_version(connection):
+    """Increment the registry change counter, creating it on first use."""
+    result = connection.execute(
+        update(RegistryVersion)
+        .where(RegistryVersion.name == COUNTER_NAME)
+        .values(version=RegistryVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(RegistryVersion).values(name=COUNTER_NAME, version=1))
+
+def _registry_flushed(session, flush_context):
+    if any(isinstance(obj, WATCHED_MODELS)
+           for obj in chain(session.new, session.dirty, session.deleted)):
+        bump_version(session.connection())
+        session.info['registry_changed'] = True
+
+def _registry_committed(session):
+    if session.info.pop('registry_changed', False):
+        for cache in _caches:
+            cache.invalidate()
+
+def _registry_rolled_back(session):
+    session.info.pop('registry_changed', None)
+
+_LISTENERS = (('after_flush', _registry_flushed), ('after_commit', _registry_committed),
+              ('after_rollback', _registry_rolled_back))
+
+def register_listeners():
+    """Bump the change counter on registry writes; safe to call more than once.
+
+    Listeners attach to ``Session``, so they also cover the sync sessions
+    behind ``AsyncSession``.
+    """
+    for identifier, listener in _LISTENERS:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+class RegistryCache:
+    """Read-through cache of ModelVersion lookups.
+
+    Every lookup takes the caller's session so misses and staleness checks
+    read through it; cached values are the ``to_dict()`` output and must be
+    treated as read-only.
+    """
+
+    def __init__(self, check_interval=1.0):
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._reset(None)
+        _caches.append(self)
+
+    def _reset(self, version):
+        self._by_id = {}
+        self._by_name_version = {}
+        self._production = {}
+        self._version = version
+        self._checked_at = time.monotonic()
+        self._generation += 1
+
+    def _store(self, generation, model):
+        if generation == self._generation:
+            self._by_id[model['id']] = model
+            self._by_name_version[(model['name'], model['version'])] = model
+
+    def warm(self, db):
+        """Load every model version; called at startup."""
+        version = current_version(db)
+        if version is None:
+            try:
+                db.execute(insert(RegistryVersion).values(name=COUNTER_NAME, version=0))
+                db.commit()
+            except IntegrityError:
+                # Another worker created the counter first
+                db.rollback()
+            version = current_version(db)
+        models = [model.to_dict() for model in db.query(ModelVersion)]
+        with self._lock:
+            self._reset(version)
+            production = {}
+            for model in models:
+                self._store(self._generation, model)
+                if model['stage'] == 'production':
+                    production.setdefault(model['name'], []).append(model)
+            self._production = {name: tuple(rows) for name, rows in production.items()}
+            self._production[None] = tuple(chain.from_iterable(self._production.values()))
+        return len(models)
+
+    def invalidate(self):
+        with self._lock:
+            self._reset(None)
+
+    def _validate(self, db):
+        if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        version = current_version(db)
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            else:
+                self._checked_at = time.monotonic()
+
+    def _lookup(self, db, mapping, key, query):
+        self._validate(db)
+        value = getattr(self, mapping).get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        generation = self._generation
+        model = db.scalars(query).first()
+        if model is None:
+            return None
+        value = model.to_dict()
+        with self._lock:
+            self._store(generation, value)
+        return value
+
+    def get(self, db, model_id):
+        """Model version by id, or None."""
+        return self._lookup(db, '_by_id', model_id,
+                            select(ModelVersion).where(ModelVersion.id == model_id))
+
+    def get_by_name_version(self, db, name, version):
+        """Model version by (name, version), or None."""
+        return self._lookup(db, '_by_name_version', (name, version),
+                            select(ModelVersion).where(ModelVersion.name == name,
+                                                       ModelVersion.version == version))
+
+    def production(self, db, name=None):
+        """Production model versions, optionally for one model name."""
+        self._validate(db)
+        models = self._production.get(name)
+        if models is not None:
+            self.hits += 1
+            return models
+        self.misses += 1
+        generation = self._generation
+        query = select(ModelVersion).where(ModelVersion.stage == 'production')
+        if name is not None:
+            query = query.where(ModelVersion.name == name)
+        models = tuple(model.to_dict() for model in db.scalars(query.order_by(ModelVersion.id)))
+        with self._lock:
+            if generation == self._generation:
+                self._production[name] = models
+                for model in models:
+                    self._store(generation, model)
+        return models
+
+    def stats(self):
+        return {'version': self._version, 'entries': len(self._by_id),
+                'hits': self.hits, 'misses': self.misses}
+
+    def prometheus(self):
+        """Lookup counts and size in the Prometheus text exposition format."""
+        stats = self.stats()
+        return '\n'.join([
+            '# HELP mlops_registry_cache_lookups_total Model registry cache lookups by result.',
+            '# TYPE mlops_registry_cache_lookups_total counter',
+            f'mlops_registry_cache_lookups_total{{result="hit"}} {stats["hits"]}',
+            f'mlops_registry_cache_lookups_total{{result="miss"}} {stats["misses"]}',
+            '# HELP mlops_registry_cache_entries Model versions held in the registry cache.',
+            '# TYPE mlops_registry_cache_entries gauge',
+            f'mlops_registry_cache_entries {stats["entries"]}',
+        ]) + '\n'
+
+# Process-wide cache used by the API
+registry_cache = RegistryCache()
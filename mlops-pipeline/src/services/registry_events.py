@@ -0,0 +1,132 @@
+"""
+Registry change notifications.
+
+``registry_events`` is a process-wide publish/subscribe hub for stage
+changes. The promotion workflow publishes each committed event to local
+subscribers immediately. Other processes learn about it from one feed per
+process: on PostgreSQL a ``LISTEN`` on the channel the promotion
+transaction ``NOTIFY``s (delivered at commit); on other databases a
+watcher tailing ``promotion_events`` by primary key. Subscribers (the
+registry cache, the event stream endpoint) are callbacks and never poll.
+"""
+
+import json
+import logging
+import select as select_module
+import threading
+from collections import deque
+
+from sqlalchemy import select
+
+from src.models.model_registry import PromotionEvent
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'model_registry'
+
+class RegistryEvents:
+    """Fan-out of promotion events to in-process subscribers."""
+
+    def __init__(self, remember=1024):
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._seen = deque(maxlen=remember)
+        self._seen_set = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """Call ``callback(event_dict)`` for every event; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _first_sighting(self, event_id):
+        with self._lock:
+            if event_id in self._seen_set:
+                return False
+            if len(self._seen) == self._seen.maxlen:
+                self._seen_set.discard(self._seen[0])
+            self._seen.append(event_id)
+            self._seen_set.add(event_id)
+            return True
+
+    def publish(self, event):
+        """Deliver an event once, however many feeds report it."""
+        if not self._first_sighting(event['id']):
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Registry event subscriber failed")
+
+    # Cross-process feeds
+
+    def _watch_table(self, session_factory, interval):
+        last_id = None
+        while not self._stop.is_set():
+            db = session_factory()
+            try:
+                if last_id is None:
+                    last_id = db.execute(select(PromotionEvent.id).order_by(PromotionEvent.id.desc())
+                                         .limit(1)).scalar() or 0
+                events = db.scalars(select(PromotionEvent).where(PromotionEvent.id > last_id)
+                                    .order_by(PromotionEvent.id)).all()
+                for event in events:
+                    last_id = event.id
+                    self.publish(event.to_dict())
+            except Exception:
+                db.rollback()
+                logger.exception("Promotion event watcher failed")
+            finally:
+                db.close()
+            self._stop.wait(interval)
+
+    def _listen_postgres(self, engine, interval):
+        while not self._stop.is_set():
+            connection = engine.raw_connection()
+            try:
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while not self._stop.is_set():
+                    if select_module.select([dbapi_connection], [], [], interval) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notify = dbapi_connection.notifies.pop(0)
+                        self.publish(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Registry LISTEN connection failed; reconnecting")
+                self._stop.wait(interval)
+            finally:
+                connection.close()
+
+    def start(self, engine, session_factory, interval=1.0):
+        """Start this process's feed of events committed by other processes."""
+        if self._thread is None:
+            if engine.dialect.name == 'postgresql':
+                target, args = self._listen_postgres, (engine, interval)
+            else:
+                target, args = self._watch_table, (session_factory, interval)
+            self._thread = threading.Thread(target=target, args=args, name='registry-events', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+# Process-wide hub used by the API
+registry_events = RegistryEvents()
@@ -0,0 +1,353 @@
+"""
+Snapshot export and import of registry and monitoring state.
+
+A snapshot is an uncompressed tar archive holding ``manifest.json`` and
+one gzip-compressed JSON-lines file per table (``tables/<name>.jsonl.gz``,
+one JSON array per row in manifest column order), plus optionally the
+referenced artifact blobs under ``artifacts/<sha256>``. Export streams
+each table with a server-side cursor, so memory stays flat, and the
+archive is assembled from the finished parts. Time-series tables are
+limited to the last ``days`` days.
+
+All tables are read from one database snapshot, so an export of a live
+database has matching foreign keys. On PostgreSQL a REPEATABLE READ
+snapshot is exported to one connection per worker thread and tables
+compress in parallel. Elsewhere the tables are read one after another
+inside a single transaction; on SQLite that is about as fast, since
+encoding holds the GIL, but outside WAL mode writers wait for the export
+to finish. Partition files cannot share that snapshot, so their rows are
+cut off at the time the snapshot was taken.
+
+Import reads the archive as a stream, drops the secondary indexes of the
+tables it loads, inserts rows in batches with ``executemany`` (one
+transaction per table, parents before children) and rebuilds the indexes
+once at the end.
+"""
+
+import gzip
+import json
+import os
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Date, DateTime, delete, func, insert, select
+
+from src.db import reset_sequences
+from src.models.model_registry import Base
+from src.services.artifact_store import parse_uri
+from src.services.partitions import PARTITIONED_MODELS
+from src.services.registry_cache import bump_version
+
+SNAPSHOT_FORMAT = 1
+BATCH_SIZE = 5000
+MANIFEST_NAME = 'manifest.json'
+
+TABLE_GROUPS = {
+    'registry': ('model_versions', 'dataset_versions', 'experiments', 'experiment_metrics',
+                 'experiment_scalars', 'deployments', 'promotion_events', 'model_stage_locks'),
+    'monitoring': ('model_metrics', 'drift_detection', 'alerts', 'model_health'),
+    'predictions': ('prediction_logs',),
+}
+DEFAULT_GROUPS = ('registry', 'monitoring')
+
+# Tables limited to the export window, by their time column
+TIME_COLUMNS = {
+    'model_metrics': 'timestamp',
+    'drift_detection': 'timestamp',
+    'alerts': 'triggered_at',
+    'model_health': 'timestamp',
+    'prediction_logs': 'timestamp',
+}
+
+ARTIFACT_COLUMNS = {
+    'model_versions': ('model_path', 'artifacts_path', 'preprocessing_path'),
+    'dataset_versions': ('file_path',),
+}
+
+class SnapshotError(Exception):
+    """The snapshot cannot be written or loaded."""
+
+def resolve_tables(names=None):
+    """Table objects for table or group names, parents before children."""
+    # Import every model module so all tables are registered on Base.metadata
+    from src.models import model_registry, monitoring  # noqa: F401
+    wanted = set()
+    for name in names or DEFAULT_GROUPS:
+        if name in TABLE_GROUPS:
+            wanted.update(TABLE_GROUPS[name])
+        elif name in Base.metadata.tables:
+            wanted.add(name)
+        else:
+            raise SnapshotError(f"Unknown table or group: {name}")
+    return [table for table in Base.metadata.sorted_tables if table.name in wanted]
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+# Export
+
+def _select(table, since, until=None):
+    statement = select(table).order_by(*table.primary_key.columns)
+    if table.name in TIME_COLUMNS:
+        if since is not None:
+            statement = statement.where(table.c[TIME_COLUMNS[table.name]] >= since)
+        if until is not None:
+            statement = statement.where(table.c[TIME_COLUMNS[table.name]] <= until)
+    return statement
+
+@contextmanager
+def _snapshot(engine):
+    """Yield ``(connect, parallel)``; connections from ``connect()`` all read one snapshot."""
+    with engine.connect() as leader:
+        if leader.dialect.name == 'postgresql':
+            leader.execution_options(isolation_level='REPEATABLE READ')
+            snapshot_id = leader.execute(select(func.pg_export_snapshot())).scalar()
+
+            @contextmanager
+            def connect():
+                with engine.connect() as conn:
+                    conn.execution_options(isolation_level='REPEATABLE READ')
+                    conn.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+                    yield conn
+
+            # The exported snapshot stays importable while the leader's transaction is open
+            yield connect, True
+            return
+        if leader.dialect.name == 'sqlite':
+            # pysqlite only opens transactions for writes; the first read pins the snapshot
+            leader.exec_driver_sql('BEGIN')
+            leader.exec_driver_sql('SELECT COUNT(*) FROM sqlite_master')
+
+        @contextmanager
+        def shared():
+            yield leader
+
+        yield shared, False
+
+def _table_rows(table, since, until, connect, partition_store):
+    """Stream rows of ``table`` from the snapshot or, if partitioned, from its partitions."""
+    if partition_store is not None and table.name in PARTITIONED_MODELS:
+        statement = _select(table, since, until)
+        for key in partition_store.partitions(table.name, start=since):
+            with partition_store.engine(table.name, key).connect() as conn:
+                yield from conn.execution_options(yield_per=BATCH_SIZE).execute(statement)
+        return
+    with connect() as conn:
+        yield from conn.execution_options(yield_per=BATCH_SIZE).execute(_select(table, since))
+
+def _write_table(table, since, until, directory, connect, partition_store, compresslevel):
+    path = os.path.join(directory, f"{table.name}.jsonl.gz")
+    rows = 0
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=compresslevel) as f:
+        for row in _table_rows(table, since, until, connect, partition_store):
+            f.write(json.dumps(list(row), default=_json_default, separators=(',', ':')))
+            f.write('\n')
+            rows += 1
+    return {'name': table.name, 'file': f"tables/{table.name}.jsonl.gz", 'rows': rows,
+            'columns': [column.name for column in table.columns], 'bytes': os.path.getsize(path),
+            # Partition files number their rows independently, so these ids can repeat
+            'partitioned': partition_store is not None and table.name in PARTITIONED_MODELS}
+
+def _referenced_artifacts(tables, connect):
+    hashes = set()
+    with connect() as conn:
+        for table in tables:
+            for column in ARTIFACT_COLUMNS.get(table.name, ()):
+                for (uri,) in conn.execute(select(table.c[column]).where(table.c[column].like('cas://%'))):
+                    sha256 = parse_uri(uri)
+                    if sha256:
+                        hashes.add(sha256)
+    return sorted(hashes)
+
+def export_snapshot(output_path, tables=None, days=7, engine=None, partition_store=None, workers=4,
+                    include_artifacts=False, artifact_store=None, compresslevel=6):
+    """Write a snapshot archive of ``tables`` (names or groups); returns its manifest."""
+    from src.db import engine as default_engine
+    engine = engine or default_engine
+    selected = resolve_tables(tables)
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    output_path = os.path.abspath(output_path)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path)) as tmp:
+        with _snapshot(engine) as (connect, parallel):
+            until = datetime.utcnow()
+            arguments = (since, until, tmp, connect, partition_store, compresslevel)
+            if parallel and workers > 1:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snapshot-export') as pool:
+                    futures = [pool.submit(_write_table, table, *arguments) for table in selected]
+                    entries = [future.result() for future in futures]
+            else:
+                entries = [_write_table(table, *arguments) for table in selected]
+
+            artifacts = []
+            if include_artifacts:
+                if artifact_store is None:
+                    from src.services.artifact_store import get_store
+                    artifact_store = get_store()
+                artifacts = [sha256 for sha256 in _referenced_artifacts(selected, connect)
+                             if artifact_store.exists(sha256)]
+
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'created_at': datetime.utcnow().isoformat(),
+            'days': days,
+            'since': since.isoformat() if since else None,
+            'tables': entries,
+            'artifacts': [{'sha256': sha256, 'size': artifact_store.size(sha256)} for sha256 in artifacts],
+        }
+        manifest_path = os.path.join(tmp, MANIFEST_NAME)
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        # Manifest first, so import can plan before reading any table
+        partial_path = output_path + '.part'
+        with tarfile.open(partial_path, 'w') as tar:
+            tar.add(manifest_path, arcname=MANIFEST_NAME)
+            for entry in entries:
+                tar.add(os.path.join(tmp, os.path.basename(entry['file'])), arcname=entry['file'])
+            for sha256 in artifacts:
+                tar.add(artifact_store.blob_path(sha256), arcname=f"artifacts/{sha256}")
+        os.replace(partial_path, output_path)
+    return manifest
+
+# Import
+
+def _converters(table, columns):
+    """Per-column decoders from JSON values back to Python values."""
+    converters = []
+    for name in columns:
+        column = table.c.get(name)
+        if column is None:
+            converters.append(None)
+        elif isinstance(column.type, DateTime):
+            converters.append(lambda value: datetime.fromisoformat(value) if value is not None else None)
+        elif isinstance(column.type, Date):
+            converters.append(lambda value: date.fromisoformat(value) if value is not None else None)
+        else:
+            converters.append(lambda value: value)
+    return converters
+
+def _read_batches(fileobj, table, columns, batch_size, skip=()):
+    # Columns the target table no longer has are skipped
+    keep = [(index, name, convert) for index, (name, convert)
+            in enumerate(zip(columns, _converters(table, columns)))
+            if convert is not None and name not in skip]
+    batch = []
+    with gzip.open(fileobj, 'rt', encoding='utf-8') as f:
+        for line in f:
+            values = json.loads(line)
+            batch.append({name: convert(values[index]) for index, name, convert in keep})
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+def _load_table(conn, table, batches, partition_store):
+    rows = 0
+    statement = insert(table)
+    for batch in batches:
+        if partition_store is not None and table.name in PARTITIONED_MODELS:
+            partition_store.insert(table.name, batch)
+        else:
+            conn.execute(statement, batch)
+        rows += len(batch)
+    return rows
+
+def _clear_tables(engine, tables, partition_store):
+    with engine.begin() as conn:
+        for table in reversed(tables):
+            if partition_store is not None and table.name in PARTITIONED_MODELS:
+                for key in partition_store.partitions(table.name):
+                    partition_store.drop(table.name, key)
+            else:
+                conn.execute(delete(table))
+
+def _check_empty(engine, tables, partition_store):
+    with engine.connect() as conn:
+        for table in tables:
+            if partition_store is not None and table.name in PARTITIONED_MODELS:
+                occupied = bool(partition_store.partitions(table.name))
+            else:
+                occupied = conn.execute(select(func.count()).select_from(table)).scalar() > 0
+            if occupied:
+                raise SnapshotError(f"Table {table.name} is not empty; import with replace to overwrite it")
+
+def _read_manifest(tar, path):
+    first = tar.next()
+    if first is None or first.name != MANIFEST_NAME:
+        raise SnapshotError(f"{path} is not a snapshot archive (no leading {MANIFEST_NAME})")
+    manifest = json.load(tar.extractfile(first))
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"Unsupported snapshot format: {manifest.get('format')}")
+    return manifest
+
+def read_manifest(path):
+    """Manifest of a snapshot archive, without reading the table data."""
+    with tarfile.open(path, 'r|') as tar:
+        return _read_manifest(tar, path)
+
+def import_snapshot(path, engine=None, partition_store=None, tables=None, replace=False,
+                    artifact_store=None, batch_size=BATCH_SIZE):
+    """Load a snapshot into the database; returns rows loaded per table."""
+    from src.cli.migrate import migrate
+    from src.db import engine as default_engine
+    engine = engine or default_engine
+    migrate(engine)
+
+    loaded = {}
+    artifacts = 0
+    dropped_indexes = []
+    with tarfile.open(path, 'r|') as tar:
+        manifest = _read_manifest(tar, path)
+        available = [entry['name'] for entry in manifest['tables']]
+        selected = resolve_tables([name for name in available if name in set(tables or available)])
+        entries = {entry['file']: entry for entry in manifest['tables']
+                   if entry['name'] in {table.name for table in selected}}
+
+        if replace:
+            _clear_tables(engine, selected, partition_store)
+        else:
+            _check_empty(engine, selected, partition_store)
+
+        try:
+            # Secondary indexes are rebuilt once after the load instead of per row
+            for table in selected:
+                for index in table.indexes:
+                    index.drop(bind=engine, checkfirst=True)
+                    dropped_indexes.append(index)
+
+            for member in tar:
+                if member.name in entries:
+                    entry = entries[member.name]
+                    table = Base.metadata.tables[entry['name']]
+                    # Ids read from several partition files may collide; the target assigns new ones
+                    skip = ('id',) if entry.get('partitioned') else ()
+                    batches = _read_batches(tar.extractfile(member), table, entry['columns'], batch_size, skip)
+                    with engine.connect() as conn:
+                        if conn.dialect.name == 'sqlite':
+                            conn.exec_driver_sql('PRAGMA synchronous=OFF')
+                            conn.commit()
+                        with conn.begin():
+                            loaded[table.name] = _load_table(conn, table, batches, partition_store)
+                elif member.name.startswith('artifacts/') and artifact_store is not None:
+                    sha256 = os.path.basename(member.name)
+                    upload = artifact_store.create_upload(size=member.size, sha256=sha256)
+                    if upload is not None:
+                        artifact_store.append(upload['upload_id'], 0, tar.extractfile(member))
+                        artifact_store.complete_upload(upload['upload_id'])
+                    artifacts += 1
+        finally:
+            for index in dropped_indexes:
+                index.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        reset_sequences(conn, selected)
+        # Running API workers drop their registry caches on the next check
+        bump_version(conn)
+    return {'tables': loaded, 'artifacts': artifacts, 'created_at': manifest['created_at']}
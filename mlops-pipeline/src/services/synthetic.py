@@ -0,0 +1,698 @@
+"""
+Seeded synthetic registry and monitoring data for scale testing.
+
+``SyntheticDataGenerator`` first plans a fleet from one seed: model names
+with feature sets, version histories, production and staging deployments
+with heavy-tailed traffic shares and, for some deployments, a drift onset
+after which a subset of features shifts by a few standard deviations.
+Everything else is derived from that plan:
+
+- experiments with per-algorithm hyperparameters, metric curves and their
+  ``experiment_scalars`` rows (one experiment per model version, the rest
+  exploratory runs);
+- prediction logs following a diurnal and weekly traffic cycle, scored by
+  a per-deployment linear model over the drifting features, so predicted
+  classes, confidence and feedback accuracy move with the drift;
+- model metrics per interval and hourly data drift scores (PSI of the
+  shifted features) per deployment;
+- alerts in bursts (one at each drift detection plus random incident
+  bursts, with escalating severity) over a low background rate.
+
+Work is split into chunks that each draw from their own random stream
+keyed by (seed, stream, chunk), with primary keys assigned from the plan,
+so the output does not depend on the number of workers or the order in
+which chunks finish. Chunks are generated on a thread pool and written
+with Core ``executemany`` inserts, in parallel on PostgreSQL and on
+separate partition files, serialized per database file on SQLite.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import JSON, Column, MetaData, Table, Text, func, insert, select
+
+from src.db import reset_sequences
+from src.models.model_registry import Deployment, Experiment, ExperimentMetric, ExperimentScalar, ModelVersion
+from src.models.monitoring import Alert, DriftDetection, ModelMetrics, PredictionLog
+from src.services.leaderboard import scalar_rows
+from src.services.partitions import PARTITIONED_MODELS
+from src.services.registry_cache import bump_version
+
+DEFAULT_CHUNK_SIZE = 50000
+DRIFT_THRESHOLD = 0.2
+_EPOCH = datetime(1970, 1, 1)
+
+# Independent random streams, so adding one table does not reshuffle another
+_PLAN, _EXPERIMENTS, _PREDICTIONS, _METRICS, _DRIFT, _ALERTS = range(6)
+
+DOMAINS = (
+    'fraud_detection', 'churn_prediction', 'credit_risk', 'demand_forecast', 'product_ranking',
+    'anomaly_detection', 'lifetime_value', 'dynamic_pricing', 'lead_scoring', 'claims_triage',
+)
+FEATURE_POOL = (
+    'amount', 'account_age_days', 'balance', 'txn_count_7d', 'avg_txn_amount', 'days_since_last_txn',
+    'session_length', 'items_in_cart', 'discount_rate', 'external_score', 'distance_km',
+    'login_count_30d', 'support_tickets', 'page_views', 'tenure_months', 'credit_utilization',
+    'income_estimate', 'device_risk', 'return_rate', 'basket_value',
+)
+# Per algorithm: framework and hyperparameter ranges (low, high, kind)
+ALGORITHMS = {
+    'random_forest': ('scikit-learn', {'n_estimators': (50, 500, 'int'), 'max_depth': (3, 30, 'int'),
+                                       'min_samples_leaf': (1, 20, 'int')}),
+    'gradient_boosting': ('xgboost', {'n_estimators': (100, 1000, 'int'), 'max_depth': (3, 12, 'int'),
+                                      'learning_rate': (0.01, 0.3, 'log')}),
+    'logistic_regression': ('scikit-learn', {'C': (0.001, 100.0, 'log'), 'max_iter': (100, 1000, 'int')}),
+    'neural_network': ('pytorch', {'hidden_units': (32, 512, 'int'), 'dropout': (0.0, 0.5, 'float'),
+                                   'learning_rate': (0.0001, 0.01, 'log'), 'epochs': (5, 100, 'int')}),
+}
+ALERT_TITLES = {
+    'drift': 'Data drift detected on {name}',
+    'performance': 'Accuracy below threshold on {name}',
+    'error': 'Error rate spike on {name}',
+    'resource': 'High memory usage on {name}',
+}
+SEVERITIES = ('low', 'medium', 'high', 'critical')
+CLIENT_INFOS = (
+    {'sdk': 'python', 'region': 'us-east-1'},
+    {'sdk': 'python', 'region': 'eu-west-1'},
+    {'sdk': 'java', 'region': 'us-east-1'},
+    {'sdk': 'node', 'region': 'ap-southeast-2'},
+)
+
+def _hyperparameters(rng, algorithm):
+    import numpy as np
+    params = {}
+    for key, (low, high, kind) in ALGORITHMS[algorithm][1].items():
+        if kind == 'int':
+            params[key] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[key] = round(float(np.exp(rng.uniform(np.log(low), np.log(high)))), 5)
+        else:
+            params[key] = round(float(rng.uniform(low, high)), 3)
+    return params
+
+def _classification_metrics(rng, accuracy):
+    precision = min(0.999, max(0.3, accuracy + rng.normal(-0.02, 0.03)))
+    recall = min(0.999, max(0.3, accuracy + rng.normal(-0.04, 0.04)))
+    return {
+        'accuracy': round(accuracy, 4),
+        'precision': round(precision, 4),
+        'recall': round(recall, 4),
+        'f1_score': round(2 * precision * recall / (precision + recall), 4),
+        'auc_score': round(min(0.999, accuracy + abs(rng.normal(0.02, 0.01))), 4),
+    }
+
+@lru_cache(maxsize=None)
+def _encoded_json(table):
+    """Copy of ``table`` taking pre-encoded strings for its JSON columns.
+
+    Prediction logs repeat a handful of JSON values per chunk, so encoding
+    them once beats a ``json.dumps`` per value in the JSON bind processor.
+    """
+    return Table(table.name, MetaData(), *(
+        Column(column.name, Text if isinstance(column.type, JSON) else column.type,
+               primary_key=column.primary_key)
+        for column in table.columns
+    ))
+
+def _datetimes(start, seconds):
+    """Datetimes ``start + seconds`` for a float array, without a Python loop per value."""
+    import numpy as np
+    micros = np.round(np.asarray(seconds) * 1e6).astype('timedelta64[us]')
+    return (np.datetime64(start, 'us') + micros).tolist()
+
+class SyntheticDataGenerator:
+    """Plans a fleet from ``seed`` and writes its history ending at ``end``."""
+
+    def __init__(self, engine, seed=0, end=None, days=7, history_days=365, workers=4,
+                 chunk_size=DEFAULT_CHUNK_SIZE, partition_store=None, progress=None):
+        self.engine = engine
+        self.seed = seed
+        self.end = (end or datetime.utcnow()).replace(microsecond=0)
+        self.days = days
+        self.start = self.end - timedelta(days=days)
+        self.history_days = max(history_days, days)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.partition_store = partition_store
+        self.progress = progress
+        self.counts = {}
+        self._window = days * 86400.0
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, stream, *key):
+        import numpy as np
+        return np.random.default_rng([self.seed, stream, *key])
+
+    # Writes
+
+    def _partitioned(self, table):
+        return self.partition_store is not None and table.name in PARTITIONED_MODELS
+
+    def _write_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _write(self, batches):
+        """Insert ``[(table, rows), ...]``; main-database tables share one transaction."""
+        main = [(table, rows) for table, rows in batches if rows and not self._partitioned(table)]
+        if main:
+            # SQLite has a single writer per file: queue here rather than on its busy timeout
+            guard = self._write_lock('main') if self.engine.dialect.name == 'sqlite' else nullcontext()
+            with guard, self.engine.begin() as conn:
+                for table, rows in main:
+                    conn.execute(insert(table), rows)
+        for table, rows in batches:
+            if rows and self._partitioned(table):
+                groups = {}
+                for row in rows:
+                    key = self.partition_store.partition_key(row['timestamp'], row['deployment_id'])
+                    groups.setdefault(key, []).append(row)
+                for key, group in groups.items():
+                    with self._write_lock((table.name, key)), \
+                            self.partition_store.engine(table.name, key).begin() as conn:
+                        conn.execute(insert(table), group)
+        with self._lock:
+            for table, rows in batches:
+                self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+            counts = dict(self.counts)
+        if self.progress is not None:
+            self.progress(counts)
+
+    def _first_id(self, table):
+        """Next free primary key, across partitions for partitioned tables."""
+        statement = select(func.max(table.c.id))
+        with self.engine.connect() as conn:
+            found = [conn.execute(statement).scalar() or 0]
+        if self._partitioned(table):
+            found += [value or 0 for _, value in self.partition_store.fan_out(
+                table.name, lambda db, key: db.execute(statement).scalar())]
+        return max(found) + 1
+
+    # Plan
+
+    def _intensity(self, deployment, seconds):
+        """Relative request rate at ``seconds`` after the window start."""
+        import numpy as np
+        hours = ((self.start - _EPOCH).total_seconds() + seconds) / 3600.0 + deployment['utc_offset']
+        daily = 1.0 + 0.7 * np.sin(2 * np.pi * (hours - 9.0) / 24.0)
+        weekday = (np.floor(hours / 24.0) + 3) % 7  # 1970-01-01 was a Thursday
+        return (daily + 0.05) * np.where(weekday >= 5, 0.6, 1.0)
+
+    def _drift_ramp(self, deployment, seconds):
+        """Fraction of the full feature shift reached at ``seconds`` (0 before onset)."""
+        import numpy as np
+        if deployment['drift_onset'] is None:
+            return np.zeros(np.shape(seconds))
+        return np.clip((seconds - deployment['drift_onset']) / deployment['drift_ramp'], 0.0, 1.0)
+
+    def plan(self, models=2000, names=100):
+        """Model versions and deployments; returns their rows."""
+        import numpy as np
+        rng = self._rng(_PLAN)
+        names = max(1, min(names, models))
+        model_id = self._first_id(ModelVersion.__table__)
+        deployment_id = self._first_id(Deployment.__table__)
+        history = self.history_days * 86400.0
+
+        # Version counts per name are heavy-tailed: a few models iterate constantly
+        shares = rng.pareto(1.5, names) + 0.2
+        versions = 1 + rng.multinomial(models - names, shares / shares.sum())
+
+        self.names, self.features, self.models, self.deployments = [], {}, [], []
+        for index, count in enumerate(versions):
+            name = f"{DOMAINS[index % len(DOMAINS)]}_{index // len(DOMAINS):03d}"
+            features = sorted(rng.choice(FEATURE_POOL, size=int(rng.integers(4, 13)), replace=False).tolist())
+            algorithm = str(rng.choice(list(ALGORITHMS)))
+            quality = rng.uniform(0.72, 0.9)
+            created = np.sort(rng.uniform(0, history - self._window, count))
+            production = rng.random() < 0.7
+            self.names.append(name)
+            self.features[name] = features
+            for number in range(count):
+                latest = number == count - 1
+                if latest and production:
+                    stage, status = 'production', 'deployed'
+                elif latest or (number == count - 2 and rng.random() < 0.3):
+                    stage, status = 'staging', 'validated'
+                elif rng.random() < 0.7:
+                    stage, status = 'archived', 'archived'
+                else:
+                    stage, status = 'development', 'registered'
+                if rng.random() < 0.1:
+                    algorithm = str(rng.choice(list(ALGORITHMS)))
+                accuracy = float(min(0.99, quality + 0.06 * number / count + rng.normal(0, 0.01)))
+                created_at = self.end - timedelta(seconds=float(history - created[number]))
+                model = {
+                    'id': model_id,
+                    'name': name,
+                    'version': f"{1 + number // 10}.{number % 10}.0",
+                    'algorithm': algorithm,
+                    'framework': ALGORITHMS[algorithm][0],
+                    'description': f"Synthetic {name.replace('_', ' ')} model",
+                    'tags': ['synthetic', name.rsplit('_', 1)[0]],
+                    'training_dataset_size': int(rng.integers(10000, 5000000)),
+                    'training_duration': round(float(rng.lognormal(6.5, 1.0)), 1),
+                    'hyperparameters': _hyperparameters(rng, algorithm),
+                    'feature_schema': {'features': [{'name': feature, 'type': 'float'} for feature in features]},
+                    'status': status,
+                    'stage': stage,
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                    'deployed_at': created_at + timedelta(hours=float(rng.uniform(1, 72)))
+                                   if stage == 'production' else None,
+                }
+                model.update(_classification_metrics(rng, accuracy))
+                self.models.append(model)
+                if stage in ('production', 'staging') and latest:
+                    self.deployments.append(self._plan_deployment(rng, deployment_id, model, features))
+                    deployment_id += 1
+                model_id += 1
+        return self.models, self.deployments
+
+    def _plan_deployment(self, rng, deployment_id, model, features):
+        import numpy as np
+        environment = 'production' if model['stage'] == 'production' else 'staging'
+        width = len(features)
+        drifting = rng.random() < 0.5
+        shift = np.zeros(width)
+        if drifting:
+            moved = rng.choice(width, size=int(rng.integers(1, max(2, width // 2) + 1)), replace=False)
+            shift[moved] = rng.choice([-1.0, 1.0], len(moved)) * rng.uniform(0.5, 2.5, len(moved))
+        return {
+            'id': deployment_id,
+            'model': model,
+            'features': features,
+            'utc_offset': int(rng.integers(-8, 10)),
+            'traffic': float(rng.pareto(1.2) + 0.05) * (1.0 if environment == 'production' else 0.1),
+            'mean': rng.normal(50.0, 20.0, width),
+            'scale': rng.lognormal(1.5, 0.8, width),
+            'weights': rng.normal(0.0, 1.0, width) / np.sqrt(width),
+            'bias': float(rng.normal(-0.5, 0.5)),
+            'shift': shift,
+            'drift_onset': float(rng.uniform(0.2, 0.8) * self._window) if drifting else None,
+            'drift_ramp': float(rng.uniform(6, 48) * 3600),
+            'degradation': float(rng.uniform(0.05, 0.2)) if drifting else 0.0,
+            'latency': float(rng.uniform(15, 120)),
+            'row': {
+                'id': deployment_id,
+                'deployment_id': f"{model['name']}-{environment}-{deployment_id}"[:50],
+                'name': f"{model['name'].replace('_', ' ').title()} {environment.title()}",
+                'description': f"Synthetic {environment} deployment of {model['name']} {model['version']}",
+                'environment': environment,
+                'deployment_type': 'blue_green' if environment == 'production' else 'canary',
+                'traffic_percentage': 100.0 if environment == 'production' else 10.0,
+                'endpoint_url': f"https://models.internal/{model['name']}/{environment}/predict",
+                'instance_type': str(rng.choice(['t3.medium', 'c5.xlarge', 'g4dn.xlarge'])),
+                'instance_count': int(rng.integers(1, 9)),
+                'status': 'active',
+                'deployed_at': model['deployed_at'] or model['created_at'],
+                'last_health_check': self.end,
+                'model_version_id': model['id'],
+            },
+        }
+
+    def _allocate_predictions(self, total):
+        """Split ``total`` predictions over deployments and days; returns chunk jobs."""
+        import numpy as np
+        rng = self._rng(_PLAN, 1)
+        if not self.deployments:
+            return []
+        traffic = np.array([deployment['traffic'] for deployment in self.deployments])
+        per_deployment = rng.multinomial(total, traffic / traffic.sum())
+        minutes = np.arange(0, self._window, 60.0) + 30.0
+        first_id = self._first_id(PredictionLog.__table__)
+        # Deployment-days are the unit of randomness; small ones share a write
+        jobs, parts, pending = [], [], 0
+        for index, (deployment, count) in enumerate(zip(self.deployments, per_deployment)):
+            intensity = self._intensity(deployment, minutes)
+            deployment['rate'] = count / intensity.sum()  # expected requests per minute per unit intensity
+            daily = np.add.reduceat(intensity, np.arange(0, len(minutes), 1440))
+            deployment['predictions'] = int(count)
+            for day, day_count in enumerate(rng.multinomial(count, daily / daily.sum()).tolist()):
+                for part, offset in enumerate(range(0, day_count, self.chunk_size)):
+                    size = min(self.chunk_size, day_count - offset)
+                    if pending + size > self.chunk_size:
+                        jobs.append((self._prediction_chunk, parts))
+                        parts, pending = [], 0
+                    parts.append((index, day, part, size, first_id))
+                    pending += size
+                    first_id += size
+        if parts:
+            jobs.append((self._prediction_chunk, parts))
+        return jobs
+
+    # Chunks
+
+    def _experiment_chunk(self, start, count, first_id, metric_steps):
+        import numpy as np
+        rng = self._rng(_EXPERIMENTS, start)
+        experiments, scalars, curves = [], [], []
+        history = self.history_days * 86400.0
+        for index in range(start, start + count):
+            experiment_id = first_id + index
+            run_id = f"syn-run-{experiment_id}"
+            if index < len(self.models):
+                model = self.models[index]
+                name = model['name']
+                algorithm, params = model['algorithm'], model['hyperparameters']
+                metrics = {key: model[key] for key in ('accuracy', 'precision', 'recall', 'f1_score', 'auc_score')}
+                status = 'completed'
+                duration = model['training_duration']
+                start_time = model['created_at'] - timedelta(seconds=duration + float(rng.uniform(60, 3600)))
+                model_version_id = model['id']
+            else:
+                name = self.names[int(rng.integers(len(self.names)))]
+                algorithm = str(rng.choice(list(ALGORITHMS)))
+                params = _hyperparameters(rng, algorithm)
+                metrics = _classification_metrics(rng, float(rng.uniform(0.6, 0.95)))
+                status = str(rng.choice(['completed', 'failed', 'running', 'cancelled'], p=[0.85, 0.08, 0.04, 0.03]))
+                duration = round(float(rng.lognormal(6.5, 1.0)), 1)
+                start_time = self.end - timedelta(seconds=float(rng.uniform(0, history)))
+                model_version_id = None
+            if status in ('failed', 'cancelled'):
+                metrics, duration = {}, round(duration * float(rng.uniform(0.05, 0.6)), 1)
+            elif status == 'running':
+                metrics, duration = {}, None
+            metrics = dict(metrics, loss=round(float(rng.uniform(0.05, 0.6)), 4)) if metrics else metrics
+            experiments.append({
+                'id': experiment_id,
+                'name': f"{name}_experiment",
+                'run_id': run_id,
+                'description': f"Synthetic {algorithm.replace('_', ' ')} run",
+                'tags': ['synthetic'],
+                'dataset_name': name.rsplit('_', 1)[0],
+                'dataset_version': f"2024.{int(rng.integers(1, 13)):02d}",
+                'feature_set': self.features[name],
+                'algorithm': algorithm,
+                'hyperparameters': params,
+                'metrics': metrics,
+                'artifacts': {},
+                'status': status,
+                'start_time': start_time,
+                'end_time': start_time + timedelta(seconds=duration) if duration is not None else None,
+                'duration': duration,
+                'cpu_usage': round(float(rng.uniform(20, 95)), 1),
+                'memory_usage': round(float(rng.uniform(512, 32768)), 1),
+                'gpu_usage': round(float(rng.uniform(0, 100)), 1) if algorithm == 'neural_network' else None,
+                'model_version_id': model_version_id,
+            })
+            scalars.extend(scalar_rows(experiment_id, metrics, params))
+            if metric_steps and metrics:
+                steps = np.arange(metric_steps)
+                decay = np.exp(-steps / max(1.0, metric_steps / 4))
+                loss = metrics['loss'] + decay * rng.uniform(0.3, 1.5) + rng.normal(0, 0.01, metric_steps)
+                accuracy = metrics['accuracy'] - decay * rng.uniform(0.1, 0.3) + rng.normal(0, 0.005, metric_steps)
+                times = _datetimes(start_time, (steps + 1) * (duration / metric_steps))
+                for key, values in (('loss', loss), ('val_accuracy', accuracy)):
+                    curves.extend({'run_id': run_id, 'key': key, 'step': int(step), 'value': float(value),
+                                   'timestamp': timestamp}
+                                  for step, value, timestamp in zip(steps, values, times))
+        self._write([(Experiment.__table__, experiments), (ExperimentScalar.__table__, scalars),
+                     (ExperimentMetric.__table__, curves)])
+
+    def _prediction_chunk(self, parts):
+        table = _encoded_json(PredictionLog.__table__)
+        rows, answered = [], []
+        for part in parts:
+            self._prediction_rows(rows, answered, *part)
+        self._write([(table, rows), (table, answered)])
+
+    def _prediction_rows(self, rows, answered, index, day, part, count, first_id):
+        import numpy as np
+        deployment = self.deployments[index]
+        model = deployment['model']
+        rng = self._rng(_PREDICTIONS, index, day, part)
+
+        # Arrival times: sample minutes by the traffic curve, then a uniform second
+        day_start = day * 86400.0
+        day_length = min(86400.0, self._window - day_start)
+        minutes = day_start + np.arange(0, day_length, 60.0)
+        cdf = np.cumsum(self._intensity(deployment, minutes + 30.0))
+        picked = np.searchsorted(cdf, rng.random(count) * cdf[-1])
+        seconds = np.sort(minutes[picked] + rng.random(count) * np.minimum(60.0, day_length - minutes[picked]))
+
+        # Features drift by ``shift`` standard deviations once the ramp completes
+        ramp = self._drift_ramp(deployment, seconds)
+        noise = rng.standard_normal((count, len(deployment['features'])))
+        standardized = noise + ramp[:, None] * deployment['shift'][None, :]
+        features = np.round(deployment['mean'] + deployment['scale'] * standardized, 4)
+        probability = 1.0 / (1.0 + np.exp(-(standardized @ deployment['weights'] + deployment['bias'])))
+        predicted = (probability >= 0.5).astype(int)
+        confidence = np.round(np.maximum(probability, 1.0 - probability), 4)
+        latency = deployment['latency'] * rng.lognormal(0.0, 0.35, count)
+        latency[rng.random(count) < 0.005] *= rng.uniform(5, 20)
+        latency = np.round(latency, 2)
+
+        # Ground truth arrives for some requests; accuracy decays as drift sets in
+        correct = rng.random(count) < model['accuracy'] - deployment['degradation'] * ramp
+        actual = np.where(correct, predicted, 1 - predicted)
+        has_feedback = rng.random(count) < 0.3
+        feedback_seconds = seconds + rng.exponential(6 * 3600.0, count)
+        has_feedback &= feedback_seconds < self._window
+
+        timestamps = _datetimes(self.start, seconds)
+        feedback_times = _datetimes(self.start, feedback_seconds)
+        users = rng.integers(0, 100000, count).tolist()
+        sessions = (seconds // 1800).astype(int).tolist()
+        clients = rng.integers(0, len(CLIENT_INFOS), count).tolist()
+        features_json = json.dumps(deployment['features'])
+        classes_json = [json.dumps({'class': value}) for value in (0, 1)]
+        clients_json = [json.dumps(client) for client in CLIENT_INFOS]
+        # JSON null is not SQL NULL, so rows with feedback are inserted separately
+        for offset, (values, timestamp, predicted_class, p, score, ms, outcome, feedback, feedback_at, user,
+                     session, client) in enumerate(zip(
+                features, timestamps, predicted.tolist(), probability.tolist(), confidence.tolist(),
+                latency.tolist(), actual.tolist(), has_feedback.tolist(), feedback_times, users, sessions, clients)):
+            row = {
+                'id': first_id + offset,
+                'model_version_id': model['id'],
+                'deployment_id': deployment['id'],
+                'request_id': f"syn-{first_id + offset}",
+                'timestamp': timestamp,
+                'input_hash': hashlib.sha256(values.tobytes()).hexdigest(),
+                'input_features': features_json,
+                'prediction': classes_json[predicted_class],
+                'prediction_probability': f'{{"class_0": {round(1 - p, 4)}, "class_1": {round(p, 4)}}}',
+                'confidence_score': score,
+                'latency': ms,
+                'user_id': f"user_{user}",
+                'session_id': f"session_{user}_{session}",
+                'client_info': clients_json[client],
+            }
+            if feedback:
+                row.update(actual_outcome=classes_json[outcome], feedback_timestamp=feedback_at,
+                           feedback_source='batch_update')
+                answered.append(row)
+            else:
+                rows.append(row)
+
+    def _monitoring_chunk(self, index, metric_id, drift_id, interval):
+        self._write([(ModelMetrics.__table__, self._metric_rows(index, metric_id, interval)),
+                     (DriftDetection.__table__, self._drift_rows(index, drift_id))])
+
+    def _metric_rows(self, index, first_id, interval):
+        import numpy as np
+        deployment = self.deployments[index]
+        model = deployment['model']
+        rng = self._rng(_METRICS, index)
+        seconds = np.arange(0, self._window, interval * 60.0)
+        size = len(seconds)
+        middle = seconds + interval * 30.0
+        intensity = self._intensity(deployment, middle)
+        load = intensity / intensity.max()
+        ramp = self._drift_ramp(deployment, middle)
+        counts = rng.poisson(deployment['rate'] * intensity * interval)
+        accuracy = np.clip(model['accuracy'] - deployment['degradation'] * ramp + rng.normal(0, 0.01, size),
+                           0.0, 1.0)
+        # Per-request latency is lognormal with sigma 0.35 around a load-dependent median
+        median = deployment['latency'] * (1.0 + 0.3 * load) * rng.lognormal(0.0, 0.05, size)
+        columns = zip(
+            _datetimes(self.start, seconds),
+            np.round(accuracy, 4).tolist(), np.round(accuracy - 0.02, 4).tolist(),
+            np.round(accuracy - 0.04, 4).tolist(), np.round(accuracy - 0.03, 4).tolist(),
+            np.round(np.minimum(0.999, accuracy + 0.02), 4).tolist(),
+            counts.tolist(), rng.binomial(counts, 0.002).tolist(),
+            np.round(median * np.exp(0.35 ** 2 / 2), 2).tolist(), np.round(median * np.exp(1.645 * 0.35), 2).tolist(),
+            np.round(median * np.exp(2.326 * 0.35), 2).tolist(),
+            np.round(np.clip(15 + 70 * load + rng.normal(0, 5, size), 0, 100), 1).tolist(),
+            np.round(np.clip(40 + 20 * load + rng.normal(0, 3, size), 0, 100), 1).tolist(),
+            np.round(ramp, 3).tolist(),
+        )
+        return [{
+            'id': first_id + offset,
+            'model_version_id': model['id'],
+            'deployment_id': deployment['id'],
+            'timestamp': timestamp,
+            'accuracy': acc,
+            'precision': precision,
+            'recall': recall,
+            'f1_score': f1,
+            'auc_score': auc,
+            'prediction_count': count,
+            'error_count': errors,
+            'avg_latency': avg,
+            'p95_latency': p95,
+            'p99_latency': p99,
+            'cpu_usage': cpu,
+            'memory_usage': memory,
+            'custom_metrics': {'drift_ramp': drift},
+        } for offset, (timestamp, acc, precision, recall, f1, auc, count, errors, avg, p95, p99, cpu, memory, drift)
+            in enumerate(columns)]
+
+    def _drift_rows(self, index, first_id):
+        import numpy as np
+        deployment = self.deployments[index]
+        rng = self._rng(_DRIFT, index)
+        hours = np.arange(0, self._window, 3600.0)
+        ramp = self._drift_ramp(deployment, hours + 1800.0)
+        # PSI of a normal shifted by d standard deviations is about d squared, plus sampling noise
+        psi = (ramp[:, None] * deployment['shift'][None, :]) ** 2
+        psi += rng.exponential(0.01, psi.shape)
+        samples = rng.poisson(deployment['rate'] * self._intensity(deployment, hours + 1800.0) * 60)
+        starts = _datetimes(self.start, hours)
+        reference_start = self.start - timedelta(days=7)
+        rows = []
+        for offset, (start, scores, sample) in enumerate(zip(starts, psi.tolist(), samples.tolist())):
+            score = max(scores)
+            rows.append({
+                'id': first_id + offset,
+                'model_version_id': deployment['model']['id'],
+                'timestamp': start + timedelta(hours=1),
+                'drift_type': 'data_drift',
+                'drift_detected': score > DRIFT_THRESHOLD,
+                'drift_score': round(score, 4),
+                'threshold': DRIFT_THRESHOLD,
+                'feature_drifts': {name: round(value, 4) for name, value in zip(deployment['features'], scores)},
+                'test_statistic': round(score, 4),
+                'p_value': round(float(np.exp(-25 * score)), 6),
+                'test_method': 'psi',
+                'reference_window_start': reference_start,
+                'reference_window_end': self.start,
+                'current_window_start': start,
+                'current_window_end': start + timedelta(hours=1),
+                'reference_sample_size': int(deployment['rate'] * 7 * 1440),
+                'current_sample_size': sample,
+                'extra_metadata': {'deployment_id': deployment['id'], 'synthetic': True},
+            })
+        return rows
+
+    def _plan_alerts(self, total, pending):
+        """Alert rows: incident bursts (including one per drift onset) over a background rate."""
+        import numpy as np
+        rng = self._rng(_ALERTS)
+        if not self.deployments or total <= 0:
+            return []
+        events = []  # (seconds, deployment index, type, severity index, burst)
+        background = total // 5
+        for seconds in rng.uniform(0, self._window, background):
+            events.append((seconds, int(rng.integers(len(self.deployments))),
+                           str(rng.choice(list(ALERT_TITLES))), int(rng.integers(0, 2)), None))
+
+        # Drift detections open a burst; random incidents make up the remaining bursts
+        mean_size = 25
+        starts = [(deployment['drift_onset'] + 0.3 * deployment['drift_ramp'], index, 'drift')
+                  for index, deployment in enumerate(self.deployments)
+                  if deployment['drift_onset'] is not None and
+                  deployment['drift_onset'] + 0.3 * deployment['drift_ramp'] < self._window]
+        incidents = max(0, round((total - background) / mean_size) - len(starts))
+        starts += [(float(rng.uniform(0, self._window)), int(rng.integers(len(self.deployments))),
+                    str(rng.choice(['error', 'performance', 'resource']))) for _ in range(incidents)]
+        sizes = rng.geometric(1.0 / mean_size, len(starts)).astype(float)
+        sizes = np.maximum(1, np.round(sizes * (total - background) / max(sizes.sum(), 1))).astype(int)
+        for burst, ((start, index, kind), size) in enumerate(zip(starts, sizes)):
+            offsets = start + np.cumsum(rng.exponential(20.0, size))
+            for position, seconds in enumerate(offsets[offsets < self._window]):
+                # Later alerts in a burst escalate and spread to related alert types
+                severity = min(3, 1 + int(3 * position / size + rng.random()))
+                alert_type = kind if rng.random() < 0.7 else str(rng.choice(['performance', 'error']))
+                events.append((seconds, index, alert_type, severity, burst))
+        events.sort(key=lambda event: event[0])
+
+        first_id = self._first_id(Alert.__table__)
+        rows = []
+        for offset, (seconds, index, alert_type, severity, burst) in enumerate(events):
+            deployment = self.deployments[index]
+            triggered = self.start + timedelta(seconds=float(seconds))
+            age = self._window - seconds
+            status = 'active'
+            if age > 6 * 3600:
+                status = 'resolved' if rng.random() < 0.9 else 'acknowledged'
+            elif age > 3600 and rng.random() < 0.5:
+                status = 'acknowledged'
+            acknowledged = triggered + timedelta(minutes=float(rng.exponential(15))) if status != 'active' else None
+            resolved = None
+            if status == 'resolved':
+                resolved = min(self.end, acknowledged + timedelta(minutes=float(rng.exponential(90))))
+            rows.append({
+                'id': first_id + offset,
+                'alert_id': f"syn-alert-{first_id + offset}",
+                'alert_type': alert_type,
+                'severity': SEVERITIES[severity],
+                'title': ALERT_TITLES[alert_type].format(name=deployment['model']['name']),
+                'message': f"{alert_type.title()} alert for {deployment['row']['deployment_id']}",
+                'model_version_id': deployment['model']['id'],
+                'deployment_id': deployment['id'],
+                'source_component': 'monitoring',
+                'status': status,
+                'triggered_at': triggered,
+                'acknowledged_at': acknowledged,
+                'resolved_at': resolved,
+                # Pending alerts are left for the notification dispatcher to pick up
+                'notification_sent': not (pending and status == 'active'),
+                'notification_channels': ['webhook'] if severity < 3 else ['webhook', 'email'],
+                'alert_metadata': {'burst': burst, 'synthetic': True},
+                'tags': ['synthetic'],
+            })
+        return rows
+
+    # Run
+
+    def generate(self, models=2000, names=100, experiments=5000, predictions=1000000, alerts=20000,
+                 metric_steps=20, metrics_interval=15, pending_alerts=False):
+        """Plan the fleet and write all tables; returns rows written per table."""
+        self.plan(models, names)
+        jobs = self._allocate_predictions(predictions)
+        for deployment in self.deployments:
+            deployment['row'].update(request_count=deployment['predictions'],
+                                     error_count=round(deployment['predictions'] * 0.002),
+                                     avg_latency=round(deployment['latency'], 2))
+        self._write([(ModelVersion.__table__, self.models),
+                     (Deployment.__table__, [deployment['row'] for deployment in self.deployments])])
+
+        # An experiment writes about one row per scalar and two per metric step
+        per_chunk = max(1, self.chunk_size // (2 * metric_steps + 10))
+        experiment_id = self._first_id(Experiment.__table__)
+        for start in range(0, experiments, per_chunk):
+            jobs.append((self._experiment_chunk, start, min(per_chunk, experiments - start),
+                         experiment_id, metric_steps))
+        metric_id = self._first_id(ModelMetrics.__table__)
+        drift_id = self._first_id(DriftDetection.__table__)
+        buckets = len(range(0, int(self._window), metrics_interval * 60))
+        hours = len(range(0, int(self._window), 3600))
+        for index in range(len(self.deployments)):
+            jobs.append((self._monitoring_chunk, index, metric_id + index * buckets,
+                         drift_id + index * hours, metrics_interval))
+        alert_rows = self._plan_alerts(alerts, pending_alerts)
+        for start in range(0, len(alert_rows), self.chunk_size):
+            jobs.append((self._write, [(Alert.__table__, alert_rows[start:start + self.chunk_size])]))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='synthetic') as pool:
+            futures = [pool.submit(function, *args) for function, *args in jobs]
+            for future in futures:
+                future.result()
+
+        with self.engine.begin() as conn:
+            reset_sequences(conn, [table for table in (
+                ModelVersion.__table__, Deployment.__table__, Experiment.__table__, PredictionLog.__table__,
+                ModelMetrics.__table__, DriftDetection.__table__, Alert.__table__
+            ) if not self._partitioned(table)])
+            # Running API workers drop their registry caches on the next check
+            bump_version(conn)
+        return dict(self.counts)